@@ -9,20 +9,28 @@ import os
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 DATA_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', '26_Full.txt')
 
-# 平台配置信息
+# 关键词注册表：关键词到英文名称和绘图颜色的映射
+KEYWORD_REGISTRY = {
+    '京东': {'name': 'JD.com', 'color': '#E3002B'},
+    '美团': {'name': 'Meituan', 'color': '#FFD100'},
+    '美团外卖': {'name': 'Meituan-Delivery', 'color': '#FF6600'},
+    '饿了么': {'name': 'Ele.me', 'color': '#0078FF'},
+    '京东外卖': {'name': 'JD-Delivery', 'color': '#AA2116'}
+}
+
+# 扩展关键词注册表文件（JSON格式，结构同KEYWORD_REGISTRY），存在时自动加载
+KEYWORD_REGISTRY_PATH = os.path.join(PROJECT_ROOT, 'data', 'keywords.json')
+
+# 未注册关键词使用的配色
+DEFAULT_KEYWORD_COLORS = [
+    '#1F77B4', '#2CA02C', '#D62728', '#9467BD', '#8C564B',
+    '#E377C2', '#7F7F7F', '#BCBD22', '#17BECF', '#FF7F0E'
+]
+
+# 平台配置信息：平台类型到关键词列表的映射，按关键词从抓包数据中查找序列
 PLATFORM_CONFIGS = {
-    'five_platforms': [
-        {'index': 0, 'name': 'JD.com', 'name_cn': '京东', 'color': '#E3002B'},
-        {'index': 1, 'name': 'Meituan', 'name_cn': '美团', 'color': '#FFD100'},
-        {'index': 2, 'name': 'Meituan-Delivery', 'name_cn': '美团外卖', 'color': '#FF6600'},
-        {'index': 3, 'name': 'Ele.me', 'name_cn': '饿了么', 'color': '#0078FF'},
-        {'index': 4, 'name': 'JD-Delivery', 'name_cn': '京东外卖', 'color': '#AA2116'}
-    ],
-    'delivery_platforms': [
-        {'index': 2, 'name': 'Meituan-Delivery', 'name_cn': '美团外卖', 'color': '#FF6600'},
-        {'index': 3, 'name': 'Ele.me', 'name_cn': '饿了么', 'color': '#0078FF'},
-        {'index': 4, 'name': 'JD-Delivery', 'name_cn': '京东外卖', 'color': '#AA2116'}
-    ]
+    'five_platforms': ['京东', '美团', '美团外卖', '饿了么', '京东外卖'],
+    'delivery_platforms': ['美团外卖', '饿了么', '京东外卖']
 }
 
 # 图表配置
@@ -44,4 +52,75 @@ OUTPUT_CONFIG = {
     'image_format': 'png',
     'image_quality': 95,
     'output_dir': os.path.join(PROJECT_ROOT, 'output')
+}
+
+# 解析缓存配置
+CACHE_CONFIG = {
+    'enabled': True,
+    'cache_dir': os.path.join(PROJECT_ROOT, 'data', 'cache'),
+    'hash_chunk_size': 1 << 20,
+    'streaming': False  # 缓存未命中时是否使用流式解析器，仅在抓包文件大到无法整体载入内存时开启
+}
+
+# 多文件导入配置
+INGEST_CONFIG = {
+    'capture_dir': os.path.join(PROJECT_ROOT, 'data'),
+    'pattern': '*_Full.txt',
+    'merged_dir': os.path.join(PROJECT_ROOT, 'data', 'merged'),
+    'workers': None,  # None表示使用CPU核数
+    'url_filter': 'wxindex'  # HAR和归档文件中只导入URL包含该字符串的请求
+}
+
+# 时序存储配置
+# 持久化的累计统计量和聚合金字塔只在source为'store'时用于摘要报告和长区间图表，
+# 默认的'capture'每次都从抓包文件加载完整序列
+STORE_CONFIG = {
+    'db_path': os.path.join(PROJECT_ROOT, 'data', 'wxindex.db'),
+    'source': 'capture'  # 图表数据来源：'capture'读取抓包文件，'store'读取时序存储
+}
+
+# JSON解码配置
+JSON_CONFIG = {
+    'backend': 'auto'  # 'auto'优先使用已安装的orjson/ujson，也可指定'orjson'、'ujson'或'json'
+}
+
+# 指数抓取配置
+FETCH_CONFIG = {
+    'url': 'https://search.weixin.qq.com/cgi-bin/wxaweb/wxindex',
+    'openid': os.environ.get('WXINDEX_OPENID', ''),
+    'search_key': os.environ.get('WXINDEX_SEARCH_KEY', ''),
+    'max_keywords': 5,  # 单次请求最多查询的关键词数
+    'concurrency': 4,  # 同时进行的请求数，也是连接池大小
+    'rate': 2.0,  # 令牌桶每秒补充的请求数
+    'burst': 4,  # 令牌桶容量
+    'retries': 3,
+    'backoff': 0.5,  # 首次重试等待秒数，之后按指数增长
+    'timeout': 15.0,
+    'max_window_days': 365,  # 单次请求start_ymd到end_ymd允许的最大天数
+    'job_file': os.path.join(PROJECT_ROOT, 'data', 'fetch_jobs.json')
+}
+
+# 本地回放服务器配置
+REPLAY_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8765,
+    'captures': [DATA_FILE_PATH],  # 回放的抓包文件，未收录的关键词使用合成数据
+    'synthetic': True,  # 是否为未收录的关键词生成合成序列
+    'latency': 0.05,  # 每个请求的基础延迟秒数
+    'jitter': 0.02,  # 延迟的随机浮动秒数
+    'error_rate': 0.0,  # 随机返回HTTP 500的比例
+    'rate_limit': None,  # 每秒允许的请求数，超出时返回HTTP 429；None表示不限流
+    'gzip': True  # 客户端支持时是否压缩响应体
+}
+
+# 分析配置
+ANALYSIS_CONFIG = {
+    'max_lag_days': 14,  # 滞后互相关计算的最大滞后天数（±N天）
+    'min_overlap_days': 7,  # 两个关键词至少需要共同有数据的天数，不足时相关系数记为NaN
+    'anomaly_method': 'zscore',  # 异常检测方法：'zscore'（滚动z分数）或'mad'（中位数/MAD稳健z分数）
+    'anomaly_window': 10,  # 异常检测的邻近窗口天数（以当天为中心，不含当天），较短的窗口使序列首尾的尖峰也能被检出
+    'anomaly_min_periods': 5,  # 窗口内至少需要的有效天数，不超过window//2时首日只凭单侧邻居即可评分
+    'anomaly_threshold': 3.5,  # 分数绝对值达到该阈值的日期记为异常
+    'seasonal_model': 'multiplicative',  # 周季节性分解模型：'additive'（加法）或'multiplicative'（乘法）
+    'resample_how': 'sum'  # 按周/月重采样的默认聚合方式：'sum'、'mean'、'max'、'min'或'count'
 }
\ No newline at end of file
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+多分辨率聚合金字塔模块
+在时序存储中为每个关键词持久化周、月、季度桶的数量、总和、最小值和最大值，
+写入新数据点时增量合并；范围查询按所需点数选择最粗可用层级，只读取几百个桶
+"""
+
+import sqlite3
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from core.date_codec import decode_ymd, encode_ymd
+from core.resample import period_starts
+
+PYRAMID_SCHEMA = """
+CREATE TABLE IF NOT EXISTS aggregates (
+    keyword TEXT NOT NULL,
+    level TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    sum INTEGER NOT NULL,
+    min INTEGER NOT NULL,
+    max INTEGER NOT NULL,
+    PRIMARY KEY (keyword, level, bucket)
+) WITHOUT ROWID;
+"""
+
+# 金字塔表结构版本，store_meta中缺少该版本时从已有数据重建
+PYRAMID_VERSION = 1
+
+# 由细到粗的层级，day直接读取index_points
+PYRAMID_LEVELS = ('day', 'week', 'month', 'quarter')
+
+# 各层级每个桶的平均天数，用于估算区间内的桶数量
+_BUCKET_DAYS = {'day': 1.0, 'week': 7.0, 'month': 30.44, 'quarter': 91.31}
+
+# 桶统计量：桶起始日（YYYYMMDD）、数量、总和、最小值、最大值
+Buckets = Dict[str, np.ndarray]
+
+
+def bucket_starts(times: np.ndarray, level: str) -> np.ndarray:
+    """
+    计算YYYYMMDD日期所在桶的起始日
+
+    Args:
+        times: YYYYMMDD整数数组
+        level: PYRAMID_LEVELS中的层级
+
+    Returns:
+        np.ndarray: YYYYMMDD整数数组
+    """
+    if level == 'day':
+        return np.asarray(times, dtype=np.int64)
+    return encode_ymd(period_starts(decode_ymd(times), level))
+
+
+def _group_buckets(times: np.ndarray, scores: np.ndarray, level: str) -> Tuple[np.ndarray, ...]:
+    """按桶分组计算数量、总和、最小值和最大值"""
+    buckets = bucket_starts(times, level)
+    order = np.argsort(buckets, kind='stable')
+    buckets, scores = buckets[order], scores[order]
+    boundaries = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    return (buckets[boundaries], np.diff(np.r_[boundaries, len(buckets)]),
+            np.add.reduceat(scores, boundaries), np.minimum.reduceat(scores, boundaries),
+            np.maximum.reduceat(scores, boundaries))
+
+
+def update_aggregates(conn: sqlite3.Connection, keyword: str, times: np.ndarray, scores: np.ndarray):
+    """
+    将新写入的数据点合并到各层级的桶，需在写入数据点的同一事务中调用
+
+    只合并此前不存在的数据点，因此数量和总和可直接累加。
+
+    Args:
+        conn: 数据库连接
+        keyword: 关键词
+        times: 新写入的YYYYMMDD日期
+        scores: 新写入的指数值
+    """
+    if not len(scores):
+        return
+    times = np.asarray(times, dtype=np.int64)
+    scores = np.asarray(scores, dtype=np.int64)
+
+    for level in PYRAMID_LEVELS[1:]:
+        buckets, counts, sums, minimums, maximums = _group_buckets(times, scores, level)
+        conn.executemany(
+            'INSERT INTO aggregates (keyword, level, bucket, count, sum, min, max) VALUES (?, ?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT(keyword, level, bucket) DO UPDATE SET '
+            'count = count + excluded.count, sum = sum + excluded.sum, '
+            'min = MIN(min, excluded.min), max = MAX(max, excluded.max)',
+            zip([keyword] * len(buckets), [level] * len(buckets), buckets.tolist(), counts.tolist(),
+                sums.tolist(), minimums.tolist(), maximums.tolist())
+        )
+
+
+def rebuild_aggregates(conn: sqlite3.Connection) -> int:
+    """
+    根据index_points中的全部数据重建聚合金字塔
+
+    Args:
+        conn: 数据库连接
+
+    Returns:
+        int: 重建的关键词数量
+    """
+    conn.execute('DELETE FROM aggregates')
+    keywords = [row[0] for row in conn.execute('SELECT DISTINCT keyword FROM index_points')]
+    for keyword in keywords:
+        points = np.array(conn.execute('SELECT date, score FROM index_points WHERE keyword = ?', (keyword,)).fetchall(),
+                          dtype=np.int64).reshape(-1, 2)
+        update_aggregates(conn, keyword, points[:, 0], points[:, 1])
+    return len(keywords)
+
+
+def choose_level(start_ymd: int, end_ymd: int, max_points: int) -> str:
+    """
+    选择区间内桶数量不超过max_points的最细层级
+
+    Args:
+        start_ymd: 开始日期（YYYYMMDD）
+        end_ymd: 结束日期（YYYYMMDD）
+        max_points: 每个关键词最多返回的点数，通常为图表的像素宽度
+
+    Returns:
+        str: 层级名称；即使季度层级也超过max_points时返回'quarter'
+    """
+    start, end = decode_ymd([start_ymd, end_ymd])
+    days = int((end - start).astype(np.int64)) + 1
+    for level in PYRAMID_LEVELS:
+        if days / _BUCKET_DAYS[level] <= max_points:
+            return level
+    return PYRAMID_LEVELS[-1]
+
+
+def query_buckets(conn: sqlite3.Connection, keyword: str, level: str, start_ymd: int, end_ymd: int) -> Buckets:
+    """
+    读取关键词在区间内的桶，包含与区间相交的首尾桶
+
+    Args:
+        conn: 数据库连接
+        keyword: 关键词
+        level: PYRAMID_LEVELS中的层级
+        start_ymd: 开始日期（YYYYMMDD）
+        end_ymd: 结束日期（YYYYMMDD）
+
+    Returns:
+        Buckets: buckets（桶起始日）、count、sum、min和max数组，按日期升序
+
+    Raises:
+        ValueError: 当level不受支持时抛出
+    """
+    if level not in PYRAMID_LEVELS:
+        raise ValueError(f"不支持的聚合层级: {level}")
+
+    if level == 'day':
+        rows = conn.execute(
+            'SELECT date, 1, score, score, score FROM index_points '
+            'WHERE keyword = ? AND date >= ? AND date <= ? ORDER BY date',
+            (keyword, start_ymd, end_ymd)
+        ).fetchall()
+    else:
+        first_bucket = int(bucket_starts(np.array([start_ymd]), level)[0])
+        rows = conn.execute(
+            'SELECT bucket, count, sum, min, max FROM aggregates '
+            'WHERE keyword = ? AND level = ? AND bucket >= ? AND bucket <= ? ORDER BY bucket',
+            (keyword, level, first_bucket, end_ymd)
+        ).fetchall()
+
+    columns = np.array(rows, dtype=np.int64).reshape(-1, 5)
+    return {
+        'buckets': columns[:, 0], 'count': columns[:, 1], 'sum': columns[:, 2],
+        'min': columns[:, 3], 'max': columns[:, 4]
+    }
+
+
+def bucket_values(buckets: Buckets, stat: str) -> np.ndarray:
+    """
+    从桶统计量中取出绘图使用的数值
+
+    Args:
+        buckets: query_buckets的返回值
+        stat: 'mean'、'sum'、'min'、'max'或'count'
+
+    Returns:
+        np.ndarray: 每个桶一个数值，mean四舍五入为整数
+
+    Raises:
+        ValueError: 当stat不受支持时抛出
+    """
+    if stat == 'mean':
+        return np.rint(buckets['sum'] / np.maximum(buckets['count'], 1)).astype(np.int64)
+    if stat in ('sum', 'min', 'max', 'count'):
+        return buckets[stat]
+    raise ValueError(f"不支持的桶统计量: {stat}")
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+异常检测模块
+在(关键词 × 天)矩阵上一次性为全部关键词计算每天相对前后邻近窗口的偏离程度，
+支持滚动z分数和中位数/MAD（稳健z分数）两种方法，输出异常事件表
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from config.settings import ANALYSIS_CONFIG
+from core.batch_stats import row_percentiles, series_matrix
+from core.platform_series import PlatformSeries
+
+# 支持的检测方法
+ANOMALY_METHODS = ('zscore', 'mad')
+
+# 正态分布下MAD与标准差的换算系数，使稳健z分数与z分数量纲一致
+_MAD_SCALE = 0.6745
+
+# MAD方法每次排序处理的最大元素数；滑动窗口副本保持在缓存可容纳的大小时排序最快
+_MAD_BLOCK_ELEMENTS = 1 << 19
+
+
+def _neighbour_sums(values: np.ndarray, half: int) -> np.ndarray:
+    """用累积和计算每天前后各half天（含当天）窗口内各行的和，窗口在序列两端截断"""
+    days = values.shape[1]
+    cumulative = np.zeros((values.shape[0], days + 1))
+    np.cumsum(values, axis=1, out=cumulative[:, 1:])
+    positions = np.arange(days)
+    return cumulative[:, np.minimum(positions + half + 1, days)] - cumulative[:, np.maximum(positions - half, 0)]
+
+
+def rolling_zscore(matrix: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    """
+    计算每天相对邻近窗口（不含当天）均值和标准差的z分数
+
+    窗口以当天为中心，前后各window//2天，当天不参与基线计算，避免尖峰抬高自身基线；
+    序列开头和结尾的窗口只包含一侧，因此首日的尖峰同样可以被检出。
+
+    Args:
+        matrix: (关键词 × 天)矩阵，缺失值为NaN
+        window: 窗口天数
+        min_periods: 窗口内（不含当天）至少需要的有效天数
+
+    Returns:
+        np.ndarray: 与输入同形状的z分数矩阵，缺失日、有效天数不足或基线标准差为0时为NaN
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    mask = ~np.isnan(matrix)
+
+    # 先减去各行均值再累积平方和，降低大数值下的精度损失
+    with np.errstate(invalid='ignore', divide='ignore'):
+        centers = np.where(mask, matrix, 0.0).sum(axis=1) / mask.sum(axis=1)
+    centered = np.where(mask, matrix - np.nan_to_num(centers)[:, None], 0.0)
+
+    half = window // 2
+    counts = _neighbour_sums(mask.astype(np.float64), half) - mask
+    sums = _neighbour_sums(centered, half) - centered
+    squares = _neighbour_sums(centered * centered, half) - centered * centered
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = sums / counts
+        std = np.sqrt(np.maximum(squares / counts - mean * mean, 0.0))
+        scores = (centered - mean) / std
+    scores[~mask | (counts < min_periods) | ~np.isfinite(scores)] = np.nan
+    return scores
+
+
+def rolling_mad_score(matrix: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    """
+    计算每天相对邻近窗口（不含当天）中位数和MAD的稳健z分数
+
+    score = 0.6745 * (x - 中位数) / MAD，对窗口内的其他尖峰不敏感。
+    滑动窗口按行分块排序，窗口副本的内存占用与关键词数量无关。
+
+    Args:
+        matrix: (关键词 × 天)矩阵，缺失值为NaN
+        window: 窗口天数
+        min_periods: 窗口内（不含当天）至少需要的有效天数
+
+    Returns:
+        np.ndarray: 与输入同形状的稳健z分数矩阵，缺失日、有效天数不足或MAD为0时为NaN
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    keywords, days = matrix.shape
+    half = window // 2
+    width = 2 * half + 1
+
+    scores = np.full(matrix.shape, np.nan)
+    if days == 0:
+        return scores
+
+    padded = np.full((keywords, days + 2 * half), np.nan)
+    padded[:, half:half + days] = matrix
+    block = max(1, _MAD_BLOCK_ELEMENTS // (days * width))
+
+    for start in range(0, keywords, block):
+        # (行, 天, 窗口)，把窗口中心（当天）置为NaN后按有效值排序
+        windows = sliding_window_view(padded[start:start + block], width, axis=1).reshape(-1, width).copy()
+        windows[:, half] = np.nan
+        count = (~np.isnan(windows)).sum(axis=1)
+
+        median = row_percentiles(np.sort(windows, axis=1), count, [50])[0]
+        deviation = np.sort(np.abs(windows - median[:, None]), axis=1)
+        mad = row_percentiles(deviation, count, [50])[0]
+
+        values = matrix[start:start + block].reshape(-1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            block_scores = _MAD_SCALE * (values - median) / mad
+        block_scores[(count < min_periods) | ~np.isfinite(block_scores)] = np.nan
+        scores[start:start + block] = block_scores.reshape(-1, days)
+    return scores
+
+
+def anomaly_scores(matrix: np.ndarray, method: Optional[str] = None, window: Optional[int] = None,
+                   min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    按指定方法计算异常分数
+
+    Args:
+        matrix: (关键词 × 天)矩阵，缺失值为NaN
+        method: 'zscore'或'mad'，默认使用ANALYSIS_CONFIG['anomaly_method']
+        window: 窗口天数，默认使用ANALYSIS_CONFIG['anomaly_window']
+        min_periods: 窗口内至少需要的有效天数，默认使用ANALYSIS_CONFIG['anomaly_min_periods']
+
+    Returns:
+        np.ndarray: 与输入同形状的分数矩阵
+
+    Raises:
+        ValueError: 当method不受支持时抛出
+    """
+    method = method or ANALYSIS_CONFIG['anomaly_method']
+    window = window or ANALYSIS_CONFIG['anomaly_window']
+    min_periods = ANALYSIS_CONFIG['anomaly_min_periods'] if min_periods is None else min_periods
+
+    if method == 'zscore':
+        return rolling_zscore(matrix, window, min_periods)
+    if method == 'mad':
+        return rolling_mad_score(matrix, window, min_periods)
+    raise ValueError(f"不支持的异常检测方法: {method}")
+
+
+def detect_anomalies(names: List[str], axis_dates: np.ndarray, matrix: np.ndarray,
+                     method: Optional[str] = None, window: Optional[int] = None,
+                     threshold: Optional[float] = None) -> List[Dict[str, object]]:
+    """
+    检测全部关键词的异常日并生成事件表
+
+    Args:
+        names: 与矩阵各行对应的关键词
+        axis_dates: 与矩阵各列对应的日期（datetime64[D]）
+        matrix: (关键词 × 天)矩阵，缺失值为NaN
+        method: 'zscore'或'mad'，默认使用ANALYSIS_CONFIG['anomaly_method']
+        window: 窗口天数，默认使用ANALYSIS_CONFIG['anomaly_window']
+        threshold: 分数绝对值阈值，默认使用ANALYSIS_CONFIG['anomaly_threshold']
+
+    Returns:
+        List[Dict[str, object]]: 按日期和关键词排列的事件，包含keyword、date（YYYY-MM-DD）、
+            value、score和direction（'spike'或'dip'）
+    """
+    if threshold is None:
+        threshold = ANALYSIS_CONFIG['anomaly_threshold']
+
+    scores = anomaly_scores(matrix, method, window)
+    with np.errstate(invalid='ignore'):
+        flagged = np.abs(scores) >= threshold
+
+    # 按列（日期）优先排序，事件表按时间先后排列
+    columns, rows = np.nonzero(flagged.T)
+    date_labels = np.datetime_as_string(axis_dates[columns], unit='D').tolist()
+    return [
+        {'keyword': names[row], 'date': date, 'value': int(value), 'score': score,
+         'direction': 'spike' if score > 0 else 'dip'}
+        for row, date, value, score in zip(rows.tolist(), date_labels, matrix[rows, columns].tolist(),
+                                           scores[rows, columns].tolist())
+    ]
+
+
+def detect_platform_anomalies(platforms_data: Dict[str, PlatformSeries], method: Optional[str] = None,
+                              window: Optional[int] = None,
+                              threshold: Optional[float] = None) -> List[Dict[str, object]]:
+    """
+    对全部平台序列检测异常日
+
+    Args:
+        platforms_data: 平台名称到序列的映射
+        method: 'zscore'或'mad'
+        window: 窗口天数
+        threshold: 分数绝对值阈值
+
+    Returns:
+        List[Dict[str, object]]: 事件表（见detect_anomalies）
+    """
+    names, axis_dates, matrix = series_matrix(platforms_data)
+    return detect_anomalies(names, axis_dates, matrix, method, window, threshold)
@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+"""
+HAR与归档文件导入模块
+逐条读取HAR条目和zip会话归档中的抓包，在进程池中并行解压、解码wxindex响应体，
+再交给与抓包目录导入相同的合并与存储流程
+"""
+
+import base64
+import gzip
+import io
+import json
+import os
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
+
+from config.settings import INGEST_CONFIG
+from core.data_cache import columns_from_series
+from core.index_store import IndexStore
+from core.ingest import merge_columns
+from core.json_backend import scan_time_indexes
+from core.stream_parser import REQUEST_WINDOW_SIZE, RESPONSE_MARKER, STREAM_CHUNK_SIZE, parse_request_body
+
+# 待解码条目：(来源, 请求query列表, 响应体字节, Content-Encoding)
+Payload = Tuple[str, List[str], bytes, str]
+
+_MARKER = RESPONSE_MARKER.encode('utf-8')
+
+# 原始抓包中下一组请求的起始位置
+_NEXT_REQUEST = b'\nPOST '
+
+_decoder = json.JSONDecoder()
+
+
+def _brotli_decompress(data: bytes) -> bytes:
+    try:
+        import brotli
+    except ImportError:
+        try:
+            import brotlicffi as brotli
+        except ImportError:
+            raise ValueError("响应体为br编码，需要安装brotli或brotlicffi")
+    return brotli.decompress(data)
+
+
+def decompress_body(data: bytes, content_encoding: str = '') -> bytes:
+    """
+    按Content-Encoding解压响应体
+
+    导出工具可能已经解压过响应体但保留了原始响应头，因此数据以JSON开头时直接返回。
+
+    Args:
+        data: 响应体字节
+        content_encoding: Content-Encoding响应头，可为逗号分隔的多个编码
+
+    Returns:
+        bytes: 解压后的响应体
+
+    Raises:
+        ValueError: 当编码不受支持或缺少解压库时抛出
+    """
+    for encoding in reversed([e.strip().lower() for e in content_encoding.split(',') if e.strip()]):
+        if data.lstrip()[:1] in (b'{', b'['):
+            break
+        if encoding in ('gzip', 'x-gzip'):
+            data = gzip.decompress(data)
+        elif encoding == 'deflate':
+            data = zlib.decompress(data, -zlib.MAX_WBITS if data[:1] != b'\x78' else zlib.MAX_WBITS)
+        elif encoding == 'br':
+            data = _brotli_decompress(data)
+        elif encoding != 'identity':
+            raise ValueError(f"不支持的响应体编码: {encoding}")
+    return data
+
+
+class _JsonStream:
+    """在文本流上按需读取的JSON游标，缓冲区只保留尚未消费的部分"""
+
+    def __init__(self, stream: TextIO, chunk_size: Optional[int] = None):
+        self.stream = stream
+        self.chunk_size = chunk_size or STREAM_CHUNK_SIZE
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def _fill(self, size: int):
+        chunk = self.stream.read(size)
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        self.eof = not chunk
+
+    def peek(self) -> str:
+        """跳过空白并返回下一个字符，流结束时返回空字符串"""
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in ' \t\r\n':
+                self.position += 1
+            if self.position < len(self.buffer) or self.eof:
+                return self.buffer[self.position:self.position + 1]
+            self._fill(self.chunk_size)
+
+    def expect(self, chars: str) -> str:
+        """消费下一个字符，该字符必须是chars之一"""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"HAR格式错误: 期望 {' '.join(chars)}，实际为 {char or '文件结尾'}")
+        self.position += 1
+        return char
+
+    def value(self) -> Any:
+        """解码下一个完整的JSON值，缓冲区中的数据不足时成倍补充后重试"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.position)
+                # 位于缓冲区末尾的数字可能被截断
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise ValueError(f"HAR格式错误: {e}")
+            self._fill(max(self.chunk_size, len(self.buffer) - self.position))
+
+    def members(self) -> Iterator[str]:
+        """逐个产出对象的键，调用方须在继续迭代前消费对应的值"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.position += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError("HAR格式错误: 对象的键必须是字符串")
+            self.expect(':')
+            yield key
+            if self.expect(',}') == '}':
+                return
+
+    def items(self) -> Iterator[Any]:
+        """逐个解码数组元素"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.position += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(',]') == ']':
+                return
+
+
+def _iter_har_entries(stream: TextIO) -> Iterator[Dict]:
+    """逐个解码HAR顶层log对象中entries数组的元素，不一次性读取或构建整个文档"""
+    reader = _JsonStream(stream)
+    for key in reader.members():
+        if key != 'log':
+            reader.value()
+            continue
+        for log_key in reader.members():
+            if log_key == 'entries':
+                yield from reader.items()
+                return
+            reader.value()
+        return
+
+
+def _header_value(headers: List[Dict], name: str) -> str:
+    for header in headers or []:
+        if header.get('name', '').lower() == name:
+            return header.get('value', '')
+    return ''
+
+
+def iter_har_payloads(stream: TextIO, source: str, url_filter: Optional[str] = None) -> Iterator[Payload]:
+    """
+    逐条读取HAR中log.entries里匹配URL的条目
+
+    Args:
+        stream: HAR文本流
+        source: 来源名称，用于冲突报告
+        url_filter: URL需包含的字符串，默认使用INGEST_CONFIG['url_filter']
+
+    Returns:
+        Iterator[Payload]: 待解码条目
+    """
+    url_filter = url_filter or INGEST_CONFIG['url_filter']
+    for index, entry in enumerate(_iter_har_entries(stream)):
+        request, response = entry.get('request', {}), entry.get('response', {})
+        content = response.get('content', {})
+        if url_filter not in request.get('url', '') or not content.get('text'):
+            continue
+
+        body = content['text']
+        body = base64.b64decode(body) if content.get('encoding') == 'base64' else body.encode('utf-8')
+        request_body = parse_request_body(request.get('postData', {}).get('text', '')) or {}
+        yield (f"{source}#{index}", list(request_body.get('query', [])), body,
+               _header_value(response.get('headers'), 'content-encoding'))
+
+
+def iter_capture_payloads(stream: BinaryIO, source: str) -> Iterator[Payload]:
+    """
+    按块读取原始文本抓包（可包含多组请求/响应）中的响应体
+
+    Args:
+        stream: 抓包字节流
+        source: 来源名称
+
+    Returns:
+        Iterator[Payload]: 待解码条目，响应体均为未压缩文本
+    """
+    # start为当前请求在缓冲区中的起点，offset为缓冲区起点在流中的位置
+    buffer, offset, start, scan, eof = bytearray(), 0, 0, 0, False
+    marker = -1
+    while True:
+        if marker == -1:
+            marker = buffer.find(_MARKER, scan)
+            if marker != -1:
+                scan = marker
+        end = -1 if marker == -1 else buffer.find(_NEXT_REQUEST, scan)
+
+        if end == -1 and not eof:
+            # 只从可能跨越块边界的位置继续查找，丢弃已产出的部分和超出请求窗口的前文
+            needle = _MARKER if marker == -1 else _NEXT_REQUEST
+            if marker == -1:
+                start = max(start, len(buffer) - REQUEST_WINDOW_SIZE)
+            scan = max(scan, len(buffer) - len(needle) + 1) - start
+            marker = marker - start if marker != -1 else -1
+            del buffer[:start]
+            offset, start = offset + start, 0
+            chunk = stream.read(STREAM_CHUNK_SIZE)
+            buffer += chunk
+            eof = not chunk
+            continue
+        if marker == -1:
+            return
+
+        end = len(buffer) if end == -1 else end
+        request_body = parse_request_body(buffer[start:marker].decode('utf-8', errors='replace')) or {}
+        yield f"{source}@{offset + marker}", list(request_body.get('query', [])), bytes(buffer[marker:end]), ''
+        start = scan = end
+        marker = -1
+
+
+def iter_archive_payloads(file_path: str) -> Iterator[Payload]:
+    """
+    读取HAR文件或zip归档中的全部待解码条目
+
+    文件和zip成员均以流的方式按块读取，zip归档中的.har成员按HAR解析，
+    其余成员按原始文本抓包解析（不含响应体的成员不产出条目）。
+
+    Args:
+        file_path: .har或.zip文件路径
+
+    Returns:
+        Iterator[Payload]: 待解码条目
+
+    Raises:
+        FileNotFoundError: 当文件不存在时抛出
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"数据文件未找到: {file_path}")
+
+    name = os.path.basename(file_path)
+    if not zipfile.is_zipfile(file_path):
+        with open(file_path, 'rb') as f:
+            if file_path.lower().endswith('.har'):
+                yield from iter_har_payloads(io.TextIOWrapper(f, encoding='utf-8'), name)
+            else:
+                yield from iter_capture_payloads(f, name)
+        return
+
+    with zipfile.ZipFile(file_path) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            source = f"{name}/{info.filename}"
+            with archive.open(info) as member:
+                if info.filename.lower().endswith('.har'):
+                    yield from iter_har_payloads(io.TextIOWrapper(member, encoding='utf-8'), source)
+                else:
+                    yield from iter_capture_payloads(member, source)
+
+
+def columns_from_body(body: bytes, query: Sequence[str] = ()) -> Dict[str, np.ndarray]:
+    """
+    将未压缩的wxindex响应体转换为列式数据
+
+    Args:
+        body: 响应体字节
+        query: 请求中的query列表，响应条目缺少query字段时按位置对应
+
+    Returns:
+        Dict[str, np.ndarray]: 列式数据（见core.data_cache.columns_from_series）
+    """
+    series = {}
+    for position, (keyword, times, scores) in enumerate(scan_time_indexes(body)):
+        keyword = keyword or (query[position] if position < len(query) else None)
+        if keyword is not None:
+            series[keyword] = (times, scores)
+    return columns_from_series(series)
+
+
+def _decode_payload(payload: Payload) -> Tuple[str, Optional[Dict[str, np.ndarray]], Optional[str]]:
+    """
+    解压并解码单个响应体（进程池工作函数）
+
+    Returns:
+        Tuple: (来源, 列式数据, 错误信息)，失败时列式数据为None
+    """
+    source, query, body, content_encoding = payload
+    try:
+        return source, columns_from_body(decompress_body(body, content_encoding), query), None
+    except (OSError, ValueError, zlib.error) as e:
+        return source, None, str(e)
+
+
+def _bounded_map(executor: Executor, func: Callable, items: Iterable, window: int) -> Iterator:
+    """
+    按输入顺序产出func的结果，同时最多保留window个未完成的任务
+
+    Executor.map会先取尽整个输入迭代器再返回，这里逐个提交，
+    使上游的流式读取真正按需推进，内存占用与归档大小无关。
+    """
+    pending = deque()
+    for item in items:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(func, item))
+    while pending:
+        yield pending.popleft().result()
+
+
+def ingest_archives(file_paths: Sequence[str], workers: Optional[int] = None,
+                    to_store: bool = True) -> Dict:
+    """
+    导入HAR文件和zip归档，合并去重后追加到时序存储
+
+    Args:
+        file_paths: .har或.zip文件路径列表，靠后的条目在冲突时优先
+        workers: 进程数，默认使用INGEST_CONFIG['workers']
+        to_store: 是否将合并结果追加到时序存储
+
+    Returns:
+        Dict: 导入摘要，包含files、entries、keywords、data_points、stored_points、
+            conflicts和failures
+    """
+    workers = workers or INGEST_CONFIG['workers'] or os.cpu_count() or 1
+    payloads = (payload for file_path in file_paths for payload in iter_archive_payloads(file_path))
+
+    parsed, failures = [], []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for source, columns, error in _bounded_map(executor, _decode_payload, payloads, 2 * workers):
+            if columns is None:
+                failures.append((source, error))
+            else:
+                parsed.append((source, columns))
+
+    merged, conflicts = merge_columns([columns for _, columns in parsed], [source for source, _ in parsed])
+
+    stored_points = 0
+    if to_store:
+        with IndexStore() as store:
+            stored_points = store.append_columns(merged)
+
+    return {
+        'files': len(file_paths),
+        'entries': len(parsed) + len(failures),
+        'keywords': len(merged['keywords']),
+        'data_points': len(merged['scores']),
+        'stored_points': stored_points,
+        'conflicts': conflicts,
+        'failures': failures
+    }
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+历史数据回填模块
+按自然年窗口和关键词批次逐个抓取历史指数，每个任务的数据与完成检查点在同一事务中写入，
+中断后重新运行只会抓取尚未完成的任务
+"""
+
+import asyncio
+from typing import Dict, List, Sequence
+
+from core.date_codec import decode_ymd, to_ymd
+from core.fetch_client import Job, WxIndexClient, fetch_into_store
+from core.fetch_planner import plan_requests
+from core.index_store import IndexStore
+
+
+def plan_backfill(keywords: Sequence[str], start_date, end_date) -> List[Job]:
+    """
+    生成按自然年切分的回填任务，超出单次请求天数上限的年份（如闰年）由plan_requests继续切分
+
+    任务id只由关键词批次和窗口决定，与存储中已有的数据无关，
+    因此多次运行生成的任务列表相同，可与检查点逐一对应。
+
+    Args:
+        keywords: 关键词列表
+        start_date: 开始日期（YYYYMMDD整数或可转换为datetime64[D]的日期）
+        end_date: 结束日期
+
+    Returns:
+        List[Job]: 回填任务列表
+    """
+    start_ymd, end_ymd = to_ymd(start_date), to_ymd(end_date)
+    start, end = decode_ymd([start_ymd, end_ymd])
+
+    jobs = []
+    for year in range(start.astype(object).year, end.astype(object).year + 1):
+        window_start = max(start_ymd, year * 10000 + 101)
+        window_end = min(end_ymd, year * 10000 + 1231)
+        jobs.extend(plan_requests(keywords, window_start, window_end, skip_stored=False))
+    return jobs
+
+
+def run_backfill(keywords: Sequence[str], start_date, end_date, reset: bool = False,
+                 **client_options) -> Dict:
+    """
+    执行回填，跳过存储中已有检查点的任务
+
+    Args:
+        keywords: 关键词列表
+        start_date: 开始日期
+        end_date: 结束日期
+        reset: 是否先清除全部检查点
+        **client_options: 传给WxIndexClient的参数
+
+    Returns:
+        Dict: 抓取摘要（见core.fetch_client.fetch_into_store），另含jobs（任务总数）
+            和skipped（此前已完成的任务数）
+    """
+    jobs = plan_backfill(keywords, start_date, end_date)
+    with IndexStore() as store:
+        if reset:
+            store.clear_checkpoints()
+        completed = store.completed_jobs()
+    pending = [job for job in jobs if job['id'] not in completed]
+
+    def on_result(job: Job, columns, store: IndexStore) -> int:
+        return store.append_columns(columns, checkpoint=job)
+
+    async def run():
+        return await fetch_into_store(pending, WxIndexClient(**client_options), on_result)
+
+    summary = asyncio.run(run()) if pending else {'requests': 0, 'stored_points': 0, 'failures': []}
+    summary['jobs'] = len(jobs)
+    summary['skipped'] = len(jobs) - len(pending)
+    return summary
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+批量统计模块
+将多个关键词的序列对齐为(关键词 × 天)矩阵，缺失日期记为NaN，
+沿指定轴一次性计算全部描述统计量
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from core.platform_series import PlatformSeries
+
+# 默认计算的分位数（百分比）
+DEFAULT_PERCENTILES = (25, 75)
+
+
+def _fill_matrix(counts: np.ndarray, dates: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """按各行数据点数量将拼接后的(日期, 数值)填入以NaN初始化的矩阵"""
+    if not len(dates):
+        return np.empty(0, dtype='datetime64[D]'), np.full((len(counts), 0), np.nan)
+
+    start, end = dates.min(), dates.max()
+    axis_dates = np.arange(start, end + np.timedelta64(1, 'D'), dtype='datetime64[D]')
+    matrix = np.full((len(counts), len(axis_dates)), np.nan)
+    rows = np.repeat(np.arange(len(counts)), counts)
+    matrix[rows, (dates - start).astype(np.int64)] = values
+    return axis_dates, matrix
+
+
+def series_matrix(platforms_data: Dict[str, PlatformSeries]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    将平台序列对齐为(平台 × 天)矩阵
+
+    Args:
+        platforms_data: 平台名称到序列的映射
+
+    Returns:
+        Tuple[List[str], np.ndarray, np.ndarray]: 平台名称、覆盖全部平台的连续日期轴
+            和float64矩阵，平台在某天没有数据时为NaN
+    """
+    names = list(platforms_data.keys())
+    series = list(platforms_data.values())
+    counts = np.array([len(item) for item in series], dtype=np.int64)
+    dates = np.concatenate([item.dates for item in series]) if series else np.empty(0, dtype='datetime64[D]')
+    values = np.concatenate([item.values for item in series]) if series else np.empty(0, dtype=np.int64)
+    axis_dates, matrix = _fill_matrix(counts, dates, values)
+    return names, axis_dates, matrix
+
+
+def columns_matrix(columns: Dict[str, np.ndarray]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    将列式数据对齐为(关键词 × 天)矩阵
+
+    Args:
+        columns: 列式数据（见core.data_cache.columns_from_series）
+
+    Returns:
+        Tuple[List[str], np.ndarray, np.ndarray]: 关键词、连续日期轴和float64矩阵
+    """
+    axis_dates, matrix = _fill_matrix(np.diff(columns['offsets']), columns['dates'], columns['scores'])
+    return columns['keywords'].tolist(), axis_dates, matrix
+
+
+def row_percentiles(ordered: np.ndarray, count: np.ndarray, percentiles: Sequence[float]) -> np.ndarray:
+    """
+    在逐行排序后的矩阵上按各行有效数量线性插值计算分位数
+
+    Args:
+        ordered: 二维float矩阵，每行已升序排序且NaN位于末尾（np.sort的结果）
+        count: 各行有效值（非NaN）数量
+        percentiles: 分位数列表（百分比）
+
+    Returns:
+        np.ndarray: (分位数 × 行)矩阵，没有有效值的行为NaN
+    """
+    rows = np.arange(ordered.shape[0])
+    last = np.maximum(count - 1, 0)
+    result = np.empty((len(percentiles), ordered.shape[0]))
+    if ordered.shape[1] == 0:
+        result.fill(np.nan)
+        return result
+
+    for i, percentile in enumerate(percentiles):
+        position = last * (percentile / 100.0)
+        lo = np.floor(position).astype(np.int64)
+        hi = np.minimum(lo + 1, last)
+        weight = position - lo
+        result[i] = ordered[rows, lo] * (1 - weight) + ordered[rows, hi] * weight
+    result[:, count == 0] = np.nan
+    return result
+
+
+def batch_statistics(matrix: np.ndarray, axis: int = 1,
+                     percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, np.ndarray]:
+    """
+    沿指定轴批量计算描述统计量，NaN视为缺失值
+
+    Args:
+        matrix: 二维float矩阵，缺失值为NaN
+        axis: 统计所沿的轴，1表示每个关键词一组统计（跨天），0表示每天一组统计（跨关键词）
+        percentiles: 需要额外计算的分位数（百分比），结果键名为p25、p75等
+
+    Returns:
+        Dict[str, np.ndarray]: count、sum、mean、std（总体标准差）、min、max、median、
+            cv（变异系数）及各分位数，没有有效值的组为NaN（count和sum为0）
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if axis == 0:
+        matrix = matrix.T
+
+    mask = ~np.isnan(matrix)
+    count = mask.sum(axis=1)
+    total = np.where(mask, matrix, 0.0).sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+        deviation = np.where(mask, matrix - mean[:, None], 0.0)
+        std = np.sqrt((deviation * deviation).sum(axis=1) / count)
+        cv = std / mean
+
+    empty = count == 0
+    minimum = np.where(mask, matrix, np.inf).min(axis=1, initial=np.inf)
+    maximum = np.where(mask, matrix, -np.inf).max(axis=1, initial=-np.inf)
+    minimum[empty] = np.nan
+    maximum[empty] = np.nan
+
+    # np.sort将NaN排在末尾，有效值位于每行前count个位置
+    quantiles = row_percentiles(np.sort(matrix, axis=1), count, [50, *percentiles])
+
+    stats = {
+        'count': count, 'sum': total, 'mean': mean, 'std': std,
+        'min': minimum, 'max': maximum, 'median': quantiles[0], 'cv': cv
+    }
+    for percentile, values in zip(percentiles, quantiles[1:]):
+        stats[f'p{percentile:g}'] = values
+    return stats
+
+
+def statistics_by_name(names: Sequence[str], stats: Dict[str, np.ndarray]) -> Dict[str, Dict[str, float]]:
+    """
+    将批量统计结果拆分为按名称索引的字典
+
+    没有有效值的组所有统计量记为0，与calculate_statistics对空序列的约定一致。
+
+    Args:
+        names: 与统计结果各组对应的名称
+        stats: batch_statistics的返回值
+
+    Returns:
+        Dict[str, Dict[str, float]]: 名称到统计信息的映射
+    """
+    columns = {key: values.tolist() if values.dtype.kind == 'i'
+               else np.nan_to_num(values, nan=0.0, posinf=0.0, neginf=0.0).tolist()
+               for key, values in stats.items()}
+    return {name: {key: values[i] for key, values in columns.items()} for i, name in enumerate(names)}
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+抓包日志读取模块
+以内存映射方式读取由多组请求/响应首尾相接组成的大体积抓包日志，
+先建立响应体偏移索引，再只解码所需关键词和日期范围对应的响应体
+"""
+
+import json
+import mmap
+import re
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.data_cache import columns_from_series
+from core.date_codec import to_ymd
+from core.index_store import DateRange
+from core.ingest import merge_columns
+from core.json_backend import scan_time_indexes
+from core.stream_parser import RESPONSE_MARKER, REQUEST_WINDOW_SIZE, parse_request_body
+
+_MARKER = RESPONSE_MARKER.encode('utf-8')
+_CONTENT_LENGTH_PATTERN = re.compile(rb'(?im)^content-length:\s*(\d+)\s*$')
+
+_decoder = json.JSONDecoder()
+
+
+class CaptureLog:
+    """
+    抓包日志读取器
+    索引项包含响应体起止偏移及对应请求体中的query、start_ymd、end_ymd
+    """
+
+    def __init__(self, file_path: str):
+        """
+        以只读内存映射方式打开抓包日志
+
+        Args:
+            file_path: 抓包日志路径
+
+        Raises:
+            FileNotFoundError: 当文件不存在时抛出
+        """
+        self.file_path = file_path
+        try:
+            self._file = open(file_path, 'rb')
+        except FileNotFoundError:
+            raise FileNotFoundError(f"数据文件未找到: {file_path}")
+
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空文件无法映射
+            self._mm = None
+        self._index = None
+
+    def __enter__(self) -> 'CaptureLog':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """释放内存映射和文件句柄"""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    @property
+    def index(self) -> List[Dict]:
+        """响应体偏移索引，首次访问时构建"""
+        if self._index is None:
+            self._index = self.build_index()
+        return self._index
+
+    def build_index(self) -> List[Dict]:
+        """
+        扫描整个日志，建立响应体偏移索引
+
+        只在映射内存上做字节查找，不解码响应体。请求头和请求体位于上一个响应体
+        结束位置与当前响应体之间，长度有限，单独解码以读取query和日期窗口。
+
+        Returns:
+            List[Dict]: 索引项列表，包含start、end、query、start_ymd、end_ymd
+        """
+        mm = self._mm
+        if mm is None:
+            return []
+
+        entries = []
+        prev_end = 0
+        marker = mm.find(_MARKER)
+        while marker != -1:
+            header = mm[max(prev_end, marker - REQUEST_WINDOW_SIZE):marker]
+            request = parse_request_body(header.decode('utf-8', errors='replace')) or {}
+
+            next_marker = mm.find(_MARKER, marker + len(_MARKER))
+            end = self._find_body_end(header, marker, next_marker)
+
+            entries.append({
+                'start': marker,
+                'end': end,
+                'query': list(request.get('query', [])),
+                'start_ymd': int(request['start_ymd']) if request.get('start_ymd') else None,
+                'end_ymd': int(request['end_ymd']) if request.get('end_ymd') else None
+            })
+            prev_end = end
+            marker = next_marker if next_marker == -1 or next_marker >= end else mm.find(_MARKER, end)
+        return entries
+
+    def _find_body_end(self, header: bytes, marker: int, next_marker: int) -> int:
+        """
+        确定响应体结束位置：优先使用响应头中的Content-Length，
+        否则取下一个请求行或下一个响应体之前的位置
+        """
+        limit = len(self._mm) if next_marker == -1 else next_marker
+
+        response_header = header[header.rfind(b'HTTP/'):] if b'HTTP/' in header else b''
+        lengths = _CONTENT_LENGTH_PATTERN.findall(response_header)
+        if lengths:
+            return min(marker + int(lengths[-1]), limit)
+
+        next_request = self._mm.find(b'\nPOST ', marker, limit)
+        return limit if next_request == -1 else next_request
+
+    def find_entries(self, keywords: Optional[Sequence[str]] = None,
+                     date_range: Optional[DateRange] = None) -> List[Dict]:
+        """
+        按关键词和日期范围筛选索引项，不解码响应体
+
+        Args:
+            keywords: 关键词列表，None表示不限
+            date_range: (开始, 结束)日期范围，None表示不限
+
+        Returns:
+            List[Dict]: 可能包含所需数据的索引项
+        """
+        wanted = set(keywords) if keywords is not None else None
+        start, end = (to_ymd(date) for date in (date_range or (None, None)))
+
+        matched = []
+        for entry in self.index:
+            if wanted is not None and entry['query'] and not wanted.intersection(entry['query']):
+                continue
+            if start is not None and entry['end_ymd'] is not None and entry['end_ymd'] < start:
+                continue
+            if end is not None and entry['start_ymd'] is not None and entry['start_ymd'] > end:
+                continue
+            matched.append(entry)
+        return matched
+
+    def decode_entry(self, entry: Dict) -> Dict:
+        """
+        解码单个响应体
+
+        Args:
+            entry: 索引项
+
+        Returns:
+            Dict: 响应JSON
+
+        Raises:
+            ValueError: 当响应体不是有效JSON时抛出
+        """
+        text = self._mm[entry['start']:entry['end']].decode('utf-8')
+        try:
+            return _decoder.raw_decode(text)[0]
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON数据解析失败(偏移 {entry['start']}): {str(e)}")
+
+    def _entry_series(self, entry: Dict, wanted: Optional[set],
+                      start: int, end: int) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """扫描单个响应体，返回所需关键词在[start, end]内的(日期数组, 数值数组)"""
+        series = {}
+        scanned = scan_time_indexes(self._mm[entry['start']:entry['end']])
+        for position, (keyword, times, scores) in enumerate(scanned):
+            keyword = keyword or (entry['query'][position] if position < len(entry['query']) else None)
+            if keyword is None or (wanted is not None and keyword not in wanted):
+                continue
+            mask = (times >= start) & (times <= end)
+            series[keyword] = (times[mask], scores[mask])
+        return series
+
+    def _iter_entry_series(self, keywords: Optional[Sequence[str]],
+                           date_range: Optional[DateRange]) -> Iterator[Tuple[Dict, Dict]]:
+        wanted = set(keywords) if keywords is not None else None
+        start, end = (to_ymd(date) for date in (date_range or (None, None)))
+        start = 0 if start is None else start
+        end = 99991231 if end is None else end
+
+        for entry in self.find_entries(keywords, date_range):
+            yield entry, self._entry_series(entry, wanted, start, end)
+
+    def iter_records(self, keywords: Optional[Sequence[str]] = None,
+                     date_range: Optional[DateRange] = None) -> Iterator[Tuple[str, int, int]]:
+        """
+        逐条产出所需关键词和日期范围内的指数记录
+
+        Args:
+            keywords: 关键词列表，None表示不限
+            date_range: (开始, 结束)日期范围，None表示不限
+
+        Returns:
+            Iterator[Tuple[str, int, int]]: (关键词, YYYYMMDD日期, 指数值)
+        """
+        for _, series in self._iter_entry_series(keywords, date_range):
+            for keyword, (times, scores) in series.items():
+                yield from zip([keyword] * len(times), times.tolist(), scores.tolist())
+
+    def load_columns(self, keywords: Optional[Sequence[str]] = None,
+                     date_range: Optional[DateRange] = None) -> Tuple[Dict[str, np.ndarray], List[Dict]]:
+        """
+        读取所需数据并合并为列式数据，重复抓取的(关键词, 日期)以日志中靠后的响应为准
+
+        Args:
+            keywords: 关键词列表，None表示不限
+            date_range: (开始, 结束)日期范围，None表示不限
+
+        Returns:
+            Tuple[Dict[str, np.ndarray], List[Dict]]: 列式数据和冲突列表（见core.ingest.merge_columns），
+                冲突来源记为"文件路径@响应体偏移"
+        """
+        columns_list, sources = [], []
+        for entry, series in self._iter_entry_series(keywords, date_range):
+            columns_list.append(columns_from_series(series))
+            sources.append(f"{self.file_path}@{entry['start']}")
+        return merge_columns(columns_list, sources)
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+相关性分析模块
+在(关键词 × 天)矩阵上用矩阵乘法计算全部关键词两两之间的皮尔逊相关系数，
+用FFT卷积计算±N天的滞后互相关，判断关键词之间的领先滞后关系
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.settings import ANALYSIS_CONFIG
+
+
+def _centered(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """返回缺失值（NaN）置0的去均值矩阵和有效值掩码"""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    mask = ~np.isnan(matrix)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        centers = np.where(mask, matrix, 0.0).sum(axis=1) / mask.sum(axis=1)
+    return np.where(mask, matrix - np.nan_to_num(centers)[:, None], 0.0), mask
+
+
+def correlation_matrix(matrix: np.ndarray, min_overlap: Optional[int] = None) -> np.ndarray:
+    """
+    计算各行两两之间的皮尔逊相关系数，每对关键词只使用双方都有数据的天
+
+    Args:
+        matrix: (关键词 × 天)矩阵，缺失值为NaN
+        min_overlap: 至少需要的共同有效天数，默认使用ANALYSIS_CONFIG['min_overlap_days']
+
+    Returns:
+        np.ndarray: (关键词 × 关键词)相关系数矩阵，共同天数不足或方差为0时为NaN
+    """
+    if min_overlap is None:
+        min_overlap = ANALYSIS_CONFIG['min_overlap_days']
+
+    # 先按行去均值，降低大数值下平方和相减的精度损失
+    values, mask = _centered(matrix)
+    present = mask.astype(np.float64)
+
+    # 第(i, j)项只累计j也有数据的天
+    overlap = present @ present.T
+    sums = values @ present.T
+    squares = (values * values) @ present.T
+    products = values @ values.T
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        covariance = products - sums * sums.T / overlap
+        variance = squares - sums * sums / overlap
+        result = covariance / np.sqrt(variance * variance.T)
+    result[(overlap < max(min_overlap, 2)) | ~np.isfinite(result)] = np.nan
+    return np.clip(result, -1.0, 1.0)
+
+
+def _lagged_products(matrix: np.ndarray, max_lag: int) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    逐个滞后生成归一化的(关键词 × 关键词)互相关矩阵
+
+    每行补零后做一次实数FFT，滞后k的互相关r[i, j] = Σt a_i[t] * a_j[t + k]
+    等于互功率谱F_i * conj(F_j)在k处的逆变换值；只需要2*max_lag+1个滞后，
+    因此对这些滞后直接在频域求和，每个滞后是两次(关键词 × 频率)的矩阵乘法，
+    不需要对每对关键词做完整的逆FFT。
+    """
+    values, _ = _centered(matrix)
+    days = values.shape[1]
+    max_lag = min(max_lag, max(days - 1, 0))
+
+    # 补零到不小于days+max_lag的2的幂，避免循环卷积把两端的滞后混在一起
+    size = 1 << int(np.ceil(np.log2(max(days + max_lag, 1))))
+    spectra = np.fft.rfft(values, n=size, axis=1)
+    norms = np.sqrt((values * values).sum(axis=1))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scale = 1.0 / np.outer(norms, norms)
+
+    # 实数序列的频谱共轭对称，除直流和奈奎斯特频率外每个频率计两次
+    frequencies = np.arange(spectra.shape[1])
+    weights = np.full(spectra.shape[1], 2.0 / size)
+    weights[0] = 1.0 / size
+    if size % 2 == 0:
+        weights[-1] = 1.0 / size
+
+    for lag in range(-max_lag, max_lag + 1):
+        shifted = spectra * (weights * np.exp(2j * np.pi * frequencies * lag / size))
+        products = spectra.real @ shifted.real.T + spectra.imag @ shifted.imag.T
+        with np.errstate(invalid='ignore'):
+            products *= scale
+        products[~np.isfinite(products)] = np.nan
+        yield lag, products
+
+
+def cross_correlation(matrix: np.ndarray, max_lag: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    用FFT计算各行两两之间±max_lag天的滞后互相关
+
+    序列去均值后缺失值按0处理，按整段序列的能量归一化（有偏估计），
+    无缺失时滞后0的结果与皮尔逊相关系数相同。
+    结果占用关键词数²×(2*max_lag+1)个浮点数，关键词很多时请使用lead_lag_pairs。
+
+    Args:
+        matrix: (关键词 × 天)矩阵，缺失值为NaN
+        max_lag: 最大滞后天数，默认使用ANALYSIS_CONFIG['max_lag_days']
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 滞后天数数组和(关键词 × 关键词 × 滞后)互相关数组，
+            第(i, j, k)项为i在第t天与j在第t+lags[k]天的相关，正滞后表示i领先j
+    """
+    if max_lag is None:
+        max_lag = ANALYSIS_CONFIG['max_lag_days']
+
+    lags, slices = [], []
+    for lag, products in _lagged_products(matrix, max_lag):
+        lags.append(lag)
+        slices.append(products)
+    count = np.asarray(matrix).shape[0]
+    result = np.stack(slices, axis=2) if slices else np.empty((count, count, 0))
+    return np.array(lags, dtype=np.int64), result
+
+
+def lead_lag_pairs(names: Sequence[str], matrix: np.ndarray,
+                   max_lag: Optional[int] = None) -> List[Dict[str, object]]:
+    """
+    找出每对关键词互相关最大的滞后天数，逐个滞后累计最大值，不保留完整的互相关数组
+
+    Args:
+        names: 与矩阵各行对应的关键词
+        matrix: (关键词 × 天)矩阵，缺失值为NaN
+        max_lag: 最大滞后天数，默认使用ANALYSIS_CONFIG['max_lag_days']
+
+    Returns:
+        List[Dict[str, object]]: 每对关键词一项，包含leader（领先方）、follower（跟随方）、
+            lag（领先天数，0表示同步）和correlation，按correlation降序排列；
+            无法计算相关的关键词对不包含在内
+    """
+    if max_lag is None:
+        max_lag = ANALYSIS_CONFIG['max_lag_days']
+
+    names = list(names)
+    peaks = best = None
+    for lag, products in _lagged_products(matrix, max_lag):
+        if peaks is None:
+            peaks = np.full(products.shape, -np.inf)
+            best = np.zeros(products.shape, dtype=np.int64)
+        better = products > peaks
+        peaks[better] = products[better]
+        best[better] = lag
+
+    pairs = []
+    if peaks is None:
+        return pairs
+
+    # 只保留上三角（i < j）且可计算相关的关键词对
+    rows, columns = np.nonzero(np.triu(np.isfinite(peaks), k=1))
+    for i, j, lag, peak in zip(rows.tolist(), columns.tolist(), best[rows, columns].tolist(),
+                               peaks[rows, columns].tolist()):
+        leader, follower = (names[i], names[j]) if lag >= 0 else (names[j], names[i])
+        pairs.append({'leader': leader, 'follower': follower, 'lag': abs(lag), 'correlation': peak})
+
+    pairs.sort(key=lambda item: item['correlation'], reverse=True)
+    return pairs
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+解析结果缓存模块
+将解析后的指数序列以列式数组持久化到磁盘，按文件指纹复用，避免重复解码JSON
+"""
+
+import hashlib
+import json
+import os
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import DATA_FILE_PATH, CACHE_CONFIG
+from core import json_backend
+from core.stream_parser import RESPONSE_MARKER, load_keyword_series, parse_request_body
+from core.date_codec import decode_ymd
+
+# 列式数据包含的数组名称
+COLUMN_NAMES = ('keywords', 'offsets', 'dates', 'scores')
+
+# 缓存格式版本，布局变化时递增使旧缓存失效
+CACHE_VERSION = 1
+
+_META_FILE = 'meta.json'
+
+
+def compute_content_hash(file_path: str) -> str:
+    """
+    分块计算文件内容哈希
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        str: 内容哈希的十六进制字符串
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CACHE_CONFIG['hash_chunk_size']), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_cache_path(file_path: str) -> str:
+    """
+    获取数据文件对应的缓存目录
+
+    Args:
+        file_path: 数据文件路径
+
+    Returns:
+        str: 缓存目录路径
+    """
+    path_key = hashlib.blake2b(os.path.abspath(file_path).encode('utf-8'), digest_size=8).hexdigest()
+    return os.path.join(CACHE_CONFIG['cache_dir'], path_key)
+
+
+def columns_from_series(series: Dict[str, Tuple[array, array]]) -> Dict[str, np.ndarray]:
+    """
+    将各关键词序列拼接为列式数组
+
+    Args:
+        series: 关键词到(YYYYMMDD日期数组, 数值数组)的映射
+
+    Returns:
+        Dict[str, np.ndarray]: 包含keywords、offsets、dates、scores的列式数据，
+            第i个关键词的数据位于 offsets[i]:offsets[i+1]
+    """
+    lengths = [len(times) for times, _ in series.values()]
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    times = np.concatenate([np.frombuffer(t, dtype=np.int64) for t, _ in series.values()]) \
+        if series else np.empty(0, dtype=np.int64)
+    scores = np.concatenate([np.frombuffer(s, dtype=np.int64) for _, s in series.values()]) \
+        if series else np.empty(0, dtype=np.int64)
+    dates = decode_ymd(times)
+
+    return {
+        'keywords': np.array(list(series.keys()), dtype=str),
+        'offsets': offsets,
+        'dates': dates,
+        'scores': scores
+    }
+
+
+def _read_meta(target_dir: str) -> Optional[Dict]:
+    """读取列式数据目录的元数据，不存在或损坏时返回None"""
+    try:
+        with open(os.path.join(target_dir, _META_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json_atomic(path: str, data: Dict) -> None:
+    """
+    原子写入JSON文件：先写入临时文件再替换，写入中断时不会留下残缺的文件
+
+    Args:
+        path: 目标文件路径
+        data: 要写入的数据
+    """
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def save_columns(target_dir: str, columns: Dict[str, np.ndarray], meta: Optional[Dict] = None) -> str:
+    """
+    将列式数据保存到目录，每个数组一个.npy文件
+
+    先删除元数据再逐个替换数组文件，最后写入元数据，
+    因此写入中断时不会留下元数据有效但内容残缺的目录。
+
+    Args:
+        target_dir: 目标目录
+        columns: 列式数据
+        meta: 附加元数据
+
+    Returns:
+        str: 目标目录路径
+    """
+    os.makedirs(target_dir, exist_ok=True)
+
+    meta_path = os.path.join(target_dir, _META_FILE)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    for name in COLUMN_NAMES:
+        array_path = os.path.join(target_dir, f'{name}.npy')
+        with open(f'{array_path}.tmp', 'wb') as f:
+            np.save(f, columns[name])
+        os.replace(f'{array_path}.tmp', array_path)
+
+    write_json_atomic(meta_path, dict(meta or {}, version=CACHE_VERSION))
+    return target_dir
+
+
+def load_columns(target_dir: str) -> Optional[Dict[str, np.ndarray]]:
+    """
+    以内存映射方式加载目录中的列式数据
+
+    Args:
+        target_dir: save_columns写入的目录
+
+    Returns:
+        Optional[Dict[str, np.ndarray]]: 列式数据，目录无效时返回None
+    """
+    meta = _read_meta(target_dir)
+    if meta is None or meta.get('version') != CACHE_VERSION:
+        return None
+
+    try:
+        return {
+            name: np.load(os.path.join(target_dir, f'{name}.npy'), mmap_mode='r')
+            for name in COLUMN_NAMES
+        }
+    except (OSError, ValueError):
+        return None
+
+
+def _read_cache(cache_path: str, file_path: str) -> Optional[Dict[str, np.ndarray]]:
+    """
+    读取并校验缓存，指纹不匹配时返回None
+    """
+    meta = _read_meta(cache_path)
+    if meta is None:
+        return None
+
+    stat = os.stat(file_path)
+    if meta.get('path') != os.path.abspath(file_path) or meta.get('size') != stat.st_size:
+        return None
+
+    # 修改时间变化时再比较内容哈希，仅被touch过的文件仍可复用缓存
+    if meta.get('mtime_ns') != stat.st_mtime_ns:
+        if meta.get('content_hash') != compute_content_hash(file_path):
+            return None
+        meta['mtime_ns'] = stat.st_mtime_ns
+        write_json_atomic(os.path.join(cache_path, _META_FILE), meta)
+
+    return load_columns(cache_path)
+
+
+def write_cache(file_path: str, columns: Dict[str, np.ndarray]) -> str:
+    """
+    将列式数据写入缓存目录，元数据中记录文件指纹
+
+    Args:
+        file_path: 数据文件路径
+        columns: 列式数据
+
+    Returns:
+        str: 缓存目录路径
+    """
+    stat = os.stat(file_path)
+    return save_columns(get_cache_path(file_path), columns, {
+        'path': os.path.abspath(file_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'content_hash': compute_content_hash(file_path)
+    })
+
+
+def _series_from_scan(body: bytes, query: List[str]) -> Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+    """用time_indexes扫描器提取各关键词序列，无法确定某个条目的关键词时返回None"""
+    series = {}
+    for position, (keyword, times, scores) in enumerate(json_backend.scan_time_indexes(body)):
+        expected = query[position] if position < len(query) else None
+        if keyword is not None and expected is not None and keyword != expected:
+            raise ValueError(f"响应条目关键词 {keyword} 与请求体中的 {expected} 不一致")
+        keyword = expected or keyword
+        if keyword is None:
+            return None
+        series[keyword] = (times, scores)
+    return series
+
+
+def _series_from_json(body: bytes, query: List[str]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """完整解码响应体后提取各关键词序列"""
+    try:
+        resp_list = json_backend.loads(body)['content']['resp_list']
+    except ValueError as e:
+        raise ValueError(f"JSON数据解析失败: {str(e)}")
+
+    series = {}
+    for position, entry in enumerate(resp_list):
+        keyword = query[position] if position < len(query) else entry.get('query')
+        if keyword is None:
+            raise ValueError("响应条目缺少query字段，无法确定关键词")
+        points = entry['indexes'][0]['time_indexes'] if entry.get('indexes') else []
+        series[keyword] = (np.array([point['time'] for point in points], dtype=np.int64),
+                           np.array([point['score'] for point in points], dtype=np.int64))
+    return series
+
+
+def parse_index_columns(file_path: Optional[str] = None, streaming: Optional[bool] = None) -> Dict[str, np.ndarray]:
+    """
+    解析抓包文件为列式数据，不读写缓存
+
+    默认整体读入文件，用core.json_backend.scan_time_indexes直接扫描出数组，
+    扫描器无法确定关键词时退回完整JSON解码；流式解析器逐个词法单元处理，
+    内存占用与文件大小无关但慢一个数量级，只用于无法整体载入内存的超大抓包文件。
+
+    Args:
+        file_path: 数据文件路径，默认使用配置中的DATA_FILE_PATH
+        streaming: 是否使用流式解析器，默认读取CACHE_CONFIG['streaming']
+
+    Returns:
+        Dict[str, np.ndarray]: 列式数据
+
+    Raises:
+        ValueError: 当找不到有效JSON数据或数据格式错误时抛出
+        FileNotFoundError: 当数据文件不存在时抛出
+    """
+    file_path = file_path or DATA_FILE_PATH
+    if streaming is None:
+        streaming = CACHE_CONFIG['streaming']
+    if streaming:
+        return columns_from_series(load_keyword_series(file_path))
+
+    try:
+        with open(file_path, 'rb') as f:
+            content = f.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"数据文件未找到: {file_path}")
+
+    json_start = content.find(RESPONSE_MARKER.encode('utf-8'))
+    if json_start == -1:
+        raise ValueError("文件中找不到有效的JSON数据格式")
+
+    # 请求体中的query数组与resp_list一一对应，优先用它确定关键词
+    request_body = parse_request_body(content[:json_start].decode('utf-8', errors='replace'))
+    query = request_body['query'] if request_body else []
+    body = content[json_start:].strip()
+
+    series = _series_from_scan(body, query)
+    if series is None:
+        series = _series_from_json(body, query)
+    return columns_from_series(series)
+
+
+def load_index_columns(file_path: Optional[str] = None,
+                       use_cache: Optional[bool] = None,
+                       streaming: Optional[bool] = None) -> Dict[str, np.ndarray]:
+    """
+    加载列式指数数据，缓存命中时直接映射磁盘数组，未命中时解析后写入缓存
+
+    Args:
+        file_path: 数据文件路径，默认使用配置中的DATA_FILE_PATH
+        use_cache: 是否使用缓存，默认读取CACHE_CONFIG['enabled']
+        streaming: 缓存未命中时是否使用流式解析器，默认读取CACHE_CONFIG['streaming']
+
+    Returns:
+        Dict[str, np.ndarray]: 列式数据
+    """
+    file_path = file_path or DATA_FILE_PATH
+    if use_cache is None:
+        use_cache = CACHE_CONFIG['enabled']
+
+    if use_cache and os.path.exists(file_path):
+        columns = _read_cache(get_cache_path(file_path), file_path)
+        if columns is not None:
+            return columns
+
+    columns = parse_index_columns(file_path, streaming)
+
+    if use_cache:
+        try:
+            write_cache(file_path, columns)
+        except OSError as e:
+            print(f"警告: 无法写入解析缓存: {str(e)}")
+
+    return columns
@@ -4,18 +4,28 @@
 负责从原始数据文件中解析JSON数据和平台信息
 """
 
-import json
 from datetime import datetime
 import numpy as np
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Iterable, Optional
+from numpy.typing import ArrayLike
 
-from config.settings import DATA_FILE_PATH, PLATFORM_CONFIGS
+from config.settings import DATA_FILE_PATH, PLATFORM_CONFIGS, CACHE_CONFIG, STORE_CONFIG
+from core import json_backend
+from core.data_cache import load_index_columns, parse_index_columns
+from core.date_codec import decode_ymd, to_datetime
+from core.platform_series import PlatformSeries
+from core.batch_stats import batch_statistics
+from core.keyword_registry import get_keyword_registry
+from core.index_store import IndexStore, DateRange
 
 
-def load_raw_data() -> Dict[str, Any]:
+def load_raw_data(file_path: Optional[str] = None) -> Dict[str, Any]:
     """
     从原始文件加载JSON数据
     
+    Args:
+        file_path: 数据文件路径，默认使用配置中的DATA_FILE_PATH
+        
     Returns:
         Dict[str, Any]: 解析后的JSON数据
         
@@ -23,11 +33,12 @@ def load_raw_data() -> Dict[str, Any]:
         ValueError: 当找不到有效JSON数据时抛出
         FileNotFoundError: 当数据文件不存在时抛出
     """
+    file_path = file_path or DATA_FILE_PATH
     try:
-        with open(DATA_FILE_PATH, 'r', encoding='utf-8') as f:
+        with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
     except FileNotFoundError:
-        raise FileNotFoundError(f"数据文件未找到: {DATA_FILE_PATH}")
+        raise FileNotFoundError(f"数据文件未找到: {file_path}")
     
     # 查找JSON数据起始位置
     json_start = content.find('{"code":0,"content":')
@@ -37,13 +48,13 @@ def load_raw_data() -> Dict[str, Any]:
     # 提取并解析JSON数据
     json_data = content[json_start:].strip()
     try:
-        data = json.loads(json_data)
+        data = json_backend.loads(json_data)
         return data
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         raise ValueError(f"JSON数据解析失败: {str(e)}")
 
 
-def extract_platform_time_data(resp_list: List[Dict], platform_index: int) -> Tuple[List[datetime], List[int]]:
+def extract_platform_time_data(resp_list: List[Dict], platform_index: int) -> Tuple[np.ndarray, np.ndarray]:
     """
     提取指定平台的时间序列数据
     
@@ -52,66 +63,125 @@ def extract_platform_time_data(resp_list: List[Dict], platform_index: int) -> Tu
         platform_index: 平台索引
         
     Returns:
-        Tuple[List[datetime], List[int]]: 日期列表和数值列表
+        Tuple[np.ndarray, np.ndarray]: datetime64[D]日期数组和int64数值数组
     """
     if platform_index >= len(resp_list):
         raise IndexError(f"平台索引超出范围: {platform_index}")
     
     time_indexes = resp_list[platform_index]['indexes'][0]['time_indexes']
+    count = len(time_indexes)
     
-    dates = []
-    values = []
+    return build_time_series(
+        np.fromiter((time_data['time'] for time_data in time_indexes), dtype=np.int64, count=count),
+        np.fromiter((time_data['score'] for time_data in time_indexes), dtype=np.int64, count=count)
+    )
+
+
+def build_time_series(times: ArrayLike, scores: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    将原始日期和指数批量转换为时间序列数组
     
-    for time_data in time_indexes:
-        # 解析日期（YYYYMMDD格式）
-        time_str = str(time_data['time'])
-        date = datetime.strptime(time_str, '%Y%m%d')
-        dates.append(date)
+    Args:
+        times: YYYYMMDD格式的整数日期序列
+        scores: 指数值序列
         
-        # 提取数值
-        value = int(time_data['score'])
-        values.append(value)
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: datetime64[D]日期数组和int64数值数组
+    """
+    dates = decode_ymd(times)
+    values = np.asarray(scores, dtype=np.int64)
     
     return dates, values
 
 
-def parse_platforms_data(platform_type: str = 'delivery_platforms') -> Dict[str, Dict]:
+def extract_columns_time_data(columns: Dict[str, np.ndarray], platform_index: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    从列式数据中提取指定平台的时间序列数据
+    
+    Args:
+        columns: 列式数据（见core.data_cache.columns_from_series）
+        platform_index: 平台索引
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 日期数组和数值数组（列式数据的切片视图，不复制）
+    """
+    if platform_index >= len(columns['keywords']):
+        raise IndexError(f"平台索引超出范围: {platform_index}")
+    
+    start, end = columns['offsets'][platform_index:platform_index + 2]
+    return columns['dates'][start:end], columns['scores'][start:end]
+
+
+def parse_platforms_data(platform_type: str = 'delivery_platforms',
+                         streaming: bool = False,
+                         use_cache: Optional[bool] = None,
+                         file_path: Optional[str] = None,
+                         columns: Optional[Dict[str, np.ndarray]] = None,
+                         source: Optional[str] = None,
+                         date_range: Optional[DateRange] = None) -> Dict[str, PlatformSeries]:
     """
     解析指定类型的平台数据
     
     Args:
         platform_type: 平台类型 ('five_platforms' 或 'delivery_platforms')
+        streaming: 是否使用流式解析，适用于大体积抓包文件
+        use_cache: 是否使用磁盘解析缓存，默认读取CACHE_CONFIG['enabled']；
+            缓存未命中时解析文件并写入缓存
+        file_path: 数据文件路径，默认使用配置中的DATA_FILE_PATH
+        columns: 已加载的列式数据，提供时不再读取文件
+        source: 数据来源，'capture'读取抓包文件，'store'读取时序存储，默认读取STORE_CONFIG['source']
+        date_range: 从时序存储读取时的(开始, 结束)日期范围，只加载该区间的数据
         
     Returns:
-        Dict[str, Dict]: 包含各平台数据的字典
+        Dict[str, PlatformSeries]: 平台名称到序列的映射
     """
-    # 加载原始数据
-    raw_data = load_raw_data()
-    resp_list = raw_data['content']['resp_list']
+    if use_cache is None:
+        use_cache = CACHE_CONFIG['enabled']
     
     # 获取平台配置
     if platform_type not in PLATFORM_CONFIGS:
         raise ValueError(f"不支持的平台类型: {platform_type}")
     
-    platforms_config = PLATFORM_CONFIGS[platform_type]
+    # 加载原始数据并建立关键词索引
+    if columns is None and (source or STORE_CONFIG['source']) == 'store':
+        with IndexStore() as store:
+            columns = store.load_columns(PLATFORM_CONFIGS[platform_type], date_range)
+    elif columns is None and use_cache:
+        columns = load_index_columns(file_path, use_cache=True, streaming=streaming or None)
+    elif columns is None and streaming:
+        columns = parse_index_columns(file_path, streaming=True)
+    
+    if columns is not None:
+        keyword_index = build_keyword_index(columns['keywords'].tolist())
+    else:
+        raw_data = load_raw_data(file_path)
+        resp_list = raw_data['content']['resp_list']
+        keyword_index = build_keyword_index(entry.get('query') for entry in resp_list)
+    
+    registry = get_keyword_registry()
     platforms_data = {}
     
-    # 提取各平台数据
-    for platform_info in platforms_config:
-        platform_index = platform_info['index']
-        platform_name = platform_info['name_cn']
-        platform_color = platform_info['color']
+    # 按关键词提取各平台数据
+    for platform_name in PLATFORM_CONFIGS[platform_type]:
+        platform_info = registry.get(platform_name)
         
         try:
-            dates, values = extract_platform_time_data(resp_list, platform_index)
+            if platform_name not in keyword_index:
+                raise KeyError("数据中不存在该关键词")
+            platform_index = keyword_index[platform_name]
+            
+            if columns is not None:
+                dates, values = extract_columns_time_data(columns, platform_index)
+            else:
+                dates, values = extract_platform_time_data(resp_list, platform_index)
             
-            platforms_data[platform_name] = {
-                'dates': dates,
-                'values': values,
-                'color': platform_color,
-                'name': platform_info.get('name', platform_name),
-                'name_cn': platform_name
-            }
+            platforms_data[platform_name] = PlatformSeries(
+                platform_name,
+                dates,
+                values,
+                platform_info['color'],
+                name=platform_info['name']
+            )
         except (IndexError, KeyError) as e:
             print(f"警告: 无法解析平台 {platform_name} 的数据: {str(e)}")
             continue
@@ -119,43 +189,57 @@ def parse_platforms_data(platform_type: str = 'delivery_platforms') -> Dict[str,
     return platforms_data
 
 
-def calculate_statistics(values: List[int]) -> Dict[str, float]:
+def build_keyword_index(keywords: Iterable[Optional[str]]) -> Dict[str, int]:
+    """
+    建立关键词到序列位置的索引
+    
+    Args:
+        keywords: 按数据顺序排列的关键词，缺失的关键词为None
+        
+    Returns:
+        Dict[str, int]: 关键词到位置的映射，重复关键词保留首次出现的位置
+    """
+    keyword_index = {}
+    for position, keyword in enumerate(keywords):
+        if keyword is not None and keyword not in keyword_index:
+            keyword_index[keyword] = position
+    return keyword_index
+
+
+def calculate_statistics(values: ArrayLike) -> Dict[str, float]:
     """
     计算数据统计信息
     
     Args:
-        values: 数值列表
+        values: 数值数组或列表
         
     Returns:
         Dict[str, float]: 包含统计信息的字典
     """
-    if not values:
+    if len(values) == 0:
         return {'mean': 0, 'std': 0, 'min': 0, 'max': 0}
     
-    np_values = np.array(values)
-    return {
-        'mean': float(np.mean(np_values)),
-        'std': float(np.std(np_values)),
-        'min': float(np.min(np_values)),
-        'max': float(np.max(np_values))
-    }
+    stats = batch_statistics(np.asarray(values, dtype=np.float64)[None, :], percentiles=())
+    return {key: float(stats[key][0]) for key in ('mean', 'std', 'min', 'max')}
 
 
-def get_date_range(platforms_data: Dict[str, Dict]) -> Tuple[datetime, datetime]:
+def get_date_range(platforms_data: Dict[str, PlatformSeries]) -> Tuple[datetime, datetime]:
     """
     获取所有平台数据的日期范围
     
     Args:
-        platforms_data: 平台数据字典
+        platforms_data: 平台名称到序列的映射
         
     Returns:
         Tuple[datetime, datetime]: 开始和结束日期
     """
-    all_dates = []
-    for platform_data in platforms_data.values():
-        all_dates.extend(platform_data['dates'])
+    # 各平台日期有序，只需比较首尾元素
+    non_empty = [platform_data.dates for platform_data in platforms_data.values()
+                 if len(platform_data.dates)]
     
-    if not all_dates:
+    if not non_empty:
         return None, None
     
-    return min(all_dates), max(all_dates)
\ No newline at end of file
+    start_date = min(dates[0] for dates in non_empty)
+    end_date = max(dates[-1] for dates in non_empty)
+    return to_datetime(start_date), to_datetime(end_date)
\ No newline at end of file
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+数据集注册表模块
+在进程内按文件指纹共享已解析的数据集，使同一次运行中的所有图表只解析一次数据文件
+"""
+
+import os
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from config.settings import DATA_FILE_PATH, PLATFORM_CONFIGS, STORE_CONFIG
+from core.data_cache import load_index_columns
+from core.data_parser import parse_platforms_data
+from core.index_store import IndexStore, DateRange
+from core.platform_series import PlatformSeries
+
+# 文件指纹：(绝对路径, 文件大小, 修改时间纳秒)
+Fingerprint = Tuple[str, int, int]
+
+_lock = threading.RLock()
+_columns_registry: Dict[Fingerprint, Dict[str, np.ndarray]] = {}
+_platforms_registry: Dict[Tuple[Fingerprint, str, Optional[DateRange]], Dict[str, PlatformSeries]] = {}
+
+
+def get_file_fingerprint(file_path: Optional[str] = None) -> Fingerprint:
+    """
+    获取数据文件指纹
+
+    Args:
+        file_path: 数据文件路径，默认使用配置中的DATA_FILE_PATH
+
+    Returns:
+        Fingerprint: (绝对路径, 文件大小, 修改时间纳秒)
+
+    Raises:
+        FileNotFoundError: 当数据文件不存在时抛出
+    """
+    file_path = os.path.abspath(file_path or DATA_FILE_PATH)
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"数据文件未找到: {file_path}")
+    return file_path, stat.st_size, stat.st_mtime_ns
+
+
+def _freeze(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """将共享数组设为只读，防止某个图表修改其他图表看到的数据"""
+    for array in columns.values():
+        array.flags.writeable = False
+    return columns
+
+
+def _drop_stale(fingerprint: Fingerprint, platform_type: Optional[str] = None) -> None:
+    """移除同一路径下指纹已过期的注册项，指定platform_type时只处理该平台类型"""
+    path = fingerprint[0]
+    for key in [key for key in _columns_registry if key[0] == path and key != fingerprint]:
+        del _columns_registry[key]
+    for key in [key for key in _platforms_registry
+                if key[0][0] == path and key[0] != fingerprint and platform_type in (None, key[1])]:
+        del _platforms_registry[key]
+
+
+def get_index_columns(file_path: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    获取共享的列式数据，同一文件指纹在进程内只加载一次
+
+    Args:
+        file_path: 数据文件路径，默认使用配置中的DATA_FILE_PATH
+
+    Returns:
+        Dict[str, np.ndarray]: 只读的列式数据
+    """
+    fingerprint = get_file_fingerprint(file_path)
+    with _lock:
+        columns = _columns_registry.get(fingerprint)
+        if columns is None:
+            # 文件已变化时旧数据不再可用
+            _drop_stale(fingerprint)
+            columns = _freeze(load_index_columns(fingerprint[0]))
+            _columns_registry[fingerprint] = columns
+        return columns
+
+
+def get_store_fingerprint(db_path: Optional[str] = None,
+                          keywords: Optional[Iterable[str]] = None) -> Fingerprint:
+    """
+    获取时序存储指纹
+
+    SQLite在WAL模式下写入不一定改变主文件的大小和修改时间，
+    因此以存储修订号代替修改时间，大小位固定为0。
+
+    Args:
+        db_path: 数据库文件路径，默认使用STORE_CONFIG['db_path']
+        keywords: 关键词列表，指定时只反映这些关键词的变化
+
+    Returns:
+        Fingerprint: (绝对路径, 0, 修订号)
+    """
+    with IndexStore(db_path) as store:
+        revision = store.revision(None if keywords is None else list(keywords))
+        return os.path.abspath(store.db_path), 0, revision
+
+
+def get_platforms_revision(platform_type: str = 'delivery_platforms') -> Optional[int]:
+    """
+    获取平台类型在时序存储中的修订号
+
+    修订号持久化在存储中，其他进程追加数据后同样会变化，
+    持有平台数据的调用方可据此判断数据是否需要重新加载。
+
+    Args:
+        platform_type: 平台类型
+
+    Returns:
+        Optional[int]: 该平台类型关键词的最新修订号；数据来源不是时序存储时为None
+    """
+    if STORE_CONFIG['source'] != 'store':
+        return None
+    return get_store_fingerprint(keywords=PLATFORM_CONFIGS.get(platform_type))[2]
+
+
+def get_platforms_data(platform_type: str = 'delivery_platforms',
+                       file_path: Optional[str] = None,
+                       date_range: Optional[DateRange] = None) -> Dict[str, PlatformSeries]:
+    """
+    获取共享的平台数据，按(数据指纹, 平台类型, 日期范围)记忆化
+
+    返回的序列在多个图表之间共享，数组为只读视图。数据来源为时序存储时
+    只加载date_range区间；来源为抓包文件时数据已整体映射，忽略date_range。
+
+    Args:
+        platform_type: 平台类型
+        file_path: 数据文件路径，默认使用配置中的DATA_FILE_PATH
+        date_range: (开始, 结束)日期范围
+
+    Returns:
+        Dict[str, PlatformSeries]: 平台名称到序列的映射
+    """
+    from_store = STORE_CONFIG['source'] == 'store'
+    if from_store:
+        fingerprint = get_store_fingerprint(keywords=PLATFORM_CONFIGS.get(platform_type))
+    else:
+        fingerprint = get_file_fingerprint(file_path)
+        date_range = None
+
+    key = (fingerprint, platform_type, date_range)
+    with _lock:
+        platforms_data = _platforms_registry.get(key)
+        if platforms_data is None:
+            if from_store:
+                _drop_stale(fingerprint, platform_type)
+                platforms_data = parse_platforms_data(platform_type, source='store', date_range=date_range)
+                for series in platforms_data.values():
+                    series.dates.flags.writeable = False
+                    series.values.flags.writeable = False
+            else:
+                columns = get_index_columns(fingerprint[0])
+                platforms_data = parse_platforms_data(platform_type, columns=columns)
+            _platforms_registry[key] = platforms_data
+        return platforms_data
+
+
+def invalidate_dataset(file_path: Optional[str] = None) -> int:
+    """
+    显式失效已注册的数据集
+
+    Args:
+        file_path: 要失效的数据文件路径，为None时清空全部注册项
+
+    Returns:
+        int: 被移除的注册项数量
+    """
+    with _lock:
+        if file_path is None:
+            removed = len(_columns_registry) + len(_platforms_registry)
+            _columns_registry.clear()
+            _platforms_registry.clear()
+            return removed
+
+        path = os.path.abspath(file_path)
+        column_keys = [key for key in _columns_registry if key[0] == path]
+        platform_keys = [key for key in _platforms_registry if key[0][0] == path]
+        for key in column_keys:
+            del _columns_registry[key]
+        for key in platform_keys:
+            del _platforms_registry[key]
+        return len(column_keys) + len(platform_keys)
+
+
+def invalidate_keywords(keywords: Iterable[str]) -> int:
+    """
+    失效包含指定关键词的平台数据，其余平台类型的注册项保持不变
+
+    只作用于当前进程，用于写入方立即释放旧数据；其他进程通过存储中持久化的
+    关键词修订号（见get_store_fingerprint和get_platforms_revision）发现变化。
+
+    Args:
+        keywords: 发生变化的关键词
+
+    Returns:
+        int: 被移除的注册项数量
+    """
+    changed = set(keywords)
+    with _lock:
+        keys = [key for key, platforms_data in _platforms_registry.items()
+                if changed.intersection(PLATFORM_CONFIGS.get(key[1], ()))
+                or any(series.name_cn in changed for series in platforms_data.values())]
+        for key in keys:
+            del _platforms_registry[key]
+        return len(keys)
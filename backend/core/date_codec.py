@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+日期编解码模块
+在YYYYMMDD整数与datetime64[D]数组之间进行批量向量化转换
+"""
+
+from datetime import datetime
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+
+def decode_ymd(times: Union[np.ndarray, Iterable[int]]) -> np.ndarray:
+    """
+    将YYYYMMDD整数批量解码为日期数组
+
+    通过整除和取模拆分年月日，先构造月份精度的datetime64再加上天数偏移，
+    全程为数组运算，不为每个数据点创建Python对象。
+
+    Args:
+        times: YYYYMMDD格式的整数序列
+
+    Returns:
+        np.ndarray: datetime64[D]日期数组
+
+    Raises:
+        ValueError: 当存在不合法的日期（如20240231）时抛出，避免其滚动到相邻的真实日期
+    """
+    times = np.asarray(times, dtype=np.int64)
+    years = times // 10000
+    months = times // 100 % 100
+    days = times % 100
+
+    month_offsets = (years - 1970) * 12 + (months - 1)
+    dates = month_offsets.astype('datetime64[M]').astype('datetime64[D]') + (days - 1)
+
+    # 月份或天数越界时按偏移计算会落到其他日期，重新编码后与输入不一致
+    invalid = encode_ymd(dates) != times
+    if invalid.any():
+        raise ValueError(f"无效的YYYYMMDD日期: {times[invalid].ravel()[0]}")
+    return dates
+
+
+def encode_ymd(dates: Union[np.ndarray, Iterable]) -> np.ndarray:
+    """
+    将日期数组批量编码为YYYYMMDD整数
+
+    Args:
+        dates: 可转换为datetime64[D]的日期序列
+
+    Returns:
+        np.ndarray: int64整数数组
+    """
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    months = dates.astype('datetime64[M]')
+    years = months.astype('datetime64[Y]')
+
+    month_numbers = (months - years).astype(np.int64) + 1
+    day_numbers = (dates - months).astype(np.int64) + 1
+    return (years.astype(np.int64) + 1970) * 10000 + month_numbers * 100 + day_numbers
+
+
+def to_ymd(date) -> Optional[int]:
+    """
+    将单个日期参数统一转换为YYYYMMDD整数
+
+    Args:
+        date: YYYYMMDD整数或纯数字字符串、datetime、date、datetime64或ISO日期字符串，可为None
+
+    Returns:
+        Optional[int]: YYYYMMDD整数，输入为None时返回None
+
+    Raises:
+        ValueError: 当YYYYMMDD日期不存在时抛出
+    """
+    if date is None:
+        return None
+    if isinstance(date, str) and date.strip().isdigit():
+        # np.datetime64会把'20240822'当作年份解析，纯数字字符串按YYYYMMDD整数处理
+        date = int(date)
+    if isinstance(date, (int, np.integer)):
+        decode_ymd([date])
+        return int(date)
+    return int(encode_ymd(np.datetime64(date, 'D')))
+
+
+def to_datetime(date: Optional[np.datetime64]) -> Optional[datetime]:
+    """
+    将单个datetime64转换为datetime对象
+
+    Args:
+        date: datetime64日期，可为None
+
+    Returns:
+        Optional[datetime]: 对应的datetime对象
+    """
+    if date is None:
+        return None
+    return np.datetime64(date, 'us').item()
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""
+指数抓取客户端模块
+基于asyncio的wxindex接口客户端，提供长连接池、令牌桶限速、并发上限和指数退避重试，
+抓取结果直接解码为列式数据并写入时序存储
+"""
+
+import asyncio
+import json
+import random
+import sqlite3
+import ssl
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from config.settings import FETCH_CONFIG
+from core.archive_ingest import columns_from_body, decompress_body
+from core.index_store import IndexStore
+from core.json_backend import loads
+
+# 抓取任务：包含query（关键词列表）、start_ymd、end_ymd
+Job = Dict
+
+
+class FetchError(Exception):
+    """抓取失败，retryable表示是否值得重试（限流、服务端错误、连接中断）"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class TokenBucket:
+    """令牌桶限速器，每个请求消耗一个令牌"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """等待直到取得一个令牌"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class ConnectionPool:
+    """HTTP/1.1长连接池，连接数上限同时限制并发请求数"""
+
+    def __init__(self, url: str, size: int):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.ssl = ssl.create_default_context() if parts.scheme == 'https' else None
+        self.port = parts.port or (443 if self.ssl else 80)
+        self._idle = []
+        self._semaphore = asyncio.Semaphore(size)
+
+    async def acquire(self, timeout: Optional[float] = None) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """
+        获取一个连接，没有空闲连接时新建
+
+        Args:
+            timeout: 新建连接的超时秒数；等待连接数上限释放的时间不计入超时
+        """
+        await self._semaphore.acquire()
+        if self._idle:
+            return self._idle.pop()
+        try:
+            return await asyncio.wait_for(asyncio.open_connection(self.host, self.port, ssl=self.ssl), timeout)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    def release(self, connection: Tuple[asyncio.StreamReader, asyncio.StreamWriter], reusable: bool):
+        if reusable:
+            self._idle.append(connection)
+        else:
+            connection[1].close()
+        self._semaphore.release()
+
+    async def close(self):
+        """关闭全部空闲连接"""
+        while self._idle:
+            writer = self._idle.pop()[1]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str], bytes, bool]:
+    """读取一个HTTP响应，返回(状态码, 小写响应头, 响应体, 连接是否可复用)"""
+    head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+    status = int(head[0].split()[1])
+    headers = {}
+    for line in head[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+
+    reusable = headers.get('connection', '').lower() != 'close'
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                while (await reader.readline()) not in (b'\r\n', b''):
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        body = b''.join(chunks)
+    elif 'content-length' in headers:
+        body = await reader.readexactly(int(headers['content-length']))
+    else:
+        body, reusable = await reader.read(), False
+    return status, headers, body, reusable
+
+
+class WxIndexClient:
+    """
+    wxindex接口异步客户端
+    未指定的参数均取自FETCH_CONFIG
+    """
+
+    def __init__(self, url: Optional[str] = None, concurrency: Optional[int] = None,
+                 rate: Optional[float] = None, burst: Optional[int] = None,
+                 retries: Optional[int] = None, backoff: Optional[float] = None,
+                 timeout: Optional[float] = None):
+        self.url = url or FETCH_CONFIG['url']
+        self.retries = FETCH_CONFIG['retries'] if retries is None else retries
+        self.backoff = FETCH_CONFIG['backoff'] if backoff is None else backoff
+        self.timeout = timeout or FETCH_CONFIG['timeout']
+        self.pool = ConnectionPool(self.url, concurrency or FETCH_CONFIG['concurrency'])
+        self.bucket = TokenBucket(rate or FETCH_CONFIG['rate'], burst or FETCH_CONFIG['burst'])
+
+        parts = urlsplit(self.url)
+        self._path = parts.path + (f'?{parts.query}' if parts.query else '')
+        self._host = parts.netloc
+
+    async def __aenter__(self) -> 'WxIndexClient':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.pool.close()
+
+    def build_request_body(self, query: Sequence[str], start_ymd, end_ymd) -> bytes:
+        """构造GetDefaultIndex请求体，格式与抓包中的请求一致"""
+        return json.dumps({
+            'openid': FETCH_CONFIG['openid'],
+            'search_key': FETCH_CONFIG['search_key'],
+            'cgi_name': 'GetDefaultIndex',
+            'query': list(query),
+            'compound_word': [],
+            'start_ymd': str(start_ymd),
+            'end_ymd': str(end_ymd)
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    async def _post(self, body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        head = (f"POST {self._path} HTTP/1.1\r\nHost: {self._host}\r\nConnection: keep-alive\r\n"
+                f"Content-Type: application/json\r\nAccept-Encoding: gzip, deflate\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n").encode('latin-1')
+
+        async def exchange(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            writer.write(head + body)
+            await writer.drain()
+            return await _read_response(reader)
+
+        # 建立连接、发送请求和读取响应均受超时限制，超时的连接不再复用
+        connection = await self.pool.acquire(self.timeout)
+        reusable = False
+        try:
+            status, headers, data, reusable = await asyncio.wait_for(exchange(*connection), self.timeout)
+        finally:
+            self.pool.release(connection, reusable)
+        return status, headers, decompress_body(data, headers.get('content-encoding', ''))
+
+    async def fetch(self, query: Sequence[str], start_ymd, end_ymd) -> bytes:
+        """
+        抓取一组关键词在日期窗口内的指数，失败时按指数退避重试
+
+        Args:
+            query: 关键词列表，最多FETCH_CONFIG['max_keywords']个
+            start_ymd: 开始日期（YYYYMMDD）
+            end_ymd: 结束日期（YYYYMMDD）
+
+        Returns:
+            bytes: 未压缩的响应体
+
+        Raises:
+            ValueError: 当关键词数量超出上限时抛出
+            FetchError: 当重试次数用尽或遇到不可重试的错误时抛出
+        """
+        if len(query) > FETCH_CONFIG['max_keywords']:
+            raise ValueError(f"单次请求最多查询 {FETCH_CONFIG['max_keywords']} 个关键词")
+
+        body = self.build_request_body(query, start_ymd, end_ymd)
+        for attempt in range(self.retries + 1):
+            await self.bucket.acquire()
+            try:
+                status, _, data = await self._post(body)
+                if status == 429 or status >= 500:
+                    raise FetchError(f"HTTP {status}")
+                if status != 200:
+                    raise FetchError(f"HTTP {status}", retryable=False)
+                code = loads(data).get('code')
+                if code != 0:
+                    raise FetchError(f"接口返回错误码 {code}")
+                return data
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError, FetchError) as e:
+                retryable = getattr(e, 'retryable', True)
+                if not retryable or attempt == self.retries:
+                    reason = str(e) or type(e).__name__
+                    raise FetchError(f"抓取 {','.join(query)} {start_ymd}-{end_ymd} 失败: {reason}", retryable)
+                await asyncio.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+
+
+async def fetch_into_store(jobs: Sequence[Job], client: Optional[WxIndexClient] = None,
+                           on_result: Optional[Callable[[Job, Dict[str, np.ndarray], IndexStore], int]] = None,
+                           db_path: Optional[str] = None) -> Dict:
+    """
+    并发执行抓取任务，每个响应解码后立即写入时序存储
+
+    Args:
+        jobs: 抓取任务列表
+        client: 抓取客户端，默认按FETCH_CONFIG创建
+        on_result: 写入回调，参数为(任务, 列式数据, 存储)，返回新增数据点数量；
+            默认直接追加到存储
+        db_path: 存储数据库路径，默认使用STORE_CONFIG['db_path']
+
+    Returns:
+        Dict: 抓取摘要，包含requests、stored_points和failures（(任务, 错误信息)列表）
+    """
+    client = client or WxIndexClient()
+    on_result = on_result or (lambda job, columns, store: store.append_columns(columns))
+    summary = {'requests': len(jobs), 'stored_points': 0, 'failures': []}
+
+    async def run(job: Job, store: IndexStore):
+        try:
+            body = await client.fetch(job['query'], job['start_ymd'], job['end_ymd'])
+        except FetchError as e:
+            summary['failures'].append((job, str(e)))
+            return
+        # 单个任务的解码或写入失败只记入摘要，不中断其他任务
+        try:
+            summary['stored_points'] += on_result(job, columns_from_body(body, job['query']), store)
+        except (ValueError, sqlite3.Error) as e:
+            summary['failures'].append((job, f"解码或写入 {','.join(job['query'])} 失败: {e}"))
+
+    async with client:
+        with IndexStore(db_path) as store:
+            await asyncio.gather(*(run(job, store) for job in jobs))
+    return summary
+
+
+def fetch_and_ingest(jobs: List[Job], **client_options) -> Dict:
+    """
+    同步入口：按任务列表抓取并写入时序存储
+
+    Args:
+        jobs: 抓取任务列表
+        **client_options: 传给WxIndexClient的参数
+
+    Returns:
+        Dict: 抓取摘要（见fetch_into_store）
+    """
+    async def run():
+        return await fetch_into_store(jobs, WxIndexClient(**client_options))
+    return asyncio.run(run())
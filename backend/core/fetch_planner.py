@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+抓取计划模块
+根据时序存储中已有的数据，将关键词列表和日期范围拆分为最少的抓取请求，
+并以可续跑的任务列表文件保存
+"""
+
+import asyncio
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config.settings import FETCH_CONFIG
+from core.data_cache import write_json_atomic
+from core.date_codec import decode_ymd, encode_ymd, to_ymd
+from core.fetch_client import Job, WxIndexClient, fetch_into_store
+from core.index_store import IndexStore
+from core.json_backend import loads
+
+
+def _missing_matrix(keywords: Sequence[str], start: np.datetime64, end: np.datetime64,
+                    store: Optional[IndexStore]) -> np.ndarray:
+    """返回(关键词数, 天数)的布尔矩阵，True表示存储中缺少该关键词当天的数据"""
+    days = int((end - start).astype(np.int64)) + 1
+    missing = np.ones((len(keywords), days), dtype=bool)
+    if store is None:
+        return missing
+
+    for row, keyword in enumerate(keywords):
+        dates, _ = store.query_range(keyword, start, end)
+        missing[row, (dates - start).astype(np.int64)] = False
+    return missing
+
+
+def plan_requests(keywords: Sequence[str], start_date, end_date,
+                  skip_stored: bool = True, max_window_days: Optional[int] = None,
+                  max_keywords: Optional[int] = None) -> List[Job]:
+    """
+    计算覆盖关键词在日期范围内缺失数据所需的最少请求
+
+    日期范围按固定长度的窗口切分，使不同关键词落在相同窗口内以便合并；
+    每个窗口中只为有缺失数据的关键词发请求，按缺失区间排序后每组最多max_keywords个，
+    请求的日期范围收缩到该组缺失区间的并集。
+
+    Args:
+        keywords: 关键词列表
+        start_date: 开始日期（YYYYMMDD整数或可转换为datetime64[D]的日期）
+        end_date: 结束日期
+        skip_stored: 是否跳过时序存储中已有的日期
+        max_window_days: 单个请求的最大天数，默认使用FETCH_CONFIG['max_window_days']
+        max_keywords: 单个请求的最大关键词数，默认使用FETCH_CONFIG['max_keywords']
+
+    Returns:
+        List[Job]: 抓取任务列表，包含id、query、start_ymd、end_ymd和status
+
+    Raises:
+        ValueError: 当结束日期早于开始日期时抛出
+    """
+    window = max_window_days or FETCH_CONFIG['max_window_days']
+    batch_size = max_keywords or FETCH_CONFIG['max_keywords']
+    keywords = list(dict.fromkeys(keywords))
+    start, end = decode_ymd([to_ymd(start_date), to_ymd(end_date)])
+    if end < start:
+        raise ValueError(f"结束日期 {end} 早于开始日期 {start}")
+
+    if skip_stored:
+        with IndexStore() as store:
+            missing = _missing_matrix(keywords, start, end, store)
+    else:
+        missing = _missing_matrix(keywords, start, end, None)
+
+    jobs = []
+    for lo in range(0, missing.shape[1], window):
+        block = missing[:, lo:lo + window]
+        needed = np.flatnonzero(block.any(axis=1))
+        if not len(needed):
+            continue
+
+        # 每个关键词在窗口内首个和最后一个缺失日
+        first = block[needed].argmax(axis=1)
+        last = block.shape[1] - 1 - block[needed, ::-1].argmax(axis=1)
+        order = np.lexsort((last, first))
+
+        for i in range(0, len(order), batch_size):
+            batch = order[i:i + batch_size]
+            span = encode_ymd(start + np.array([lo + first[batch].min(), lo + last[batch].max()]))
+            query = [keywords[k] for k in needed[batch].tolist()]
+            jobs.append({
+                'id': f"{span[0]}-{span[1]}:{'|'.join(query)}",
+                'query': query,
+                'start_ymd': int(span[0]),
+                'end_ymd': int(span[1]),
+                'status': 'pending'
+            })
+    return jobs
+
+
+def save_job_list(jobs: List[Job], job_file: Optional[str] = None) -> str:
+    """
+    原子写入任务列表文件
+
+    Args:
+        jobs: 抓取任务列表
+        job_file: 文件路径，默认使用FETCH_CONFIG['job_file']
+
+    Returns:
+        str: 文件路径
+    """
+    job_file = job_file or FETCH_CONFIG['job_file']
+    os.makedirs(os.path.dirname(os.path.abspath(job_file)), exist_ok=True)
+    write_json_atomic(job_file, {'jobs': jobs})
+    return job_file
+
+
+def load_job_list(job_file: Optional[str] = None) -> List[Job]:
+    """
+    读取任务列表文件
+
+    Args:
+        job_file: 文件路径，默认使用FETCH_CONFIG['job_file']
+
+    Returns:
+        List[Job]: 抓取任务列表
+
+    Raises:
+        FileNotFoundError: 当文件不存在时抛出
+    """
+    job_file = job_file or FETCH_CONFIG['job_file']
+    try:
+        with open(job_file, 'rb') as f:
+            return loads(f.read())['jobs']
+    except FileNotFoundError:
+        raise FileNotFoundError(f"任务列表文件未找到: {job_file}")
+
+
+def run_job_list(job_file: Optional[str] = None, **client_options) -> Dict:
+    """
+    执行任务列表中未完成的任务，每完成一个任务即更新文件，中断后可从断点继续
+
+    Args:
+        job_file: 文件路径，默认使用FETCH_CONFIG['job_file']
+        **client_options: 传给WxIndexClient的参数
+
+    Returns:
+        Dict: 抓取摘要（见core.fetch_client.fetch_into_store），另含skipped（已完成的任务数）
+    """
+    jobs = load_job_list(job_file)
+    pending = [job for job in jobs if job['status'] != 'done']
+
+    def on_result(job: Job, columns: Dict[str, np.ndarray], store: IndexStore) -> int:
+        stored = store.append_columns(columns)
+        job['status'] = 'done'
+        save_job_list(jobs, job_file)
+        return stored
+
+    async def run():
+        return await fetch_into_store(pending, WxIndexClient(**client_options), on_result)
+
+    summary = asyncio.run(run())
+    for job, _ in summary['failures']:
+        job['status'] = 'failed'
+    save_job_list(jobs, job_file)
+    summary['skipped'] = len(jobs) - len(pending)
+    return summary
@@ -0,0 +1,445 @@
+# -*- coding: utf-8 -*-
+"""
+指数时序存储模块
+基于SQLite的只追加存储，以(关键词, 日期)为主键保存历史指数，支持批量写入和范围查询
+"""
+
+import os
+import sqlite3
+import time
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.settings import STORE_CONFIG
+from core.date_codec import decode_ymd, encode_ymd, to_ymd
+from core.aggregate_pyramid import (PYRAMID_LEVELS, PYRAMID_SCHEMA, PYRAMID_VERSION, bucket_values,
+                                    choose_level, query_buckets, rebuild_aggregates, update_aggregates)
+from core.online_stats import (STATS_SCHEMA, STATS_VERSION, read_keyword_stats, rebuild_keyword_stats,
+                               update_keyword_stats)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS index_points (
+    keyword TEXT NOT NULL,
+    date INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    PRIMARY KEY (keyword, date)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS checkpoints (
+    job_id TEXT PRIMARY KEY,
+    keywords TEXT NOT NULL,
+    start_ymd INTEGER NOT NULL,
+    end_ymd INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    completed_at REAL NOT NULL
+);
+"""
+
+# 日期范围：(开始, 结束)，元素为YYYYMMDD整数或可转换为datetime64[D]的日期
+DateRange = Tuple[object, object]
+
+# 单条IN查询最多绑定的关键词数，低于旧版SQLite的999个参数上限
+_QUERY_BATCH_SIZE = 900
+
+
+class IndexStore:
+    """
+    指数时序存储
+    所有写入在单个事务中完成，并递增修订号供缓存判断数据是否变化
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        打开（必要时创建）存储
+
+        Args:
+            db_path: 数据库文件路径，默认使用STORE_CONFIG['db_path']
+        """
+        self.db_path = db_path or STORE_CONFIG['db_path']
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(_SCHEMA + STATS_SCHEMA + PYRAMID_SCHEMA)
+        self._ensure_statistics()
+        self._ensure_aggregates()
+
+    def __enter__(self) -> 'IndexStore':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """关闭数据库连接"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def revision(self, keywords: Optional[Sequence[str]] = None) -> int:
+        """
+        获取存储修订号，每次写入新数据后递增
+
+        Args:
+            keywords: 关键词列表，指定时返回这些关键词最近一次变化时的修订号
+
+        Returns:
+            int: 修订号
+        """
+        if keywords is not None:
+            return max(self.keyword_revisions(keywords).values(), default=0)
+        row = self.conn.execute("SELECT value FROM store_meta WHERE key = 'revision'").fetchone()
+        return row[0] if row else 0
+
+    def keyword_revisions(self, keywords: Sequence[str]) -> Dict[str, int]:
+        """
+        获取各关键词最近一次新增数据时的修订号
+
+        修订号与数据在同一事务中持久化，其他进程写入后本进程读取即可发现变化。
+
+        Args:
+            keywords: 关键词列表
+
+        Returns:
+            Dict[str, int]: 关键词到修订号的映射，从未写入数据的关键词为0
+        """
+        keywords = list(dict.fromkeys(keywords))
+        revisions = {}
+        for start in range(0, len(keywords), _QUERY_BATCH_SIZE):
+            keys = ['revision:' + keyword for keyword in keywords[start:start + _QUERY_BATCH_SIZE]]
+            revisions.update(self.conn.execute(
+                f"SELECT key, value FROM store_meta WHERE key IN ({','.join('?' * len(keys))})", keys
+            ))
+        return {keyword: revisions.get('revision:' + keyword, 0) for keyword in keywords}
+
+    def _bump_revision(self, keywords: Iterable[str]):
+        self.conn.execute(
+            "INSERT INTO store_meta (key, value) VALUES ('revision', 1) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + 1"
+        )
+        # 关键词修订号记为本次全局修订号，供下游按关键词判断是否失效
+        self.conn.executemany(
+            "INSERT INTO store_meta (key, value) "
+            "SELECT ?, value FROM store_meta WHERE key = 'revision' "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            [('revision:' + keyword,) for keyword in keywords]
+        )
+
+    def _ensure_statistics(self):
+        """旧版本创建的存储没有累计统计量，首次打开时根据已有数据重建"""
+        row = self.conn.execute("SELECT value FROM store_meta WHERE key = 'stats_version'").fetchone()
+        if row is None or row[0] != STATS_VERSION:
+            self.rebuild_statistics()
+
+    def rebuild_statistics(self) -> int:
+        """
+        根据全部已存储数据重建各关键词的累计统计量
+
+        Returns:
+            int: 重建的关键词数量
+        """
+        with self.conn:
+            rebuilt = rebuild_keyword_stats(self.conn)
+            self.conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES ('stats_version', ?)",
+                              (STATS_VERSION,))
+        return rebuilt
+
+    def _ensure_aggregates(self):
+        """旧版本创建的存储没有聚合金字塔，首次打开时根据已有数据重建"""
+        row = self.conn.execute("SELECT value FROM store_meta WHERE key = 'pyramid_version'").fetchone()
+        if row is None or row[0] != PYRAMID_VERSION:
+            self.rebuild_aggregates()
+
+    def rebuild_aggregates(self) -> int:
+        """
+        根据全部已存储数据重建聚合金字塔
+
+        Returns:
+            int: 重建的关键词数量
+        """
+        with self.conn:
+            rebuilt = rebuild_aggregates(self.conn)
+            self.conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES ('pyramid_version', ?)",
+                              (PYRAMID_VERSION,))
+        return rebuilt
+
+    def _new_points(self, keyword: str, group: Iterable[Tuple[str, int, int]]) -> Tuple[List[int], List[int]]:
+        """筛选出尚未存储的数据点，同一批次内重复的日期保留首次出现的值"""
+        points = {}
+        for _, date, score in group:
+            points.setdefault(date, score)
+        if not points:
+            return [], []
+
+        existing = self.conn.execute(
+            'SELECT date FROM index_points WHERE keyword = ? AND date >= ? AND date <= ?',
+            (keyword, min(points), max(points))
+        )
+        for (date,) in existing:
+            points.pop(date, None)
+        return list(points.keys()), list(points.values())
+
+    def _insert_rows(self, rows: Iterable[Tuple[str, int, int]],
+                     checkpoint: Optional[Dict] = None) -> Dict[str, int]:
+        """
+        在单个事务中写入按关键词连续排列的行，返回各关键词实际新增的数量
+
+        新增的数据点在同一事务中合并到关键词的累计统计量和聚合金字塔。
+        提供checkpoint时在同一事务中记录任务完成，数据与检查点要么同时写入要么都不写入。
+        """
+        changed = {}
+        with self.conn:
+            if checkpoint is not None:
+                self._write_checkpoint(checkpoint)
+            for keyword, group in groupby(rows, key=itemgetter(0)):
+                dates, scores = self._new_points(keyword, group)
+                if not dates:
+                    continue
+                self.conn.executemany('INSERT INTO index_points (keyword, date, score) VALUES (?, ?, ?)',
+                                      zip([keyword] * len(dates), dates, scores))
+                update_keyword_stats(self.conn, keyword, np.array(dates), np.array(scores))
+                update_aggregates(self.conn, keyword, np.array(dates), np.array(scores))
+                changed[keyword] = changed.get(keyword, 0) + len(dates)
+            if changed:
+                self._bump_revision(changed)
+        return changed
+
+    def keyword_statistics(self, keywords: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, float]]:
+        """
+        读取各关键词全部历史数据的累计统计量，无需扫描数据点
+
+        Args:
+            keywords: 关键词列表，默认读取全部关键词；没有数据的关键词不包含在结果中
+
+        Returns:
+            Dict[str, Dict[str, float]]: 关键词到统计信息的映射（见core.online_stats.read_keyword_stats）
+        """
+        return read_keyword_stats(self.conn, keywords)
+
+    def append_points(self, keywords: Iterable[str], dates: np.ndarray, scores: np.ndarray,
+                      checkpoint: Optional[Dict] = None) -> int:
+        """
+        批量追加数据点，已存在的(关键词, 日期)保持不变
+
+        Args:
+            keywords: 每个数据点的关键词
+            dates: 每个数据点的日期（datetime64[D]）
+            scores: 每个数据点的指数值
+            checkpoint: 与数据同一事务写入的检查点，包含id、query、start_ymd和end_ymd
+
+        Returns:
+            int: 实际新增的数据点数量
+        """
+        scores = np.asarray(scores, dtype=np.int64)
+        if checkpoint is not None:
+            checkpoint = dict(checkpoint, points=len(scores))
+        rows = zip(keywords, encode_ymd(dates).tolist(), scores.tolist())
+        return sum(self._insert_rows(rows, checkpoint).values())
+
+    def append_columns(self, columns: Dict[str, np.ndarray], checkpoint: Optional[Dict] = None) -> int:
+        """
+        批量追加列式数据
+
+        Args:
+            columns: 列式数据（见core.data_cache.columns_from_series）
+            checkpoint: 与数据同一事务写入的检查点（见append_points）
+
+        Returns:
+            int: 实际新增的数据点数量
+        """
+        counts = np.diff(columns['offsets'])
+        point_keywords = np.repeat(np.asarray(columns['keywords']), counts).tolist()
+        return self.append_points(point_keywords, columns['dates'], columns['scores'], checkpoint)
+
+    def _write_checkpoint(self, checkpoint: Dict):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO checkpoints (job_id, keywords, start_ymd, end_ymd, points, completed_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (checkpoint['id'], '|'.join(checkpoint['query']), int(checkpoint['start_ymd']),
+             int(checkpoint['end_ymd']), checkpoint.get('points', 0), time.time())
+        )
+
+    def completed_jobs(self) -> Dict[str, int]:
+        """
+        获取已完成的抓取任务
+
+        Returns:
+            Dict[str, int]: 任务id到写入时数据点数量的映射
+        """
+        return dict(self.conn.execute('SELECT job_id, points FROM checkpoints'))
+
+    def clear_checkpoints(self) -> int:
+        """
+        清除全部检查点，使下次回填重新抓取所有窗口
+
+        Returns:
+            int: 被清除的检查点数量
+        """
+        with self.conn:
+            return self.conn.execute('DELETE FROM checkpoints').rowcount
+
+    def high_water_marks(self, keywords: Optional[Sequence[str]] = None) -> Dict[str, int]:
+        """
+        获取各关键词已存储的最新日期
+
+        Args:
+            keywords: 关键词列表，默认返回全部关键词
+
+        Returns:
+            Dict[str, int]: 关键词到最新YYYYMMDD日期的映射，无数据的关键词不包含在内
+        """
+        # 最新日期由keyword_stats在写入数据点的同一事务中维护，按主键读取，不扫描index_points
+        if keywords is None:
+            return dict(self.conn.execute('SELECT keyword, last_date FROM keyword_stats'))
+
+        keywords = list(dict.fromkeys(keywords))
+        marks = {}
+        for start in range(0, len(keywords), _QUERY_BATCH_SIZE):
+            batch = keywords[start:start + _QUERY_BATCH_SIZE]
+            marks.update(self.conn.execute(
+                f"SELECT keyword, last_date FROM keyword_stats WHERE keyword IN ({','.join('?' * len(batch))})",
+                batch
+            ))
+        return {keyword: marks[keyword] for keyword in keywords if keyword in marks}
+
+    def append_new_columns(self, columns: Dict[str, np.ndarray]) -> Dict[str, int]:
+        """
+        增量追加列式数据，每个关键词只写入晚于其最新日期的数据点
+
+        Args:
+            columns: 列式数据（见core.data_cache.columns_from_series）
+
+        Returns:
+            Dict[str, int]: 发生变化的关键词到新增数据点数量的映射
+        """
+        keywords = columns['keywords'].tolist()
+        offsets = columns['offsets']
+        marks = self.high_water_marks(keywords)
+        times = encode_ymd(columns['dates'])
+        scores = np.asarray(columns['scores'], dtype=np.int64)
+
+        def iter_rows():
+            for i, keyword in enumerate(keywords):
+                lo, hi = int(offsets[i]), int(offsets[i + 1])
+                fresh = times[lo:hi] > marks.get(keyword, 0)
+                for time, score in zip(times[lo:hi][fresh].tolist(), scores[lo:hi][fresh].tolist()):
+                    yield keyword, time, score
+
+        return self._insert_rows(iter_rows())
+
+    def keywords(self) -> List[str]:
+        """
+        获取存储中的全部关键词
+
+        Returns:
+            List[str]: 按字典序排列的关键词
+        """
+        return [row[0] for row in self.conn.execute('SELECT DISTINCT keyword FROM index_points ORDER BY keyword')]
+
+    def query_range(self, keyword: str, start=None, end=None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        按日期范围查询单个关键词，利用主键索引只读取所需区间
+
+        Args:
+            keyword: 关键词
+            start: 开始日期（含），None表示不限
+            end: 结束日期（含），None表示不限
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 日期数组和数值数组，按日期升序
+        """
+        start_ymd, end_ymd = to_ymd(start), to_ymd(end)
+        rows = self.conn.execute(
+            'SELECT date, score FROM index_points WHERE keyword = ? AND date >= ? AND date <= ? ORDER BY date',
+            (keyword, start_ymd if start_ymd is not None else 0, end_ymd if end_ymd is not None else 99991231)
+        ).fetchall()
+
+        points = np.array(rows, dtype=np.int64).reshape(-1, 2)
+        return decode_ymd(points[:, 0]), points[:, 1].copy()
+
+    def load_columns(self, keywords: Optional[Sequence[str]] = None,
+                     date_range: Optional[DateRange] = None) -> Dict[str, np.ndarray]:
+        """
+        以列式数据形式读取多个关键词的指定区间
+
+        Args:
+            keywords: 关键词列表，默认读取全部关键词；不存在的关键词被跳过
+            date_range: (开始, 结束)日期范围，默认读取全部历史
+
+        Returns:
+            Dict[str, np.ndarray]: 列式数据
+        """
+        keywords = self.keywords() if keywords is None else list(keywords)
+        start, end = date_range or (None, None)
+
+        found, date_arrays, score_arrays = [], [], []
+        for keyword in keywords:
+            dates, scores = self.query_range(keyword, start, end)
+            if len(scores):
+                found.append(keyword)
+                date_arrays.append(dates)
+                score_arrays.append(scores)
+
+        offsets = np.zeros(len(found) + 1, dtype=np.int64)
+        np.cumsum([len(scores) for scores in score_arrays], out=offsets[1:])
+        return {
+            'keywords': np.array(found, dtype=str),
+            'offsets': offsets,
+            'dates': np.concatenate(date_arrays) if date_arrays else np.empty(0, dtype='datetime64[D]'),
+            'scores': np.concatenate(score_arrays) if score_arrays else np.empty(0, dtype=np.int64)
+        }
+
+    def load_resolution_columns(self, keywords: Optional[Sequence[str]] = None,
+                                date_range: Optional[DateRange] = None, max_points: int = 500,
+                                stat: str = 'mean', level: Optional[str] = None) -> Tuple[str, Dict[str, np.ndarray]]:
+        """
+        按所需分辨率读取多个关键词的区间数据，从聚合金字塔中选择点数不超过max_points的最细层级
+
+        Args:
+            keywords: 关键词列表，默认读取全部关键词；不存在的关键词被跳过
+            date_range: (开始, 结束)日期范围，默认为全部关键词的最早到最晚日期
+            max_points: 每个关键词最多返回的点数，通常为图表的像素宽度
+            stat: 每个桶的取值（见core.aggregate_pyramid.bucket_values）
+            level: 指定层级，默认按max_points自动选择
+
+        Returns:
+            Tuple[str, Dict[str, np.ndarray]]: 使用的层级和列式数据，日期为桶起始日
+
+        Raises:
+            ValueError: 当level不受支持时抛出
+        """
+        keywords = self.keywords() if keywords is None else list(keywords)
+        start, end = date_range or (None, None)
+        start_ymd, end_ymd = to_ymd(start), to_ymd(end)
+        if start_ymd is None or end_ymd is None:
+            first, last = self.conn.execute('SELECT MIN(date), MAX(date) FROM index_points').fetchone()
+            start_ymd = (first or 0) if start_ymd is None else start_ymd
+            end_ymd = (last or 0) if end_ymd is None else end_ymd
+        if level is None:
+            level = choose_level(start_ymd, end_ymd, max_points) if start_ymd and end_ymd else PYRAMID_LEVELS[0]
+
+        found, date_arrays, score_arrays = [], [], []
+        for keyword in keywords:
+            buckets = query_buckets(self.conn, keyword, level, start_ymd, end_ymd)
+            if len(buckets['buckets']):
+                found.append(keyword)
+                date_arrays.append(decode_ymd(buckets['buckets']))
+                score_arrays.append(bucket_values(buckets, stat))
+
+        offsets = np.zeros(len(found) + 1, dtype=np.int64)
+        np.cumsum([len(scores) for scores in score_arrays], out=offsets[1:])
+        return level, {
+            'keywords': np.array(found, dtype=str),
+            'offsets': offsets,
+            'dates': np.concatenate(date_arrays) if date_arrays else np.empty(0, dtype='datetime64[D]'),
+            'scores': np.concatenate(score_arrays) if score_arrays else np.empty(0, dtype=np.int64)
+        }
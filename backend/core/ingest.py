@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+多文件导入模块
+并行解析目录中的抓包文件，合并为单一列式数据集并对(关键词, 日期)去重
+"""
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.settings import DATA_FILE_PATH, INGEST_CONFIG
+from core.data_cache import parse_index_columns, save_columns
+from core.dataset_registry import invalidate_keywords
+from core.index_store import IndexStore
+
+
+def scan_capture_files(directory: Optional[str] = None, pattern: Optional[str] = None) -> List[str]:
+    """
+    扫描目录中的抓包文件
+
+    Args:
+        directory: 抓包文件目录，默认使用INGEST_CONFIG['capture_dir']
+        pattern: 文件名通配符，默认使用INGEST_CONFIG['pattern']
+
+    Returns:
+        List[str]: 按文件名排序的文件路径列表
+    """
+    directory = directory or INGEST_CONFIG['capture_dir']
+    pattern = pattern or INGEST_CONFIG['pattern']
+    return sorted(glob.glob(os.path.join(directory, pattern)))
+
+
+def load_capture_columns(file_path: str) -> Tuple[Dict[str, np.ndarray], List[Dict]]:
+    """
+    加载抓包文件，自动识别由多组请求/响应首尾相接组成的抓包日志
+
+    抓包日志用core.capture_log.CaptureLog建立响应体偏移索引后逐个扫描并合并，
+    只包含单个响应的抓包文件按普通文件解析。导入的抓包大多只读取一次，
+    因此不读写解析缓存，批量导入不会在缓存目录中为每个文件留下一份列式数据。
+
+    Args:
+        file_path: 抓包文件路径
+
+    Returns:
+        Tuple[Dict[str, np.ndarray], List[Dict]]: 列式数据和文件内部重复抓取的冲突列表
+
+    Raises:
+        ValueError: 当找不到有效JSON数据或数据格式错误时抛出
+        FileNotFoundError: 当数据文件不存在时抛出
+    """
+    # capture_log依赖本模块的merge_columns，在函数内导入避免循环导入
+    from core.capture_log import CaptureLog
+
+    with CaptureLog(file_path) as log:
+        if len(log.index) > 1:
+            return log.load_columns()
+    return parse_index_columns(file_path), []
+
+
+def _parse_capture(file_path: str) -> Tuple[str, Optional[Dict[str, np.ndarray]], List[Dict], Optional[str]]:
+    """
+    解析单个抓包文件或抓包日志（进程池工作函数）
+
+    Returns:
+        Tuple: (文件路径, 列式数据, 文件内部冲突列表, 错误信息)，解析失败时列式数据为None
+    """
+    try:
+        columns, conflicts = load_capture_columns(file_path)
+        return file_path, {name: np.asarray(array) for name, array in columns.items()}, conflicts, None
+    except (OSError, ValueError) as e:
+        return file_path, None, [], str(e)
+
+
+def merge_columns(columns_list: Sequence[Dict[str, np.ndarray]],
+                  sources: Optional[Sequence[str]] = None) -> Tuple[Dict[str, np.ndarray], List[Dict]]:
+    """
+    合并多份列式数据并按(关键词, 日期)去重
+
+    重复数据点保留顺序靠后的一份（通常为较新的抓包），数值不一致的重复点记为冲突。
+
+    Args:
+        columns_list: 列式数据列表
+        sources: 与columns_list对应的来源名称，用于冲突报告
+
+    Returns:
+        Tuple[Dict[str, np.ndarray], List[Dict]]: 合并后的列式数据和冲突列表，
+            冲突项包含keyword、date、values、sources和kept
+    """
+    sources = list(sources) if sources is not None else [str(i) for i in range(len(columns_list))]
+
+    # 建立全局关键词编号，保持首次出现的顺序
+    keyword_ids = {}
+    for columns in columns_list:
+        for keyword in columns['keywords'].tolist():
+            keyword_ids.setdefault(keyword, len(keyword_ids))
+    keywords = np.array(list(keyword_ids.keys()), dtype=str)
+
+    point_keywords, point_days, point_scores, point_sources = [], [], [], []
+    for source_id, columns in enumerate(columns_list):
+        ids = np.array([keyword_ids[k] for k in columns['keywords'].tolist()], dtype=np.int64)
+        counts = np.diff(columns['offsets'])
+        point_keywords.append(np.repeat(ids, counts))
+        point_days.append(np.asarray(columns['dates'], dtype='datetime64[D]').astype(np.int64))
+        point_scores.append(np.asarray(columns['scores'], dtype=np.int64))
+        point_sources.append(np.full(len(columns['scores']), source_id, dtype=np.int64))
+
+    if not point_scores:
+        empty = np.empty(0, dtype=np.int64)
+        return {'keywords': keywords, 'offsets': np.zeros(1, dtype=np.int64),
+                'dates': empty.astype('datetime64[D]'), 'scores': empty}, []
+
+    kw = np.concatenate(point_keywords)
+    days = np.concatenate(point_days)
+    scores = np.concatenate(point_scores)
+    source_ids = np.concatenate(point_sources)
+
+    # 稳定排序后同一(关键词, 日期)的点按来源顺序相邻排列
+    order = np.lexsort((days, kw))
+    kw, days, scores, source_ids = kw[order], days[order], scores[order], source_ids[order]
+
+    group_start = np.ones(len(kw), dtype=bool)
+    group_start[1:] = (kw[1:] != kw[:-1]) | (days[1:] != days[:-1])
+    group_last = np.ones(len(kw), dtype=bool)
+    group_last[:-1] = group_start[1:]
+
+    group_ids = np.cumsum(group_start) - 1
+    kept_scores = scores[group_last]
+    conflict_points = scores != kept_scores[group_ids]
+
+    # 同组数据点连续排列，可直接按组起止位置切片
+    group_bounds = np.append(np.flatnonzero(group_start), len(kw))
+    conflicts = []
+    for group_id in np.unique(group_ids[conflict_points]).tolist():
+        members = np.arange(group_bounds[group_id], group_bounds[group_id + 1])
+        conflicts.append({
+            'keyword': str(keywords[kw[members[0]]]),
+            'date': str(np.datetime64(int(days[members[0]]), 'D')),
+            'values': scores[members].tolist(),
+            'sources': [sources[i] for i in source_ids[members].tolist()],
+            'kept': int(kept_scores[group_id])
+        })
+
+    kept_keywords = kw[group_last]
+    offsets = np.zeros(len(keywords) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(kept_keywords, minlength=len(keywords)), out=offsets[1:])
+
+    merged = {
+        'keywords': keywords,
+        'offsets': offsets,
+        'dates': days[group_last].astype('datetime64[D]'),
+        'scores': kept_scores
+    }
+    return merged, conflicts
+
+
+def ingest_files(file_paths: Sequence[str],
+                 workers: Optional[int] = None) -> Tuple[Dict[str, np.ndarray], List[Dict], List[Tuple[str, str]]]:
+    """
+    使用进程池并行解析多个抓包文件并合并，首尾相接的抓包日志按其中每个响应分别解析
+
+    Args:
+        file_paths: 抓包文件路径列表，靠后的文件在冲突时优先
+        workers: 进程数，默认使用INGEST_CONFIG['workers']
+
+    Returns:
+        Tuple: (合并后的列式数据, 冲突列表（含抓包日志内部的冲突）, 解析失败的(文件路径, 错误信息)列表)
+    """
+    workers = workers or INGEST_CONFIG['workers']
+    chunksize = max(1, len(file_paths) // ((workers or os.cpu_count() or 1) * 4))
+
+    parsed, failures, file_conflicts = [], [], []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for file_path, columns, conflicts, error in executor.map(_parse_capture, file_paths, chunksize=chunksize):
+            if columns is None:
+                failures.append((file_path, error))
+            else:
+                parsed.append((file_path, columns))
+                file_conflicts.extend(conflicts)
+
+    merged, conflicts = merge_columns(
+        [columns for _, columns in parsed],
+        [os.path.basename(file_path) for file_path, _ in parsed]
+    )
+    return merged, file_conflicts + conflicts, failures
+
+
+def ingest_directory(directory: Optional[str] = None, pattern: Optional[str] = None,
+                     workers: Optional[int] = None, output_dir: Optional[str] = None,
+                     to_store: bool = True) -> Dict:
+    """
+    导入目录中的全部抓包文件，保存合并结果并追加到时序存储
+
+    Args:
+        directory: 抓包文件目录
+        pattern: 文件名通配符
+        workers: 进程数
+        output_dir: 合并结果保存目录，默认使用INGEST_CONFIG['merged_dir']
+        to_store: 是否将合并结果追加到时序存储
+
+    Returns:
+        Dict: 导入摘要，包含files、keywords、data_points、stored_points、
+            conflicts、failures和output_dir
+    """
+    file_paths = scan_capture_files(directory, pattern)
+    if not file_paths:
+        raise FileNotFoundError(f"目录中没有匹配的抓包文件: {directory or INGEST_CONFIG['capture_dir']}")
+
+    merged, conflicts, failures = ingest_files(file_paths, workers)
+
+    output_dir = output_dir or INGEST_CONFIG['merged_dir']
+    save_columns(output_dir, merged, {
+        'sources': [os.path.abspath(path) for path in file_paths],
+        'conflict_count': len(conflicts)
+    })
+
+    stored_points = 0
+    if to_store:
+        with IndexStore() as store:
+            stored_points = store.append_columns(merged)
+
+    return {
+        'files': len(file_paths),
+        'keywords': len(merged['keywords']),
+        'data_points': len(merged['scores']),
+        'stored_points': stored_points,
+        'conflicts': conflicts,
+        'failures': failures,
+        'output_dir': output_dir
+    }
+
+
+def ingest_incremental(file_path: Optional[str] = None) -> Dict:
+    """
+    增量导入单个抓包文件，只追加各关键词最新日期之后的数据点
+
+    每日刷新的抓包与已有数据大部分重叠，按关键词的已存储最新日期过滤后
+    只写入新日期。发生变化的关键词的修订号与数据在同一事务中持久化，
+    其他进程据此重新加载；当前进程中对应的共享数据集立即失效。
+
+    Args:
+        file_path: 抓包文件路径，默认使用配置中的DATA_FILE_PATH
+
+    Returns:
+        Dict: 导入摘要，包含keywords、data_points、stored_points、
+            changed_keywords（关键词到新增数量的映射）、revisions（变化关键词的新修订号）
+            和invalidated
+    """
+    columns, _ = load_capture_columns(file_path or DATA_FILE_PATH)
+    with IndexStore() as store:
+        changed = store.append_new_columns(columns)
+        revisions = store.keyword_revisions(changed)
+
+    return {
+        'keywords': len(columns['keywords']),
+        'data_points': len(columns['scores']),
+        'stored_points': sum(changed.values()),
+        'changed_keywords': changed,
+        'revisions': revisions,
+        'invalidated': invalidate_keywords(changed) if changed else 0
+    }
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+JSON解码后端模块
+按配置选择orjson、ujson或标准库json解码抓包响应体，
+并提供直接将time_indexes数组扫描为NumPy数组的专用解析器
+"""
+
+import importlib
+import json
+import re
+from typing import Callable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from config.settings import JSON_CONFIG
+
+# 'auto'模式下按顺序尝试的解码库
+_BACKEND_ORDER = ('orjson', 'ujson', 'json')
+
+_ENTRY_PATTERN = re.compile(rb'"indexes"\s*:\s*\[')
+_TIME_INDEXES_PATTERN = re.compile(rb'"time_indexes"\s*:\s*\[([^\]]*)\]')
+_QUERY_PATTERN = re.compile(rb'"query"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+# 将数字和负号以外的字节替换为空格，使数组文本可直接按空白分隔解析
+_NUMBER_TABLE = bytes(b if b in b'-0123456789' else 0x20 for b in range(256))
+
+_loads_cache = {}
+
+
+def get_json_loads(backend: Optional[str] = None) -> Tuple[str, Callable]:
+    """
+    获取JSON解码函数
+
+    Args:
+        backend: 解码库名称，默认使用JSON_CONFIG['backend']；'auto'表示选择已安装的最快实现
+
+    Returns:
+        Tuple[str, Callable]: 实际使用的解码库名称和解码函数
+
+    Raises:
+        ValueError: 当指定的解码库名称无效或未安装时抛出
+    """
+    backend = backend or JSON_CONFIG['backend']
+    if backend in _loads_cache:
+        return _loads_cache[backend]
+
+    candidates = _BACKEND_ORDER if backend == 'auto' else (backend,)
+    for name in candidates:
+        if name not in _BACKEND_ORDER:
+            raise ValueError(f"不支持的JSON解码库: {name}")
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            if backend != 'auto':
+                raise ValueError(f"JSON解码库未安装: {name}")
+            continue
+        _loads_cache[backend] = (name, module.loads)
+        return _loads_cache[backend]
+
+
+def loads(data: Union[str, bytes]):
+    """
+    使用配置的解码库解码JSON文本
+
+    Args:
+        data: JSON文本
+
+    Returns:
+        解码后的Python对象
+
+    Raises:
+        ValueError: 当文本不是有效JSON时抛出（各解码库的异常均为ValueError子类）
+    """
+    return get_json_loads()[1](data)
+
+
+def _parse_pairs(segment: bytes) -> np.ndarray:
+    """将time_indexes数组文本解析为(n, 2)的[time, score]整数数组"""
+    count = segment.count(b'{')
+    numbers = np.fromstring(segment.translate(_NUMBER_TABLE), dtype=np.int64, sep=' ') \
+        if count else np.empty(0, dtype=np.int64)
+
+    if len(numbers) == 2 * count:
+        pairs = numbers.reshape(count, 2)
+        # 各对象的键顺序一致，按首个对象中score与time的先后确定列顺序
+        if segment.find(b'"score"') < segment.find(b'"time"'):
+            pairs = pairs[:, ::-1]
+        return pairs
+
+    # 含有其他数值字段时退回通用解码
+    points = json.loads(b'[' + segment + b']')
+    return np.array([(point['time'], point['score']) for point in points], dtype=np.int64).reshape(-1, 2)
+
+
+def scan_time_indexes(body: Union[str, bytes]) -> List[Tuple[Optional[str], np.ndarray, np.ndarray]]:
+    """
+    扫描响应体中每个resp_list条目的首个time_indexes数组，不构建中间字典
+
+    先定位全部数组并统计数据点总数，再将日期和指数写入预先分配的连续数组，
+    各条目返回的是这两个数组的切片视图。
+
+    Args:
+        body: 响应体文本
+
+    Returns:
+        List[Tuple[Optional[str], np.ndarray, np.ndarray]]: 按resp_list顺序排列的
+            (关键词, YYYYMMDD日期数组, 指数数组)，条目中没有query字段时关键词为None
+    """
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+
+    starts = [match.end() for match in _ENTRY_PATTERN.finditer(body)]
+    bounds = starts[1:] + [len(body)]
+
+    # 判断query字段位于indexes之前还是之后，据此确定各条目查找query的范围
+    first_query = _QUERY_PATTERN.search(body)
+    query_first = bool(starts) and first_query is not None and first_query.start() < starts[0]
+    query_bounds = list(zip([0] + starts[:-1], starts)) if query_first else list(zip(starts, bounds))
+
+    entries = []
+    for start, end, (query_start, query_end) in zip(starts, bounds, query_bounds):
+        query = _QUERY_PATTERN.search(body, query_start, query_end)
+        segment = _TIME_INDEXES_PATTERN.search(body, start, end)
+        pairs = _parse_pairs(segment.group(1)) if segment else np.empty((0, 2), dtype=np.int64)
+        entries.append((json.loads(query.group(1)) if query else None, pairs))
+
+    total = sum(len(pairs) for _, pairs in entries)
+    times = np.empty(total, dtype=np.int64)
+    scores = np.empty(total, dtype=np.int64)
+
+    result, position = [], 0
+    for keyword, pairs in entries:
+        count = len(pairs)
+        times[position:position + count] = pairs[:, 0]
+        scores[position:position + count] = pairs[:, 1]
+        result.append((keyword, times[position:position + count], scores[position:position + count]))
+        position += count
+    return result
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+关键词注册表模块
+维护关键词到显示名称和绘图颜色的映射，支持从文件批量加载大量关键词
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, Optional
+
+from config.settings import KEYWORD_REGISTRY, KEYWORD_REGISTRY_PATH, DEFAULT_KEYWORD_COLORS
+
+
+class KeywordRegistry:
+    """
+    关键词注册表
+    以字典保存关键词元信息，按关键词查找为常数时间
+    """
+
+    def __init__(self, entries: Optional[Dict[str, Dict[str, str]]] = None):
+        """
+        初始化注册表
+
+        Args:
+            entries: 关键词到 {'name': 英文名称, 'color': 颜色} 的映射
+        """
+        self._entries = {}
+        if entries:
+            self.update(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self._entries
+
+    def register(self, keyword: str, name: Optional[str] = None, color: Optional[str] = None):
+        """
+        注册或更新单个关键词
+
+        Args:
+            keyword: 关键词（即平台中文名称）
+            name: 英文名称，默认与关键词相同
+            color: 绘图颜色，默认按关键词生成
+        """
+        self._entries[keyword] = {
+            'name': name or keyword,
+            'color': color or default_keyword_color(keyword)
+        }
+
+    def update(self, entries: Dict[str, Dict[str, str]]):
+        """
+        批量注册关键词
+
+        Args:
+            entries: 关键词到元信息的映射
+        """
+        for keyword, info in entries.items():
+            self.register(keyword, info.get('name'), info.get('color'))
+
+    def load_file(self, file_path: str) -> int:
+        """
+        从JSON文件加载关键词
+
+        Args:
+            file_path: JSON文件路径，结构同settings.KEYWORD_REGISTRY
+
+        Returns:
+            int: 加载的关键词数量
+
+        Raises:
+            ValueError: 当文件内容格式错误时抛出
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        if not isinstance(entries, dict):
+            raise ValueError(f"关键词注册表格式错误: {file_path}")
+        self.update(entries)
+        return len(entries)
+
+    def get(self, keyword: str) -> Dict[str, str]:
+        """
+        获取关键词元信息，未注册的关键词返回默认名称和颜色
+
+        Args:
+            keyword: 关键词
+
+        Returns:
+            Dict[str, str]: 包含name、name_cn、color的元信息
+        """
+        info = self._entries.get(keyword)
+        if info is None:
+            return {'name': keyword, 'name_cn': keyword, 'color': default_keyword_color(keyword)}
+        return {'name': info['name'], 'name_cn': keyword, 'color': info['color']}
+
+    def keywords(self) -> Iterable[str]:
+        """返回已注册的关键词"""
+        return self._entries.keys()
+
+
+def default_keyword_color(keyword: str) -> str:
+    """
+    为关键词生成稳定的默认颜色
+
+    Args:
+        keyword: 关键词
+
+    Returns:
+        str: 十六进制颜色值
+    """
+    digest = hashlib.blake2b(keyword.encode('utf-8'), digest_size=4).digest()
+    return DEFAULT_KEYWORD_COLORS[int.from_bytes(digest, 'big') % len(DEFAULT_KEYWORD_COLORS)]
+
+
+_default_registry = None
+
+
+def get_keyword_registry() -> KeywordRegistry:
+    """
+    获取默认关键词注册表（配置中的关键词加上扩展注册表文件）
+
+    Returns:
+        KeywordRegistry: 进程内共享的注册表实例
+    """
+    global _default_registry
+    if _default_registry is None:
+        registry = KeywordRegistry(KEYWORD_REGISTRY)
+        if os.path.exists(KEYWORD_REGISTRY_PATH):
+            try:
+                registry.load_file(KEYWORD_REGISTRY_PATH)
+            except ValueError as e:
+                print(f"警告: 无法加载关键词注册表: {str(e)}")
+        _default_registry = registry
+    return _default_registry
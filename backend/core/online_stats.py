@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+在线统计模块
+为每个关键词持久化累计统计量（数量、总和、Welford均值与二阶中心矩、最值），
+追加数据时按批合并更新，读取统计信息无需重新扫描历史数据
+"""
+
+import sqlite3
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+STATS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS keyword_stats (
+    keyword TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    sum REAL NOT NULL,
+    mean REAL NOT NULL,
+    m2 REAL NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    first_date INTEGER NOT NULL,
+    last_date INTEGER NOT NULL
+);
+"""
+
+# 统计表结构版本，store_meta中缺少该版本时从已有数据重建统计
+STATS_VERSION = 1
+
+# (count, sum, mean, m2, min, max, first_date, last_date)
+Moments = Tuple[int, float, float, float, float, float, int, int]
+
+
+def batch_moments(dates: np.ndarray, scores: np.ndarray) -> Moments:
+    """
+    计算一批数据点的累计统计量
+
+    Args:
+        dates: YYYYMMDD日期数组
+        scores: 指数数组（非空）
+
+    Returns:
+        Moments: 该批数据的统计量
+    """
+    values = np.asarray(scores, dtype=np.float64)
+    mean = float(values.mean())
+    deviation = values - mean
+    return (len(values), float(values.sum()), mean, float(deviation @ deviation),
+            float(values.min()), float(values.max()), int(np.min(dates)), int(np.max(dates)))
+
+
+def merge_moments(a: Optional[Moments], b: Moments) -> Moments:
+    """
+    合并两组统计量（Chan等人的并行Welford算法），与数据的先后顺序无关
+
+    Args:
+        a: 已有统计量，None表示没有数据
+        b: 新增数据的统计量
+
+    Returns:
+        Moments: 合并后的统计量
+    """
+    if a is None or a[0] == 0:
+        return b
+    count = a[0] + b[0]
+    delta = b[2] - a[2]
+    mean = a[2] + delta * b[0] / count
+    m2 = a[3] + b[3] + delta * delta * a[0] * b[0] / count
+    return (count, a[1] + b[1], mean, m2, min(a[4], b[4]), max(a[5], b[5]),
+            min(a[6], b[6]), max(a[7], b[7]))
+
+
+def update_keyword_stats(conn: sqlite3.Connection, keyword: str, dates: np.ndarray, scores: np.ndarray):
+    """
+    将新写入的数据点合并到关键词的累计统计量，需在写入数据点的同一事务中调用
+
+    Args:
+        conn: 数据库连接
+        keyword: 关键词
+        dates: 新写入的YYYYMMDD日期
+        scores: 新写入的指数值
+    """
+    if not len(scores):
+        return
+    row = conn.execute(
+        'SELECT count, sum, mean, m2, min, max, first_date, last_date FROM keyword_stats WHERE keyword = ?',
+        (keyword,)
+    ).fetchone()
+    merged = merge_moments(row, batch_moments(dates, scores))
+    conn.execute('INSERT OR REPLACE INTO keyword_stats VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', (keyword, *merged))
+
+
+def rebuild_keyword_stats(conn: sqlite3.Connection) -> int:
+    """
+    根据index_points中的全部数据重建累计统计量
+
+    Args:
+        conn: 数据库连接
+
+    Returns:
+        int: 重建的关键词数量
+    """
+    conn.execute('DELETE FROM keyword_stats')
+    keywords = [row[0] for row in conn.execute('SELECT DISTINCT keyword FROM index_points')]
+    for keyword in keywords:
+        points = np.array(conn.execute('SELECT date, score FROM index_points WHERE keyword = ?', (keyword,)).fetchall(),
+                          dtype=np.int64).reshape(-1, 2)
+        update_keyword_stats(conn, keyword, points[:, 0], points[:, 1])
+    return len(keywords)
+
+
+def read_keyword_stats(conn: sqlite3.Connection,
+                       keywords: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, float]]:
+    """
+    读取关键词的统计信息
+
+    Args:
+        conn: 数据库连接
+        keywords: 关键词列表，默认读取全部关键词；没有数据的关键词不包含在结果中
+
+    Returns:
+        Dict[str, Dict[str, float]]: 关键词到统计信息的映射，包含count、sum、mean、
+            std（总体标准差）、min、max、cv、first_date和last_date
+    """
+    rows = conn.execute('SELECT * FROM keyword_stats').fetchall()
+    wanted = None if keywords is None else set(keywords)
+
+    stats = {}
+    for keyword, count, total, mean, m2, minimum, maximum, first_date, last_date in rows:
+        if wanted is not None and keyword not in wanted:
+            continue
+        std = float(np.sqrt(max(m2, 0.0) / count))
+        stats[keyword] = {
+            'count': count, 'sum': total, 'mean': mean, 'std': std,
+            'min': minimum, 'max': maximum, 'cv': std / mean if mean else 0.0,
+            'first_date': first_date, 'last_date': last_date
+        }
+    return stats
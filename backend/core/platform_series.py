@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+平台序列数据模型
+以连续NumPy数组保存单个平台的时间序列，避免逐点装箱为Python对象
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+
+def _floor_day(date) -> np.datetime64:
+    """将日期时间向下取整到天"""
+    return np.datetime64(date, 'D')
+
+
+def _ceil_day(date) -> np.datetime64:
+    """将日期时间向上取整到天，带时间部分的日期时间取次日"""
+    day = np.datetime64(date, 'D')
+    if np.datetime64(date, 'us') > np.datetime64(day, 'us'):
+        day += np.timedelta64(1, 'D')
+    return day
+
+
+def search_date_window(dates: np.ndarray, start_date=None, end_date=None) -> Tuple[int, int]:
+    """
+    在有序日期数组中二分查找闭区间[start_date, end_date]对应的下标范围
+
+    Args:
+        dates: 升序排列的datetime64[D]数组
+        start_date: 开始日期时间，None表示不限
+        end_date: 结束日期时间，None表示不限
+
+    Returns:
+        Tuple[int, int]: 下标范围(lo, hi)，dates[lo:hi]即区间内的数据
+    """
+    lo = 0 if start_date is None else int(np.searchsorted(dates, _ceil_day(start_date), 'left'))
+    hi = len(dates) if end_date is None else int(np.searchsorted(dates, _floor_day(end_date), 'right'))
+    return lo, max(lo, hi)
+
+
+def search_date_windows(dates: np.ndarray, windows: Sequence[Tuple]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    批量二分查找多个日期窗口的下标范围
+
+    Args:
+        dates: 升序排列的datetime64[D]数组
+        windows: (开始, 结束)日期时间对的序列，None表示该端不限
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 各窗口的起始下标和结束下标
+    """
+    starts = np.array([_ceil_day(start) for start, _ in windows if start is not None], dtype='datetime64[D]')
+    ends = np.array([_floor_day(end) for _, end in windows if end is not None], dtype='datetime64[D]')
+
+    # 与search_date_window一致，None表示不限，对应下标0或len(dates)
+    lo = np.zeros(len(windows), dtype=np.int64)
+    hi = np.full(len(windows), len(dates), dtype=np.int64)
+    lo[[start is not None for start, _ in windows]] = np.searchsorted(dates, starts, 'left')
+    hi[[end is not None for _, end in windows]] = np.searchsorted(dates, ends, 'right')
+    return lo, np.maximum(lo, hi)
+
+
+class PlatformSeries:
+    """
+    平台时间序列
+    使用__slots__存储元信息，日期和数值分别保存为datetime64[D]与int64连续数组
+    """
+
+    __slots__ = ('name_cn', 'name', 'color', 'dates', 'values')
+
+    def __init__(self, name_cn: str, dates: ArrayLike, values: ArrayLike,
+                 color: str, name: Optional[str] = None):
+        """
+        初始化平台序列
+
+        Args:
+            name_cn: 平台中文名称（即查询关键词）
+            dates: 日期数组，需按升序排列
+            values: 与日期一一对应的指数数组
+            color: 绘图颜色
+            name: 平台英文名称，默认与中文名称相同
+        """
+        self.name_cn = name_cn
+        self.name = name or name_cn
+        self.color = color
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+        self.values = np.asarray(values, dtype=np.int64)
+
+        if len(self.dates) != len(self.values):
+            raise ValueError(f"平台 {name_cn} 的日期与数值长度不一致")
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __repr__(self) -> str:
+        return f"PlatformSeries({self.name_cn!r}, points={len(self)})"
+
+    @property
+    def start_date(self) -> Optional[np.datetime64]:
+        """序列起始日期，空序列返回None"""
+        return self.dates[0] if len(self.dates) else None
+
+    @property
+    def end_date(self) -> Optional[np.datetime64]:
+        """序列结束日期，空序列返回None"""
+        return self.dates[-1] if len(self.dates) else None
+
+    @property
+    def nbytes(self) -> int:
+        """序列数组占用的字节数"""
+        return self.dates.nbytes + self.values.nbytes
+
+    def slice(self, start_date=None, end_date=None) -> 'PlatformSeries':
+        """
+        按日期闭区间截取序列，返回共享底层数组的视图，不复制数据
+
+        Args:
+            start_date: 开始日期时间，None表示不限
+            end_date: 结束日期时间，None表示不限
+
+        Returns:
+            PlatformSeries: 区间内的序列视图
+        """
+        lo, hi = search_date_window(self.dates, start_date, end_date)
+        return self._view(lo, hi)
+
+    def windows(self, windows: Sequence[Tuple]) -> List['PlatformSeries']:
+        """
+        批量截取多个日期窗口
+
+        Args:
+            windows: (开始, 结束)日期时间对的序列
+
+        Returns:
+            List[PlatformSeries]: 与窗口一一对应的序列视图
+        """
+        lo, hi = search_date_windows(self.dates, windows)
+        return [self._view(start, end) for start, end in zip(lo.tolist(), hi.tolist())]
+
+    def at(self, dates: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        二分查找给定日期在序列中的数据点
+
+        Args:
+            dates: 待查找的日期数组
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 序列中存在的日期（去重、升序）及对应数值，不存在的日期被忽略
+        """
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        if not len(self.dates):
+            return self.dates[:0], self.values[:0]
+        positions = np.minimum(np.searchsorted(self.dates, dates), len(self.dates) - 1)
+        positions = np.unique(positions[self.dates[positions] == dates])
+        return self.dates[positions], self.values[positions]
+
+    def _view(self, lo: int, hi: int) -> 'PlatformSeries':
+        return PlatformSeries(self.name_cn, self.dates[lo:hi], self.values[lo:hi], self.color, self.name)
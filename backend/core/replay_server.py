@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+本地回放服务器模块
+模拟wxindex接口应答GetDefaultIndex请求，数据来自已录制的抓包或合成序列，
+可配置延迟、错误率和限流，用于在无网络环境下压测抓取、解析和绘图流程
+"""
+
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.settings import REPLAY_CONFIG
+from core.data_cache import load_index_columns
+from core.date_codec import decode_ymd, encode_ymd
+from core.ingest import merge_columns
+
+
+def synthetic_series(keyword: str, start_ymd: int, end_ymd: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    生成确定性的合成指数序列，同一关键词和日期在任意请求窗口中取值相同
+
+    序列由关键词决定的基准值、周内季节性、缓慢趋势和按日期散列的噪声组成。
+
+    Args:
+        keyword: 关键词
+        start_ymd: 开始日期（YYYYMMDD）
+        end_ymd: 结束日期（YYYYMMDD）
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: YYYYMMDD日期数组和指数数组
+    """
+    seed = int.from_bytes(hashlib.blake2b(keyword.encode('utf-8'), digest_size=4).digest(), 'big')
+    start, end = decode_ymd([start_ymd, end_ymd])
+    dates = np.arange(start, end + np.timedelta64(1, 'D'), dtype='datetime64[D]')
+    days = dates.astype(np.int64).astype(np.float64)
+
+    base = 1e6 * (1 + seed % 100)
+    weekly = 1 + 0.15 * np.sin(2 * np.pi * ((days + 3) % 7) / 7 + seed % 7)
+    trend = 1 + 0.2 * np.sin(2 * np.pi * days / 365.25 + seed % 13)
+    noise = np.modf(np.abs(np.sin(days * 12.9898 + seed % 1000) * 43758.5453))[0]
+    scores = base * weekly * trend * (0.9 + 0.2 * noise)
+    return encode_ymd(dates), scores.astype(np.int64)
+
+
+class ReplayData:
+    """回放数据源：优先使用录制数据，未收录的关键词按配置使用合成序列"""
+
+    def __init__(self, captures: Sequence[str] = (), synthetic: bool = True):
+        columns_list = [load_index_columns(path) for path in captures]
+        self.columns, _ = merge_columns(columns_list, list(captures))
+        self.index = {keyword: i for i, keyword in enumerate(self.columns['keywords'].tolist())}
+        self.times = encode_ymd(self.columns['dates'])
+        self.synthetic = synthetic
+
+    def series(self, keyword: str, start_ymd: int, end_ymd: int) -> Tuple[np.ndarray, np.ndarray]:
+        """返回关键词在闭区间内的(YYYYMMDD日期数组, 指数数组)"""
+        position = self.index.get(keyword)
+        if position is None:
+            if self.synthetic:
+                return synthetic_series(keyword, start_ymd, end_ymd)
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        lo, hi = self.columns['offsets'][position:position + 2]
+        times = self.times[lo:hi]
+        window = slice(np.searchsorted(times, start_ymd, 'left'), np.searchsorted(times, end_ymd, 'right'))
+        return times[window], self.columns['scores'][lo:hi][window]
+
+    def response_body(self, query: Sequence[str], start_ymd: int, end_ymd: int) -> bytes:
+        """按抓包中的响应格式构造响应体"""
+        resp_list = []
+        for keyword in query:
+            times, scores = self.series(keyword, start_ymd, end_ymd)
+            resp_list.append({
+                'indexes': [{'ctype': 0, 'cvalue': 0, 'time_indexes': [
+                    {'score': score, 'time': time} for time, score in zip(times.tolist(), scores.tolist())
+                ]}],
+                'query': keyword,
+                'status': 0
+            })
+        return json.dumps({'code': 0, 'content': {'resp_list': resp_list}},
+                          ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """wxindex接口请求处理器，行为参数取自server.options"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes = b''):
+        options = self.server.options
+        encoding = None
+        if body and options['gzip'] and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body, encoding = gzip.compress(body, compresslevel=1), 'gzip'
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        options = server.options
+        request = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+        server.count('requests')
+        if not server.allow_request():
+            server.count('throttled')
+            return self._send(429)
+
+        time.sleep(max(0.0, options['latency'] + random.uniform(-options['jitter'], options['jitter'])))
+        if random.random() < options['error_rate']:
+            server.count('errors')
+            return self._send(500)
+
+        try:
+            body = json.loads(request)
+            query = body['query']
+            start_ymd, end_ymd = int(body['start_ymd']), int(body['end_ymd'])
+            if body.get('cgi_name') != 'GetDefaultIndex' or not 0 < len(query) <= 5:
+                raise ValueError(body.get('cgi_name'))
+        except (KeyError, TypeError, ValueError):
+            server.count('errors')
+            return self._send(200, b'{"code":-1,"content":{}}')
+
+        self._send(200, server.data.response_body(query, start_ymd, end_ymd))
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    本地回放服务器
+    未指定的参数均取自REPLAY_CONFIG，stats记录请求数、错误数和限流次数
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None,
+                 data: Optional[ReplayData] = None, **options):
+        self.options = {key: options.get(key, REPLAY_CONFIG[key])
+                        for key in ('latency', 'jitter', 'error_rate', 'rate_limit', 'gzip')}
+        self.data = data or ReplayData(REPLAY_CONFIG['captures'], REPLAY_CONFIG['synthetic'])
+        self.stats: Dict[str, int] = {'requests': 0, 'errors': 0, 'throttled': 0}
+        self._lock = threading.Lock()
+        self._window = (0.0, 0)
+        super().__init__((host or REPLAY_CONFIG['host'],
+                          REPLAY_CONFIG['port'] if port is None else port), ReplayHandler)
+
+    @property
+    def url(self) -> str:
+        """接口地址"""
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/cgi-bin/wxaweb/wxindex'
+
+    def count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def allow_request(self) -> bool:
+        """按每秒请求数的固定窗口限流"""
+        rate_limit = self.options['rate_limit']
+        if not rate_limit:
+            return True
+        with self._lock:
+            second, used = self._window
+            now = int(time.monotonic())
+            if now != second:
+                second, used = now, 0
+            self._window = (second, used + 1)
+            return used < rate_limit
+
+    def start(self) -> 'ReplayServer':
+        """在后台线程中运行服务器"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
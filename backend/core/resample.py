@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+日历重采样模块
+把(关键词 × 天)矩阵按ISO周、自然月或季度一次性分组聚合（reduceat），
+并按日历对齐计算环比（周环比、月环比、季度环比）和同比增长率
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from config.settings import ANALYSIS_CONFIG
+from core.batch_stats import series_matrix
+from core.platform_series import PlatformSeries
+
+# 支持的重采样周期和聚合方式
+RESAMPLE_FREQS = ('week', 'month', 'quarter')
+RESAMPLE_HOWS = ('sum', 'mean', 'max', 'min', 'count')
+
+# 月和季度周期包含的月数
+_PERIOD_MONTHS = {'month': 1, 'quarter': 3}
+
+
+def period_starts(dates: np.ndarray, freq: str) -> np.ndarray:
+    """
+    计算每个日期所在周期的起始日
+
+    Args:
+        dates: 日期数组（datetime64[D]）
+        freq: 'week'（ISO周，周一开始）、'month'（自然月）或'quarter'（自然季度）
+
+    Returns:
+        np.ndarray: 与输入等长的周期起始日（datetime64[D]）
+
+    Raises:
+        ValueError: 当freq不受支持时抛出
+    """
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    if freq == 'week':
+        # 1970-01-01是周四，+3后0对应周一
+        return dates - (dates.astype(np.int64) + 3) % 7
+    if freq in _PERIOD_MONTHS:
+        months = dates.astype('datetime64[M]').astype(np.int64)
+        return (months - months % _PERIOD_MONTHS[freq]).astype('datetime64[M]').astype('datetime64[D]')
+    raise ValueError(f"不支持的重采样周期: {freq}")
+
+
+def _period_boundaries(axis_dates: np.ndarray, freq: str) -> Tuple[np.ndarray, np.ndarray]:
+    """返回每个日期的周期起始日，以及每个周期第一天在日期轴上的位置"""
+    starts = period_starts(axis_dates, freq)
+    return starts, np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]]) if len(starts) else np.empty(0, np.int64)
+
+
+def resample_matrix(axis_dates: np.ndarray, matrix: np.ndarray, freq: str,
+                    how: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    按周期对矩阵各行分组聚合，缺失值（NaN）不参与聚合
+
+    日期轴升序，同一周期的列连续排列，每种聚合只需一次reduceat。
+
+    Args:
+        axis_dates: 与矩阵各列对应的升序日期（datetime64[D]）
+        matrix: (关键词 × 天)矩阵，缺失值为NaN
+        freq: 'week'、'month'或'quarter'
+        how: 'sum'、'mean'、'max'、'min'或'count'，默认使用ANALYSIS_CONFIG['resample_how']
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: 周期起始日、(关键词 × 周期)聚合矩阵
+            和(关键词 × 周期)有效天数矩阵；没有有效值的周期聚合结果为NaN（count为0）
+
+    Raises:
+        ValueError: 当freq或how不受支持时抛出
+    """
+    how = how or ANALYSIS_CONFIG['resample_how']
+    if how not in RESAMPLE_HOWS:
+        raise ValueError(f"不支持的聚合方式: {how}")
+
+    matrix = np.asarray(matrix, dtype=np.float64)
+    starts, boundaries = _period_boundaries(axis_dates, freq)
+    if not len(starts):
+        empty = np.empty((matrix.shape[0], 0))
+        return starts, empty, empty
+
+    mask = ~np.isnan(matrix)
+    counts = np.add.reduceat(mask, boundaries, axis=1)
+
+    if how in ('sum', 'mean', 'count'):
+        values = np.add.reduceat(np.where(mask, matrix, 0.0), boundaries, axis=1)
+        if how == 'mean':
+            with np.errstate(invalid='ignore', divide='ignore'):
+                values = values / counts
+        elif how == 'count':
+            values = counts.astype(np.float64)
+    else:
+        # fmax/fmin忽略NaN，整个周期缺失时结果仍为NaN
+        values = (np.fmax if how == 'max' else np.fmin).reduceat(matrix, boundaries, axis=1)
+
+    if how != 'count':
+        values[counts == 0] = np.nan
+    return starts[boundaries], values, counts
+
+
+def complete_periods(axis_dates: np.ndarray, freq: str) -> np.ndarray:
+    """
+    判断日期轴是否覆盖了每个周期的全部日历天
+
+    日期轴首尾所在的周期通常只覆盖一部分，聚合值与完整周期不可比。
+
+    Args:
+        axis_dates: 升序连续日期（datetime64[D]）
+        freq: 'week'、'month'或'quarter'
+
+    Returns:
+        np.ndarray: 与resample_matrix返回的周期一一对应的布尔数组
+    """
+    starts, boundaries = _period_boundaries(axis_dates, freq)
+    covered = np.diff(np.r_[boundaries, len(starts)])
+    if freq == 'week':
+        expected = np.full(len(boundaries), 7)
+    else:
+        months = starts[boundaries].astype('datetime64[M]')
+        expected = ((months + _PERIOD_MONTHS[freq]).astype('datetime64[D]')
+                    - months.astype('datetime64[D]')).astype(np.int64)
+    return covered == expected
+
+
+def _growth(values: np.ndarray, current: np.ndarray, previous: np.ndarray,
+            complete: Optional[np.ndarray]) -> np.ndarray:
+    """计算current列相对previous列的增长率，其余列为NaN"""
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(values.shape, np.nan)
+    if complete is not None:
+        comparable = complete[current] & complete[previous]
+        current, previous = current[comparable], previous[comparable]
+    base = values[:, previous]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result[:, current] = np.where(base > 0, values[:, current] / base - 1.0, np.nan)
+    return result
+
+
+def growth_rates(values: np.ndarray, periods: int = 1, complete: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    计算相隔periods个周期的增长率 (本期 / 上期 - 1)
+
+    重采样后的周期在日历上连续，按位置错位即按日历对齐。
+
+    Args:
+        values: (关键词 × 周期)聚合矩阵
+        periods: 相隔的周期数，1为环比；同比见year_over_year
+        complete: 各周期是否完整（见complete_periods），本期或上期不完整时结果为NaN
+
+    Returns:
+        np.ndarray: 与输入同形状的增长率矩阵，前periods个周期、上期缺失或不为正时为NaN
+    """
+    current = np.arange(periods, np.shape(values)[1])
+    return _growth(values, current, current - periods, complete)
+
+
+def year_ago_starts(starts: np.ndarray, freq: str) -> np.ndarray:
+    """
+    计算各周期在上一年对应周期的起始日
+
+    ISO周按周序号对应（2026-W10对应2025-W10），上一ISO年只有52周时第53周没有对应周期；
+    月和季度对应上一年同一自然月或季度。
+
+    Args:
+        starts: 周期起始日（datetime64[D]，见period_starts）
+        freq: 'week'、'month'或'quarter'
+
+    Returns:
+        np.ndarray: 上一年对应周期的起始日（datetime64[D]），没有对应周期时为NaT
+
+    Raises:
+        ValueError: 当freq不受支持时抛出
+    """
+    starts = np.asarray(starts, dtype='datetime64[D]')
+    if freq == 'week':
+        # ISO年由周四所在的年份决定，第1周是包含1月4日的那一周
+        thursdays = starts + 3
+        years = thursdays.astype('datetime64[Y]')
+        weeks = (thursdays - years.astype('datetime64[D]')).astype(np.int64) // 7
+        previous = period_starts((years - 1).astype('datetime64[D]') + 3, 'week') + 7 * weeks
+        previous[(previous + 3).astype('datetime64[Y]') != years - 1] = np.datetime64('NaT')
+        return previous
+    if freq in _PERIOD_MONTHS:
+        return (starts.astype('datetime64[M]') - 12).astype('datetime64[D]')
+    raise ValueError(f"不支持的重采样周期: {freq}")
+
+
+def year_over_year(starts: np.ndarray, values: np.ndarray, freq: str,
+                   complete: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    按日历对应关系计算同比增长率 (本期 / 上一年同期 - 1)
+
+    上一年同期按起始日查找（见year_ago_starts），不依赖周期数固定的位置错位，
+    因此53周的ISO年和周期序列中的空缺都不会造成错位。
+
+    Args:
+        starts: 升序的周期起始日（见resample_matrix）
+        values: (关键词 × 周期)聚合矩阵
+        freq: 'week'、'month'或'quarter'
+        complete: 各周期是否完整（见complete_periods），本期或同期不完整时结果为NaN
+
+    Returns:
+        np.ndarray: 与values同形状的同比增长率矩阵，没有上一年同期或同期不为正时为NaN
+    """
+    starts = np.asarray(starts, dtype='datetime64[D]')
+    previous = year_ago_starts(starts, freq)
+    positions = np.minimum(np.searchsorted(starts, previous), max(len(starts) - 1, 0))
+    current = np.flatnonzero(starts[positions] == previous) if len(starts) else np.empty(0, np.int64)
+    return _growth(values, current, positions[current], complete)
+
+
+def period_growth(axis_dates: np.ndarray, matrix: np.ndarray, freq: str,
+                  how: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    一次性计算全部关键词的周期聚合、环比和同比
+
+    Args:
+        axis_dates: 与矩阵各列对应的升序日期
+        matrix: (关键词 × 天)矩阵，缺失值为NaN
+        freq: 'week'（周环比WoW）、'month'（月环比MoM）或'quarter'（季度环比）
+        how: 聚合方式，默认使用ANALYSIS_CONFIG['resample_how']
+
+    Returns:
+        Dict[str, np.ndarray]: periods（周期起始日）、values、counts、complete（周期是否完整）、
+            pop（环比增长率）和yoy（同比增长率，见year_over_year）；涉及不完整周期的增长率为NaN
+    """
+    starts, values, counts = resample_matrix(axis_dates, matrix, freq, how)
+    complete = complete_periods(axis_dates, freq)
+    return {
+        'periods': starts, 'values': values, 'counts': counts, 'complete': complete,
+        'pop': growth_rates(values, 1, complete), 'yoy': year_over_year(starts, values, freq, complete)
+    }
+
+
+def resample_platforms(platforms_data: Dict[str, PlatformSeries], freq: str,
+                       how: Optional[str] = None) -> Dict[str, PlatformSeries]:
+    """
+    对全部平台一次性重采样
+
+    Args:
+        platforms_data: 平台名称到序列的映射
+        freq: 'week'、'month'或'quarter'
+        how: 聚合方式，默认使用ANALYSIS_CONFIG['resample_how']
+
+    Returns:
+        Dict[str, PlatformSeries]: 平台名称到重采样序列的映射，日期为周期起始日，
+            只包含该平台有数据的周期，数值四舍五入为整数
+    """
+    names, axis_dates, matrix = series_matrix(platforms_data)
+    starts, values, counts = resample_matrix(axis_dates, matrix, freq, how)
+
+    result = {}
+    for row, name in enumerate(names):
+        series = platforms_data[name]
+        valid = counts[row] > 0
+        result[name] = PlatformSeries(series.name_cn, starts[valid], np.rint(values[row, valid]),
+                                      series.color, series.name)
+    return result
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+滚动窗口分析模块
+在(关键词 × 天)矩阵上用累积和与递推核一次性计算所有关键词的移动平均、滚动标准差和指数加权平均，
+时间复杂度与窗口长度无关
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from core.batch_stats import series_matrix
+from core.platform_series import PlatformSeries
+
+# 支持的平滑方式
+ROLLING_KINDS = ('ma', 'std', 'ewma')
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """用累积和计算每个位置结尾、长度为window的窗口内各行的和"""
+    cumulative = np.zeros((values.shape[0], values.shape[1] + 1))
+    np.cumsum(values, axis=1, out=cumulative[:, 1:])
+    start = np.maximum(np.arange(values.shape[1]) + 1 - window, 0)
+    return cumulative[:, 1:] - cumulative[:, start]
+
+
+def rolling_mean(matrix: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    计算滚动平均，缺失值（NaN）不参与计算
+
+    Args:
+        matrix: (关键词 × 天)矩阵
+        window: 窗口天数
+        min_periods: 窗口内至少需要的有效天数，默认等于window
+
+    Returns:
+        np.ndarray: 与输入同形状的矩阵，有效天数不足的位置为NaN
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    mask = ~np.isnan(matrix)
+    counts = _window_sums(mask.astype(np.float64), window)
+    sums = _window_sums(np.where(mask, matrix, 0.0), window)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = sums / counts
+    result[counts < (window if min_periods is None else min_periods)] = np.nan
+    return result
+
+
+def rolling_std(matrix: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    计算滚动总体标准差，缺失值（NaN）不参与计算
+
+    先减去各行均值再累积平方和，降低大数值下E[x²]-E[x]²的精度损失。
+
+    Args:
+        matrix: (关键词 × 天)矩阵
+        window: 窗口天数
+        min_periods: 窗口内至少需要的有效天数，默认等于window
+
+    Returns:
+        np.ndarray: 与输入同形状的矩阵，有效天数不足的位置为NaN
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    mask = ~np.isnan(matrix)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        centers = np.where(mask, matrix, 0.0).sum(axis=1) / mask.sum(axis=1)
+    centered = np.where(mask, matrix - np.nan_to_num(centers)[:, None], 0.0)
+
+    counts = _window_sums(mask.astype(np.float64), window)
+    sums = _window_sums(centered, window)
+    squares = _window_sums(centered * centered, window)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = squares / counts - (sums / counts) ** 2
+    result = np.sqrt(np.maximum(variance, 0.0))
+    result[counts < (window if min_periods is None else min_periods)] = np.nan
+    return result
+
+
+def ewma(matrix: np.ndarray, span: Optional[float] = None, alpha: Optional[float] = None) -> np.ndarray:
+    """
+    计算指数加权移动平均，按天递推，每步同时处理所有关键词
+
+    s[t] = alpha * x[t] + (1 - alpha) * s[t-1]，首个有效值作为初值，缺失日沿用上一日结果。
+
+    Args:
+        matrix: (关键词 × 天)矩阵
+        span: 跨度，alpha = 2 / (span + 1)
+        alpha: 平滑系数，与span二选一
+
+    Returns:
+        np.ndarray: 与输入同形状的矩阵，首个有效值之前为NaN
+
+    Raises:
+        ValueError: 当span和alpha都未提供或alpha不在(0, 1]内时抛出
+    """
+    if alpha is None:
+        if span is None:
+            raise ValueError("需要提供span或alpha")
+        alpha = 2.0 / (span + 1.0)
+    if not 0 < alpha <= 1:
+        raise ValueError(f"alpha需在(0, 1]内: {alpha}")
+
+    matrix = np.asarray(matrix, dtype=np.float64)
+    result = np.empty_like(matrix)
+    state = np.full(matrix.shape[0], np.nan)
+    for day in range(matrix.shape[1]):
+        values = matrix[:, day]
+        updated = alpha * values + (1 - alpha) * state
+        state = np.where(np.isnan(values), state, np.where(np.isnan(state), values, updated))
+        result[:, day] = state
+    return result
+
+
+def smooth_platforms(platforms_data: Dict[str, PlatformSeries], kind: str = 'ma',
+                     window: int = 7) -> Dict[str, PlatformSeries]:
+    """
+    对全部平台一次性计算平滑序列，结果只保留各平台原有日期中有值的部分
+
+    Args:
+        platforms_data: 平台名称到序列的映射
+        kind: 'ma'（移动平均）、'std'（滚动标准差）或'ewma'（window作为span）
+        window: 窗口天数
+
+    Returns:
+        Dict[str, PlatformSeries]: 平台名称到平滑序列的映射，数值四舍五入为整数
+
+    Raises:
+        ValueError: 当kind不受支持时抛出
+    """
+    if kind not in ROLLING_KINDS:
+        raise ValueError(f"不支持的平滑方式: {kind}")
+
+    names, axis_dates, matrix = series_matrix(platforms_data)
+    if kind == 'ma':
+        smoothed = rolling_mean(matrix, window)
+    elif kind == 'std':
+        smoothed = rolling_std(matrix, window)
+    else:
+        smoothed = ewma(matrix, span=window)
+
+    result = {}
+    for row, name in enumerate(names):
+        series = platforms_data[name]
+        values = smoothed[row, (series.dates - axis_dates[0]).astype(np.int64)] if len(series) else smoothed[row, :0]
+        valid = ~np.isnan(values)
+        result[name] = PlatformSeries(series.name_cn, series.dates[valid], np.rint(values[valid]),
+                                      series.color, series.name)
+    return result
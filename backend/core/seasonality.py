@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+周季节性分解模块
+在(关键词 × 天)矩阵上一次性把全部关键词拆分为趋势、星期季节项和残差，
+分解结果按数据集缓存，供图表绘制去季节化曲线
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+from config.settings import ANALYSIS_CONFIG
+from core.batch_stats import series_matrix
+from core.platform_series import PlatformSeries
+
+# 支持的分解模型
+SEASONAL_MODELS = ('additive', 'multiplicative')
+
+# 一周的天数，即季节周期
+_PERIOD = 7
+
+# 缓存最近分解过的数据集数量
+_CACHE_SIZE = 8
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def _centered_mean(matrix: np.ndarray, mask: np.ndarray, min_periods: int) -> np.ndarray:
+    """用累积和计算以每天为中心的7日平均（忽略缺失值），有效天数不足时为NaN"""
+    days = matrix.shape[1]
+    half = _PERIOD // 2
+    positions = np.arange(days)
+    hi = np.minimum(positions + half + 1, days)
+    lo = np.maximum(positions - half, 0)
+
+    sums = np.zeros((matrix.shape[0], days + 1))
+    counts = np.zeros((matrix.shape[0], days + 1))
+    np.cumsum(np.where(mask, matrix, 0.0), axis=1, out=sums[:, 1:])
+    np.cumsum(mask, axis=1, out=counts[:, 1:])
+
+    window_counts = counts[:, hi] - counts[:, lo]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        trend = (sums[:, hi] - sums[:, lo]) / window_counts
+    trend[window_counts < min_periods] = np.nan
+    return trend
+
+
+def decompose_weekly(axis_dates: np.ndarray, matrix: np.ndarray,
+                     model: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    对全部关键词做周季节性分解
+
+    趋势为以当天为中心的7日平均；季节项为去趋势后按星期几分组的平均，
+    调整为加法模型下和为0（乘法模型下均值为1）；残差为剩余部分。
+    分组平均通过(天 × 星期)独热矩阵的矩阵乘法一次完成，不逐个序列循环。
+
+    Args:
+        axis_dates: 与矩阵各列对应的连续日期（datetime64[D]）
+        matrix: (关键词 × 天)矩阵，缺失值为NaN
+        model: 'additive'（x = 趋势 + 季节 + 残差）或'multiplicative'（x = 趋势 × 季节 × 残差），
+            默认使用ANALYSIS_CONFIG['seasonal_model']
+
+    Returns:
+        Dict[str, np.ndarray]: trend、seasonal、residual和deseasonalized（与输入同形状），
+            以及weekday_factors（关键词 × 7，按周一到周日排列）
+
+    Raises:
+        ValueError: 当model不受支持时抛出
+    """
+    model = model or ANALYSIS_CONFIG['seasonal_model']
+    if model not in SEASONAL_MODELS:
+        raise ValueError(f"不支持的分解模型: {model}")
+
+    matrix = np.asarray(matrix, dtype=np.float64)
+    mask = ~np.isnan(matrix)
+    trend = _centered_mean(matrix, mask, min_periods=_PERIOD // 2 + 1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        detrended = matrix / trend if model == 'multiplicative' else matrix - trend
+    valid = np.isfinite(detrended)
+
+    # 1970-01-01是周四，+3后0对应周一
+    weekdays = (np.asarray(axis_dates, dtype='datetime64[D]').astype(np.int64) + 3) % _PERIOD
+    onehot = np.zeros((len(weekdays), _PERIOD))
+    onehot[np.arange(len(weekdays)), weekdays] = 1.0
+
+    sums = np.where(valid, detrended, 0.0) @ onehot
+    counts = valid.astype(np.float64) @ onehot
+    with np.errstate(invalid='ignore', divide='ignore'):
+        factors = sums / counts
+        if model == 'multiplicative':
+            factors /= np.nanmean(factors, axis=1, keepdims=True)
+        else:
+            factors -= np.nanmean(factors, axis=1, keepdims=True)
+    # 某个星期几没有数据时视为没有季节效应
+    factors[~np.isfinite(factors)] = 1.0 if model == 'multiplicative' else 0.0
+
+    seasonal = factors[:, weekdays]
+    seasonal[~mask] = np.nan
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if model == 'multiplicative':
+            deseasonalized = matrix / seasonal
+            residual = deseasonalized / trend
+        else:
+            deseasonalized = matrix - seasonal
+            residual = deseasonalized - trend
+
+    return {
+        'trend': trend, 'seasonal': seasonal, 'residual': residual,
+        'deseasonalized': deseasonalized, 'weekday_factors': factors
+    }
+
+
+def _series_from_matrix(platforms_data: Dict[str, PlatformSeries], names, axis_dates: np.ndarray,
+                        matrix: np.ndarray) -> Dict[str, PlatformSeries]:
+    """按各平台原有日期从矩阵中取回有值的部分，数值四舍五入为整数"""
+    result = {}
+    for row, name in enumerate(names):
+        series = platforms_data[name]
+        values = matrix[row, (series.dates - axis_dates[0]).astype(np.int64)] if len(series) else matrix[row, :0]
+        valid = np.isfinite(values)
+        result[name] = PlatformSeries(series.name_cn, series.dates[valid], np.rint(values[valid]),
+                                      series.color, series.name)
+    return result
+
+
+def decompose_platforms(platforms_data: Dict[str, PlatformSeries],
+                        model: Optional[str] = None) -> Dict[str, Dict[str, PlatformSeries]]:
+    """
+    对全部平台做周季节性分解，同一份数据（按对象标识）的结果会被缓存
+
+    数据集注册表在数据未变化时返回同一个平台字典，因此多个图表绘制同一份数据时只分解一次。
+
+    Args:
+        platforms_data: 平台名称到序列的映射
+        model: 'additive'或'multiplicative'，默认使用ANALYSIS_CONFIG['seasonal_model']
+
+    Returns:
+        Dict[str, Dict[str, PlatformSeries]]: 分量名称（trend、seasonal、residual、deseasonalized）
+            到各平台序列的映射；乘法模型的seasonal和residual为比例，不适合取整，不包含在内
+    """
+    model = model or ANALYSIS_CONFIG['seasonal_model']
+    key = (id(platforms_data), model)
+    with _lock:
+        cached = _cache.get(key)
+        # 缓存项同时持有数据字典的引用，保证id不会被新对象复用
+        if cached is not None and cached[0] is platforms_data:
+            _cache.move_to_end(key)
+            return cached[1]
+
+    names, axis_dates, matrix = series_matrix(platforms_data)
+    components = decompose_weekly(axis_dates, matrix, model)
+    parts = ('trend', 'deseasonalized') if model == 'multiplicative' else \
+        ('trend', 'seasonal', 'residual', 'deseasonalized')
+    result = {part: _series_from_matrix(platforms_data, names, axis_dates, components[part]) for part in parts}
+
+    with _lock:
+        _cache[key] = (platforms_data, result)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def deseasonalize_platforms(platforms_data: Dict[str, PlatformSeries],
+                            model: Optional[str] = None) -> Dict[str, PlatformSeries]:
+    """
+    获取各平台去除星期效应后的序列
+
+    Args:
+        platforms_data: 平台名称到序列的映射
+        model: 'additive'或'multiplicative'
+
+    Returns:
+        Dict[str, PlatformSeries]: 平台名称到去季节化序列的映射
+    """
+    return decompose_platforms(platforms_data, model)['deseasonalized']
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+流式数据解析模块
+按块读取原始抓包文件，逐条产出(关键词, 日期, 指数)记录，内存占用与文件大小无关
+"""
+
+import json
+import re
+from array import array
+from typing import Any, Dict, Iterator, Optional, TextIO, Tuple
+
+from config.settings import DATA_FILE_PATH
+
+# 响应体起始标记
+RESPONSE_MARKER = '{"code":0,"content":'
+
+# 每次读取的字符数
+STREAM_CHUNK_SIZE = 1 << 16
+
+# 响应体之前最多保留的字符数，用于解析POST请求体
+REQUEST_WINDOW_SIZE = 1 << 16
+
+# JSON词法单元：标点 / 字符串 / 数字及字面量
+_TOKEN_PATTERN = re.compile(
+    r'\s*(?:([{}\[\],:])|"([^"\\]*(?:\\.[^"\\]*)*)"'
+    r'|(-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null))'
+)
+
+# 数据点对象所在的键路径：content.resp_list[*].indexes[*].time_indexes[*]
+_POINT_PATH = ['content', 'resp_list', None, 'indexes', None, 'time_indexes', None]
+_ENTRY_PATH = _POINT_PATH[:3]
+_ENTRY_DEPTH = len(_ENTRY_PATH) + 1
+_INDEX_DEPTH = 6
+_POINT_DEPTH = len(_POINT_PATH) + 1
+
+_LITERALS = {'true': True, 'false': False, 'null': None}
+
+
+def parse_request_body(header_text: str) -> Optional[Dict[str, Any]]:
+    """
+    从响应体之前的抓包文本中解析POST请求体
+
+    Args:
+        header_text: 请求行、请求头及请求体所在的文本
+
+    Returns:
+        Optional[Dict[str, Any]]: 包含query、start_ymd、end_ymd等字段的请求体，找不到时返回None
+    """
+    for line in reversed(header_text.splitlines()):
+        line = line.strip()
+        if not line.startswith('{') or '"query"' not in line:
+            continue
+        try:
+            body = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(body, dict) and isinstance(body.get('query'), list):
+            return body
+    return None
+
+
+def _seek_response_body(f: TextIO, chunk_size: int) -> Tuple[Optional[Dict[str, Any]], str]:
+    """
+    读取文件直到找到响应体起始标记
+
+    Args:
+        f: 已打开的文本文件对象
+        chunk_size: 每次读取的字符数
+
+    Returns:
+        Tuple[Optional[Dict[str, Any]], str]: 请求体和从响应体起始位置开始的缓冲区
+
+    Raises:
+        ValueError: 当找不到有效JSON数据时抛出
+    """
+    window = ''
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            raise ValueError("文件中找不到有效的JSON数据格式")
+
+        buffer = window + chunk
+        json_start = buffer.find(RESPONSE_MARKER)
+        if json_start != -1:
+            return parse_request_body(buffer[:json_start]), buffer[json_start:]
+
+        # 只保留有限长度的前文，既能覆盖被截断的标记也足以容纳请求体
+        window = buffer[-REQUEST_WINDOW_SIZE:]
+
+
+def read_capture_request(file_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    读取抓包文件中的POST请求体
+
+    Args:
+        file_path: 数据文件路径，默认使用配置中的DATA_FILE_PATH
+
+    Returns:
+        Optional[Dict[str, Any]]: 请求体，找不到时返回None
+    """
+    file_path = file_path or DATA_FILE_PATH
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return _seek_response_body(f, STREAM_CHUNK_SIZE)[0]
+    except FileNotFoundError:
+        raise FileNotFoundError(f"数据文件未找到: {file_path}")
+
+
+def _iter_tokens(f: TextIO, buffer: str, chunk_size: int) -> Iterator[Tuple[int, str]]:
+    """
+    增量切分JSON词法单元，缓冲区只保留尚未消费的部分
+
+    Args:
+        f: 已打开的文本文件对象
+        buffer: 初始缓冲区
+        chunk_size: 每次读取的字符数
+
+    Returns:
+        Iterator[Tuple[int, str]]: (单元类型, 原始文本)，类型1为标点、2为字符串、3为字面量
+    """
+    pos = 0
+    eof = False
+    while True:
+        match = _TOKEN_PATTERN.match(buffer, pos)
+
+        # 匹配到缓冲区末尾的单元可能被截断，需要补充数据后重新匹配
+        if match is None or (match.end() == len(buffer) and not eof):
+            if eof:
+                if buffer[pos:].strip():
+                    raise ValueError("JSON数据解析失败: 数据不完整或格式错误")
+                return
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+
+        pos = match.end()
+        yield match.lastindex, match.group(match.lastindex)
+
+
+def _decode_string(raw: str) -> str:
+    """解码JSON字符串中的转义序列"""
+    return json.loads(f'"{raw}"') if '\\' in raw else raw
+
+
+def _decode_literal(raw: str):
+    """解码JSON数字或字面量"""
+    if raw in _LITERALS:
+        return _LITERALS[raw]
+    return float(raw) if any(c in raw for c in '.eE') else int(raw)
+
+
+def iter_index_records(file_path: Optional[str] = None,
+                       chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Tuple[str, int, int]]:
+    """
+    流式读取抓包文件，逐条产出指数记录
+
+    只解析 resp_list[*].indexes[0].time_indexes 中的数据点。resp_list 与
+    POST请求体中的 query 数组一一对应，因此关键词可在读到数据点时直接确定；
+    缺少请求体时，由于响应中 query 字段位于 indexes 之后，单个条目的数据点
+    会暂存在紧凑数组中，内存上限为单个关键词的序列长度，而非整个文件。
+
+    Args:
+        file_path: 数据文件路径，默认使用配置中的DATA_FILE_PATH
+        chunk_size: 每次读取的字符数
+
+    Returns:
+        Iterator[Tuple[str, int, int]]: (关键词, YYYYMMDD日期, 指数值)
+
+    Raises:
+        ValueError: 当找不到有效JSON数据或数据格式错误时抛出
+        FileNotFoundError: 当数据文件不存在时抛出
+    """
+    file_path = file_path or DATA_FILE_PATH
+    try:
+        f = open(file_path, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        raise FileNotFoundError(f"数据文件未找到: {file_path}")
+
+    with f:
+        request_body, buffer = _seek_response_body(f, chunk_size)
+        request_query = request_body['query'] if request_body else []
+
+        containers = []  # 容器栈：'{' 或 '['
+        keys = []        # 各层当前键，数组层为None
+        expect_key = False
+        in_entry = in_point = False
+        indexes_seen = entry_count = 0
+        keyword = None
+        point = {}
+        pending_times, pending_scores = array('q'), array('q')
+
+        for kind, raw in _iter_tokens(f, buffer, chunk_size):
+            if kind == 1:
+                if raw == '{' or raw == '[':
+                    containers.append(raw)
+                    keys.append(None)
+                    expect_key = raw == '{'
+                    depth = len(containers)
+                    if raw == '{' and depth == _ENTRY_DEPTH:
+                        in_entry = keys[:3] == _ENTRY_PATH
+                        indexes_seen, keyword = 0, None
+                        if in_entry:
+                            if entry_count < len(request_query):
+                                keyword = request_query[entry_count]
+                            entry_count += 1
+                    elif raw == '{' and depth == _INDEX_DEPTH and in_entry:
+                        indexes_seen += 1
+                    elif raw == '{' and depth == _POINT_DEPTH:
+                        # 只取第一个indexes对象中的数据点，与load_raw_data路径保持一致
+                        in_point = in_entry and indexes_seen == 1 and keys[:7] == _POINT_PATH
+                        point = {}
+                elif raw == '}' or raw == ']':
+                    depth = len(containers)
+                    if depth == _POINT_DEPTH and in_point:
+                        time, score = int(point['time']), int(point['score'])
+                        if keyword is not None:
+                            yield keyword, time, score
+                        else:
+                            pending_times.append(time)
+                            pending_scores.append(score)
+                        in_point = False
+                    elif depth == _ENTRY_DEPTH and in_entry:
+                        if pending_times:
+                            raise ValueError("响应条目缺少query字段，无法确定关键词")
+                        in_entry = False
+                    containers.pop()
+                    keys.pop()
+                    if not containers:
+                        return
+                    expect_key = False
+                elif raw == ',':
+                    expect_key = containers[-1] == '{'
+                continue
+
+            if expect_key:
+                keys[-1] = raw
+                expect_key = False
+                continue
+
+            value = _decode_string(raw) if kind == 2 else _decode_literal(raw)
+            depth = len(containers)
+            if in_point and depth == _POINT_DEPTH:
+                point[keys[-1]] = value
+            elif in_entry and depth == _ENTRY_DEPTH and keys[-1] == 'query':
+                if keyword is not None and value != keyword:
+                    raise ValueError(f"响应条目关键词 {value} 与请求体中的 {keyword} 不一致")
+                keyword = value
+                for time, score in zip(pending_times, pending_scores):
+                    yield keyword, time, score
+                pending_times, pending_scores = array('q'), array('q')
+
+    raise ValueError("JSON数据解析失败: 数据不完整或格式错误")
+
+
+def load_keyword_series(file_path: Optional[str] = None) -> Dict[str, Tuple[array, array]]:
+    """
+    流式加载各关键词的时间序列，数据以紧凑整数数组保存
+
+    Args:
+        file_path: 数据文件路径，默认使用配置中的DATA_FILE_PATH
+
+    Returns:
+        Dict[str, Tuple[array, array]]: 关键词到(日期数组, 数值数组)的映射，按响应顺序排列
+    """
+    series = {}
+    for keyword, time, score in iter_index_records(file_path):
+        if keyword not in series:
+            series[keyword] = (array('q'), array('q'))
+        times, scores = series[keyword]
+        times.append(time)
+        scores.append(score)
+    return series
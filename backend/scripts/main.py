@@ -42,6 +42,41 @@ def run_three_platforms():
     return three_main()
 
 
+def run_ingest(data_dir: str = None, pattern: str = None, workers: int = None,
+               incremental: bool = False, archives: list = None):
+    """运行抓包文件批量导入"""
+    from main_ingest import main as ingest_main
+    return ingest_main(data_dir, pattern, workers, incremental, archives)
+
+
+def run_fetch(args):
+    """运行指数抓取"""
+    from main_fetch import main as fetch_main
+    keywords = args.keywords.split(',') if args.keywords else None
+    return fetch_main(keywords, args.platform_type, args.start, args.end,
+                      args.job_file, args.url, args.plan_only)
+
+
+def run_backfill(args):
+    """运行历史数据回填"""
+    from main_backfill import main as backfill_main
+    keywords = args.keywords.split(',') if args.keywords else None
+    return backfill_main(keywords, args.platform_type, args.start, args.end, args.url, args.reset)
+
+
+def run_replay(args):
+    """运行本地回放服务器"""
+    from main_replay import main as replay_main
+    return replay_main(args.port, args.latency, args.error_rate, args.rate_limit,
+                       args.soak, args.start, args.end)
+
+
+def run_benchmark():
+    """运行解析性能基准测试"""
+    from main_benchmark import main as benchmark_main
+    return benchmark_main()
+
+
 def run_all_charts():
     """运行所有图表生成"""
     print("=== 开始生成所有图表 ===\n")
@@ -89,15 +124,44 @@ def main():
   python main.py chinese       # 生成中文图表
   python main.py three         # 生成三平台图表
   python main.py all           # 生成所有图表
+  python main.py ingest --data-dir ../../data --workers 4   # 并行导入抓包目录
+  python main.py ingest --incremental                     # 只追加新日期
+  python main.py ingest --archive session.har capture.zip # 导入HAR和zip归档
+  python main.py benchmark     # 对比各解析方式的耗时
+  python main.py fetch --platform-type five_platforms --start 20230101 --end 20250821
+  python main.py fetch         # 继续执行任务列表中未完成的抓取任务
+  python main.py backfill --keywords 京东,美团 --start 20200101 --end 20241231   # 可续跑的历史回填
+  python main.py replay --port 8765 --error-rate 0.05      # 启动本地回放服务器
+  python main.py replay --soak 500                        # 对回放服务器压测
         """
     )
     
     parser.add_argument(
         'mode',
-        choices=['simple', 'five', 'interactive', 'chinese', 'three', 'all'],
+        choices=['simple', 'five', 'interactive', 'chinese', 'three', 'all', 'ingest', 'benchmark', 'fetch', 'backfill', 'replay'],
         help='图表生成模式'
     )
     
+    parser.add_argument('--data-dir', help='抓包文件目录（ingest模式）')
+    parser.add_argument('--pattern', help='抓包文件名通配符（ingest模式）')
+    parser.add_argument('--workers', type=int, help='并行进程数（ingest模式）')
+    parser.add_argument('--incremental', action='store_true', help='只追加各关键词的新日期（ingest模式）')
+    parser.add_argument('--archive', nargs='+', help='HAR文件或zip归档路径（ingest模式）')
+    parser.add_argument('--keywords', help='逗号分隔的关键词（fetch、backfill模式）')
+    parser.add_argument('--platform-type', choices=['five_platforms', 'delivery_platforms'],
+                        help='使用预设平台关键词（fetch、backfill模式）')
+    parser.add_argument('--start', help='开始日期YYYYMMDD（fetch、backfill、replay模式）')
+    parser.add_argument('--end', help='结束日期YYYYMMDD（fetch、backfill、replay模式）')
+    parser.add_argument('--job-file', help='任务列表文件（fetch模式）')
+    parser.add_argument('--url', help='接口地址（fetch、backfill模式）')
+    parser.add_argument('--plan-only', action='store_true', help='只生成任务列表（fetch模式）')
+    parser.add_argument('--reset', action='store_true', help='清除检查点后重新回填（backfill模式）')
+    parser.add_argument('--port', type=int, help='监听端口（replay模式）')
+    parser.add_argument('--latency', type=float, help='基础延迟秒数（replay模式）')
+    parser.add_argument('--error-rate', type=float, help='随机错误比例（replay模式）')
+    parser.add_argument('--rate-limit', type=float, help='每秒允许的请求数（replay模式）')
+    parser.add_argument('--soak', type=int, help='压测使用的合成关键词数量（replay模式）')
+    
     args = parser.parse_args()
     
     # 确保输出目录存在
@@ -111,7 +175,12 @@ def main():
         'interactive': run_interactive,
         'chinese': run_chinese_chart,
         'three': run_three_platforms,
-        'all': run_all_charts
+        'all': run_all_charts,
+        'ingest': lambda: run_ingest(args.data_dir, args.pattern, args.workers, args.incremental, args.archive),
+        'benchmark': run_benchmark,
+        'fetch': lambda: run_fetch(args),
+        'backfill': lambda: run_backfill(args),
+        'replay': lambda: run_replay(args)
     }
     
     try:
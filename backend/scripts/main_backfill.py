@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+历史数据回填主脚本
+按自然年批量抓取历史指数，中断后重新运行从检查点继续
+"""
+
+import sys
+import os
+
+# 添加backend目录到Python路径
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from config.settings import PLATFORM_CONFIGS
+from core.backfill import run_backfill
+
+
+def main(keywords: list = None, platform_type: str = None, start: str = None, end: str = None,
+         url: str = None, reset: bool = False):
+    """
+    主函数：执行历史数据回填
+
+    Args:
+        keywords: 关键词列表
+        platform_type: 平台类型，使用PLATFORM_CONFIGS中对应的关键词
+        start: 开始日期（YYYYMMDD）
+        end: 结束日期（YYYYMMDD）
+        url: 接口地址，可指向本地替身服务器
+        reset: 是否清除已有检查点后重新回填
+    """
+    try:
+        keywords = PLATFORM_CONFIGS[platform_type] if platform_type else keywords
+        if not (keywords and start and end):
+            raise ValueError("回填需要指定关键词（或平台类型）以及开始和结束日期")
+
+        summary = run_backfill(keywords, int(start), int(end), reset, **({'url': url} if url else {}))
+
+        print(f"任务总数: {summary['jobs']}，已完成跳过: {summary['skipped']}，本次请求: {summary['requests']}")
+        print(f"新写入存储的数据点: {summary['stored_points']}")
+        for job, error in summary['failures']:
+            print(f"警告: {error}")
+        if summary['failures']:
+            print("重新运行同一命令可从检查点继续")
+            return 1
+
+    except Exception as e:
+        print(f"回填数据时发生错误: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
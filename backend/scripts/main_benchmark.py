@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+解析性能基准脚本
+对比标准库json、可选的快速解码库、流式解析、time_indexes专用扫描器和缓存未命中时的完整解析路径
+解析同一抓包文件的耗时
+"""
+
+import sys
+import os
+import time
+
+# 添加backend目录到Python路径
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from config.settings import DATA_FILE_PATH
+from core.data_cache import parse_index_columns
+from core.data_parser import build_time_series
+from core.json_backend import get_json_loads, scan_time_indexes
+from core.stream_parser import RESPONSE_MARKER, load_keyword_series
+
+
+def _read_body(file_path: str) -> str:
+    """读取抓包文件中的响应体文本"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    json_start = content.find(RESPONSE_MARKER)
+    if json_start == -1:
+        raise ValueError("文件中找不到有效的JSON数据格式")
+    return content[json_start:].strip()
+
+
+def _decode_with(loads):
+    """构造使用指定解码函数、按现有路径提取全部平台序列的解析函数"""
+    def parse(body: str):
+        resp_list = loads(body)['content']['resp_list']
+        for resp in resp_list:
+            time_indexes = resp['indexes'][0]['time_indexes']
+            build_time_series([point['time'] for point in time_indexes],
+                              [point['score'] for point in time_indexes])
+    return parse
+
+
+def _scan(body: str):
+    for _, times, scores in scan_time_indexes(body.encode('utf-8')):
+        build_time_series(times, scores)
+
+
+def _measure(func, argument, repeat: int) -> float:
+    """返回多次运行中的最短耗时（毫秒）"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(argument)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(file_path: str = None, repeat: int = 20):
+    """
+    主函数：运行解析基准测试
+
+    Args:
+        file_path: 抓包文件路径，默认使用配置中的DATA_FILE_PATH
+        repeat: 每种解析方式的运行次数
+    """
+    try:
+        file_path = file_path or DATA_FILE_PATH
+        body = _read_body(file_path)
+        print(f"基准文件: {file_path} ({len(body.encode('utf-8')) / 1024:.1f} KB)")
+
+        cases = [('stdlib json', _decode_with(get_json_loads('json')[1]), body)]
+        name, loads = get_json_loads('auto')
+        if name != 'json':
+            cases.append((name, _decode_with(loads), body))
+        cases.append(('stream_parser', load_keyword_series, file_path))
+        cases.append(('scan_time_indexes', _scan, body))
+        cases.append(('parse_index_columns', parse_index_columns, file_path))
+
+        baseline = None
+        for label, func, argument in cases:
+            elapsed = _measure(func, argument, repeat)
+            baseline = baseline or elapsed
+            print(f"{label:<20} {elapsed:8.2f} ms  x{baseline / elapsed:.2f}")
+
+    except Exception as e:
+        print(f"基准测试时发生错误: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+指数抓取主脚本
+为关键词和日期范围生成抓取计划，跳过已存储的数据，并可从任务列表断点续跑
+"""
+
+import sys
+import os
+
+# 添加backend目录到Python路径
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from config.settings import PLATFORM_CONFIGS
+from core.fetch_planner import plan_requests, run_job_list, save_job_list
+
+
+def main(keywords: list = None, platform_type: str = None, start: str = None, end: str = None,
+         job_file: str = None, url: str = None, plan_only: bool = False):
+    """
+    主函数：生成抓取计划并执行
+
+    未提供关键词和平台类型时继续执行已有任务列表中未完成的任务。
+
+    Args:
+        keywords: 关键词列表
+        platform_type: 平台类型，使用PLATFORM_CONFIGS中对应的关键词
+        start: 开始日期（YYYYMMDD）
+        end: 结束日期（YYYYMMDD）
+        job_file: 任务列表文件路径
+        url: 接口地址，可指向本地替身服务器
+        plan_only: 只生成任务列表，不发起请求
+    """
+    try:
+        if platform_type:
+            keywords = PLATFORM_CONFIGS[platform_type]
+
+        if keywords:
+            if not (start and end):
+                raise ValueError("生成抓取计划需要同时指定开始和结束日期")
+            jobs = plan_requests(keywords, int(start), int(end))
+            job_file = save_job_list(jobs, job_file)
+            print(f"已生成 {len(jobs)} 个抓取任务: {job_file}")
+            for job in jobs:
+                print(f"  {job['id']}")
+
+        if plan_only:
+            return 0
+
+        summary = run_job_list(job_file, **({'url': url} if url else {}))
+        print(f"本次请求数: {summary['requests']}，已完成跳过: {summary['skipped']}")
+        print(f"新写入存储的数据点: {summary['stored_points']}")
+        for job, error in summary['failures']:
+            print(f"警告: {error}")
+
+    except Exception as e:
+        print(f"抓取数据时发生错误: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    return 0 if not summary['failures'] else 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
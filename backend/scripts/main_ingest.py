@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+抓包文件批量导入主脚本
+并行解析目录中的抓包文件，合并去重后保存为列式数据集并写入时序存储
+"""
+
+import sys
+import os
+
+# 添加backend目录到Python路径
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from core.archive_ingest import ingest_archives
+from core.ingest import ingest_directory, ingest_incremental, scan_capture_files
+
+
+def run_incremental(data_dir: str = None, pattern: str = None):
+    """
+    按文件顺序增量导入抓包文件，只追加各关键词的新日期
+
+    Args:
+        data_dir: 抓包文件目录
+        pattern: 文件名通配符
+    """
+    for file_path in scan_capture_files(data_dir, pattern):
+        summary = ingest_incremental(file_path)
+        changed = summary['changed_keywords']
+        print(f"{os.path.basename(file_path)}: 新增 {summary['stored_points']} 个数据点"
+              + (f"，变化的关键词: {', '.join(f'{k}(+{n})' for k, n in changed.items())}" if changed else ""))
+
+
+def main(data_dir: str = None, pattern: str = None, workers: int = None, incremental: bool = False,
+         archives: list = None):
+    """
+    主函数：导入抓包文件目录
+
+    Args:
+        data_dir: 抓包文件目录
+        pattern: 文件名通配符
+        workers: 并行进程数
+        incremental: 是否只追加各关键词已存储最新日期之后的数据
+        archives: HAR文件或zip归档路径列表，提供时导入这些文件而不是抓包目录
+    """
+    try:
+        print("开始导入抓包文件...")
+
+        if incremental:
+            run_incremental(data_dir, pattern)
+            return 0
+
+        if archives:
+            summary = ingest_archives(archives, workers)
+            print(f"文件数: {summary['files']}")
+            print(f"wxindex条目数: {summary['entries']}")
+        else:
+            summary = ingest_directory(data_dir, pattern, workers)
+            print(f"文件数: {summary['files']}")
+
+        print(f"关键词数: {summary['keywords']}")
+        print(f"去重后数据点: {summary['data_points']}")
+        print(f"新写入存储的数据点: {summary['stored_points']}")
+        if 'output_dir' in summary:
+            print(f"合并结果: {summary['output_dir']}")
+
+        for source, error in summary['failures']:
+            print(f"警告: 无法解析 {source}: {error}")
+
+        conflicts = summary['conflicts']
+        if conflicts:
+            print(f"\n=== 发现 {len(conflicts)} 个数值冲突 ===")
+            for conflict in conflicts[:20]:
+                print(f"{conflict['keyword']} {conflict['date']}: "
+                      f"{conflict['values']} 来源 {conflict['sources']}，保留 {conflict['kept']}")
+            if len(conflicts) > 20:
+                print(f"... 其余 {len(conflicts) - 20} 个冲突已省略")
+
+    except Exception as e:
+        print(f"导入数据时发生错误: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
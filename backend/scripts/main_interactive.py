@@ -13,6 +13,7 @@ backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, backend_dir)
 
 from visualization.interactive_chart import create_interactive_chart, generate_platform_comparison
+from visualization.correlation_chart import generate_correlation_heatmap
 
 
 def generate_comparison_charts():
@@ -38,6 +39,66 @@ def generate_comparison_charts():
     print(f"美团系对比图表: {meituan_comparison}")
 
 
+def generate_correlation_charts():
+    """
+    生成相关性热力图
+    """
+    print("生成相关性热力图...")
+    
+    pearson_heatmap = generate_correlation_heatmap('five_platforms', mode='pearson')
+    print(f"相关系数热力图: {pearson_heatmap}")
+    
+    lag_heatmap = generate_correlation_heatmap('five_platforms', mode='lag')
+    print(f"领先滞后热力图: {lag_heatmap}")
+
+
+def generate_anomaly_chart():
+    """
+    生成标注异常日的平台指数图表
+    """
+    print("生成异常日标注图表...")
+    
+    chart = create_interactive_chart('five_platforms')
+    try:
+        chart.set_anomaly_annotation()
+        anomaly_path = chart.generate(title="微信指数异常日标注", filename="platforms_anomalies")
+        print(f"异常日标注图表: {anomaly_path}")
+    finally:
+        chart.close()
+
+
+def generate_deseasonalized_chart():
+    """
+    生成去除星期效应后的平台指数图表
+    """
+    print("生成去季节化图表...")
+    
+    chart = create_interactive_chart('five_platforms')
+    try:
+        chart.set_deseasonalized()
+        deseasonalized_path = chart.generate(title="微信指数趋势（去除星期效应）",
+                                             filename="platforms_deseasonalized")
+        print(f"去季节化图表: {deseasonalized_path}")
+    finally:
+        chart.close()
+
+
+def generate_granularity_charts():
+    """
+    生成按周和按月汇总的平台指数图表
+    """
+    print("生成周/月汇总图表...")
+    
+    for granularity, label in (('week', '周'), ('month', '月')):
+        chart = create_interactive_chart('five_platforms')
+        try:
+            chart.set_granularity(granularity)
+            path = chart.generate(title=f"微信指数{label}汇总", filename=f"platforms_{granularity}ly")
+            print(f"{label}汇总图表: {path}")
+        finally:
+            chart.close()
+
+
 def generate_trend_analysis():
     """
     生成趋势分析图表
@@ -70,6 +131,29 @@ def generate_trend_analysis():
         for i, (platform, stats) in enumerate(report['rankings']['by_average'], 1):
             print(f"{i}. {platform}: 平均指数 {stats['mean']:.0f}")
         
+        # 使用时序存储的持久化统计量时，报告默认不包含以下需要完整序列的部分
+        if 'correlation' in report:
+            print("\n=== 领先滞后关系 ===")
+            for pair in report['correlation']['lead_lag']:
+                relation = f"领先 {pair['follower']} {pair['lag']} 天" if pair['lag'] else f"与 {pair['follower']} 同步"
+                print(f"{pair['leader']} {relation}，相关系数 {pair['correlation']:.2f}")
+        
+        if 'periods' in report:
+            monthly = report['periods']['month']
+            complete = [i for i, flag in enumerate(monthly['complete']) if flag]
+            if complete:
+                latest = complete[-1]
+                print(f"\n=== {monthly['periods'][latest][:7]} 月环比 ===")
+                for platform, values in monthly['platforms'].items():
+                    growth = values['pop'][latest]
+                    print(f"{platform}: {'无法计算' if growth is None else f'{growth:+.1%}'}")
+        
+        if 'anomalies' in report:
+            print(f"\n=== 异常日（共 {len(report['anomalies'])} 个） ===")
+            for event in sorted(report['anomalies'], key=lambda item: abs(item['score']), reverse=True)[:10]:
+                direction = "激增" if event['direction'] == 'spike' else "骤降"
+                print(f"{event['date']} {event['keyword']}: {direction}，指数 {event['value']}，分数 {event['score']:.1f}")
+        
     finally:
         chart.close()
 
@@ -86,6 +170,26 @@ def main():
         
         print()
         
+        # 生成相关性热力图
+        generate_correlation_charts()
+        
+        print()
+        
+        # 生成异常日标注图表
+        generate_anomaly_chart()
+        
+        print()
+        
+        # 生成去季节化图表
+        generate_deseasonalized_chart()
+        
+        print()
+        
+        # 生成周/月汇总图表
+        generate_granularity_charts()
+        
+        print()
+        
         # 生成趋势分析
         generate_trend_analysis()
         
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+本地回放服务器主脚本
+启动模拟wxindex接口的本地服务器，或对其运行抓取、解析、存储与绘图的压力测试
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+import time
+from typing import List
+
+# 添加backend目录到Python路径
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from core.fetch_client import WxIndexClient, fetch_into_store
+from core.fetch_planner import plan_requests
+from core.index_store import IndexStore
+from core.keyword_registry import get_keyword_registry
+from core.replay_server import ReplayServer
+from utils.chart_utils import (
+    setup_matplotlib, create_figure, format_date_axis, apply_chart_styling,
+    add_legend, save_chart, plot_platform_line, close_figure
+)
+
+
+def render_soak_chart(db_path: str, keywords: List[str], filename: str = "replay_soak") -> str:
+    """
+    从压力测试写入的存储中读取部分关键词并绘制趋势图
+
+    Args:
+        db_path: 压力测试使用的存储路径
+        keywords: 要绘制的关键词
+        filename: 保存文件名
+
+    Returns:
+        str: 图表文件路径
+    """
+    with IndexStore(db_path) as store:
+        columns = store.load_columns(keywords)
+
+    setup_matplotlib()
+    registry = get_keyword_registry()
+    fig, ax = create_figure("回放压力测试数据")
+    try:
+        for keyword, (start, end) in zip(columns['keywords'].tolist(),
+                                         zip(columns['offsets'][:-1], columns['offsets'][1:])):
+            plot_platform_line(ax, columns['dates'][start:end], columns['scores'][start:end],
+                               keyword, registry.get(keyword)['color'], show_markers=False)
+        format_date_axis(ax, columns['dates'])
+        apply_chart_styling(ax)
+        add_legend(ax)
+        return save_chart(fig, filename)
+    finally:
+        close_figure(fig)
+
+
+def run_soak(server: ReplayServer, keyword_count: int, start: int, end: int):
+    """
+    对回放服务器运行完整的抓取 → 解码 → 写入存储 → 绘图流程，统计各阶段吞吐量
+
+    数据写入临时存储，结束后删除，不影响STORE_CONFIG中的存储。
+
+    Args:
+        server: 已启动的回放服务器
+        keyword_count: 合成关键词数量
+        start: 开始日期（YYYYMMDD）
+        end: 结束日期（YYYYMMDD）
+    """
+    keywords = [f'soak-{i:05d}' for i in range(keyword_count)]
+    jobs = plan_requests(keywords, start, end, skip_stored=False)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, 'soak.db')
+
+        async def run():
+            client = WxIndexClient(server.url, concurrency=16, rate=1e6, burst=64, backoff=0.05)
+            return await fetch_into_store(jobs, client, db_path=db_path)
+
+        started = time.perf_counter()
+        summary = asyncio.run(run())
+        elapsed = time.perf_counter() - started
+
+        succeeded = len(jobs) - len(summary['failures'])
+        print(f"请求数: {len(jobs)}，失败: {len(summary['failures'])}，耗时: {elapsed:.2f} s")
+        print(f"吞吐量: {succeeded / elapsed:.1f} 请求/秒，"
+              f"{summary['stored_points'] / elapsed:.0f} 数据点/秒（已写入存储）")
+
+        started = time.perf_counter()
+        chart_path = render_soak_chart(db_path, keywords[:5])
+        print(f"绘图耗时: {time.perf_counter() - started:.2f} s，图表: {chart_path}")
+
+    print(f"服务器统计: {server.stats}")
+
+
+def main(port: int = None, latency: float = None, error_rate: float = None, rate_limit: float = None,
+         soak: int = None, start: str = None, end: str = None):
+    """
+    主函数：启动回放服务器
+
+    Args:
+        port: 监听端口
+        latency: 基础延迟秒数
+        error_rate: 随机错误比例
+        rate_limit: 每秒允许的请求数
+        soak: 提供时对服务器运行压力测试，值为合成关键词数量，完成后退出
+        start: 压力测试开始日期（YYYYMMDD）
+        end: 压力测试结束日期（YYYYMMDD）
+    """
+    options = {key: value for key, value in
+               (('latency', latency), ('error_rate', error_rate), ('rate_limit', rate_limit))
+               if value is not None}
+    server = None
+    try:
+        server = ReplayServer(port=0 if soak else port, **options).start()
+        print(f"回放服务器已启动: {server.url}")
+
+        if soak:
+            run_soak(server, soak, int(start or 20240101), int(end or 20241231))
+            return 0
+
+        while True:
+            time.sleep(3600)
+
+    except KeyboardInterrupt:
+        print(f"\n服务器已停止，统计: {server.stats if server is not None else {}}")
+    except Exception as e:
+        print(f"运行回放服务器时发生错误: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
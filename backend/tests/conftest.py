@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""
+测试公共配置
+将backend目录加入模块搜索路径，并提供指向临时目录的时序存储
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import STORE_CONFIG  # noqa: E402
+
+
+@pytest.fixture
+def store_path(tmp_path, monkeypatch):
+    """将默认时序存储指向临时数据库，避免读写data/wxindex.db"""
+    db_path = str(tmp_path / 'wxindex.db')
+    monkeypatch.setitem(STORE_CONFIG, 'db_path', db_path)
+    return db_path
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""聚合金字塔层级选择：返回桶数量不超过max_points的最细层级"""
+
+import pytest
+
+from core.aggregate_pyramid import choose_level
+
+
+@pytest.mark.parametrize('max_points, level', [
+    (1000, 'day'),
+    (366, 'day'),     # 2024年共366天
+    (365, 'week'),
+    (53, 'week'),
+    (52, 'month'),
+    (12, 'quarter'),  # 366 / 30.44 略大于12
+    (4, 'quarter'),
+    (1, 'quarter'),   # 季度仍超过上限时返回最粗层级
+])
+def test_choose_level_for_leap_year(max_points, level):
+    assert choose_level(20240101, 20241231, max_points) == level
+
+
+def test_choose_level_single_day():
+    assert choose_level(20240301, 20240301, 1) == 'day'
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""回填检查点：已完成的任务在重新运行时跳过，失败的任务下次继续抓取"""
+
+from array import array
+
+import pytest
+
+import core.backfill as backfill
+from core.data_cache import columns_from_series
+from core.index_store import IndexStore
+
+
+@pytest.fixture
+def fake_fetch(store_path, monkeypatch):
+    """以本地生成的数据代替网络抓取，failing中的任务id返回失败"""
+    calls, failing = [], set()
+
+    async def fetch_into_store(jobs, client=None, on_result=None, db_path=None):
+        calls.append([job['id'] for job in jobs])
+        summary = {'requests': len(jobs), 'stored_points': 0, 'failures': []}
+        with IndexStore(db_path) as store:
+            for job in jobs:
+                if job['id'] in failing:
+                    summary['failures'].append((job, '模拟失败'))
+                    continue
+                columns = columns_from_series({keyword: (array('q', [job['start_ymd'], job['end_ymd']]),
+                                                         array('q', [1, 2]))
+                                               for keyword in job['query']})
+                summary['stored_points'] += on_result(job, columns, store)
+        return summary
+
+    monkeypatch.setattr(backfill, 'fetch_into_store', fetch_into_store)
+    return calls, failing
+
+
+def test_backfill_resumes_from_checkpoints(fake_fetch):
+    calls, failing = fake_fetch
+    keywords = ['美团外卖', '饿了么']
+    jobs = backfill.plan_backfill(keywords, 20231201, 20240110)
+    assert [(job['start_ymd'], job['end_ymd']) for job in jobs] == [(20231201, 20231231), (20240101, 20240110)]
+
+    failing.add(jobs[1]['id'])
+    first = backfill.run_backfill(keywords, 20231201, 20240110)
+    assert (first['jobs'], first['skipped'], len(first['failures'])) == (2, 0, 1)
+    assert first['stored_points'] == 4
+
+    failing.clear()
+    second = backfill.run_backfill(keywords, 20231201, 20240110)
+    assert calls[-1] == [jobs[1]['id']]
+    assert (second['skipped'], second['stored_points'], second['failures']) == (1, 4, [])
+
+    third = backfill.run_backfill(keywords, 20231201, 20240110)
+    assert len(calls) == 2
+    assert (third['requests'], third['skipped']) == (0, 2)
+
+    with IndexStore() as store:
+        assert set(store.completed_jobs()) == {job['id'] for job in jobs}
+
+
+def test_backfill_reset_clears_checkpoints(fake_fetch):
+    calls, _ = fake_fetch
+    backfill.run_backfill(['美团外卖'], 20240101, 20240110)
+    summary = backfill.run_backfill(['美团外卖'], 20240101, 20240110, reset=True)
+
+    assert len(calls) == 2
+    assert summary['skipped'] == 0
+    # 数据已存在，重新抓取不会新增数据点
+    assert summary['stored_points'] == 0
+
+
+def test_plan_backfill_splits_leap_year_by_configured_window():
+    jobs = backfill.plan_backfill(['美团外卖'], 20240101, 20241231)
+
+    assert [(job['start_ymd'], job['end_ymd']) for job in jobs] == [(20240101, 20241230), (20241231, 20241231)]
+    assert jobs == backfill.plan_backfill(['美团外卖'], 20240101, 20241231)
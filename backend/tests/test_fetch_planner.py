@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""抓取计划：缺失矩阵反映存储中已有的数据，请求只覆盖缺失区间"""
+
+import numpy as np
+import pytest
+
+from core.fetch_planner import _missing_matrix, plan_requests
+from core.index_store import IndexStore
+
+START, END = np.datetime64('2024-01-01'), np.datetime64('2024-01-10')
+
+
+@pytest.fixture
+def stored(store_path):
+    """美团外卖已有2024-01-01至01-10中除01-05以外的数据"""
+    dates = np.arange(START, END + 1)
+    dates = dates[dates != np.datetime64('2024-01-05')]
+    with IndexStore() as store:
+        store.append_points(['美团外卖'] * len(dates), dates, np.arange(len(dates)) + 1)
+    return store_path
+
+
+def test_missing_matrix_marks_stored_days(stored):
+    with IndexStore() as store:
+        missing = _missing_matrix(['美团外卖', '饿了么'], START, END, store)
+
+    assert missing.shape == (2, 10)
+    assert np.flatnonzero(missing[0]).tolist() == [4]
+    assert missing[1].all()
+
+
+def test_missing_matrix_without_store_is_all_missing():
+    assert _missing_matrix(['美团外卖'], START, END, None).all()
+
+
+def test_plan_requests_skips_stored_days(stored):
+    jobs = plan_requests(['美团外卖', '饿了么'], 20240101, 20240110, max_keywords=1)
+
+    assert [(job['query'], job['start_ymd'], job['end_ymd']) for job in jobs] == [
+        (['饿了么'], 20240101, 20240110),
+        (['美团外卖'], 20240105, 20240105),
+    ]
+    assert plan_requests(['美团外卖'], 20240101, 20240104) == []
+
+
+def test_plan_requests_splits_windows(stored):
+    jobs = plan_requests(['饿了么'], 20240101, 20240110, skip_stored=False, max_window_days=4)
+
+    assert [(job['start_ymd'], job['end_ymd']) for job in jobs] == [
+        (20240101, 20240104), (20240105, 20240108), (20240109, 20240110)
+    ]
+    assert all(job['status'] == 'pending' for job in jobs)
+
+
+def test_plan_requests_rejects_reversed_range():
+    with pytest.raises(ValueError):
+        plan_requests(['饿了么'], 20240110, 20240101, skip_stored=False)
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""多文件合并：(关键词, 日期)去重时靠后的来源优先，数值不一致的重复点记为冲突"""
+
+from array import array
+
+import numpy as np
+
+from core.data_cache import columns_from_series
+from core.date_codec import encode_ymd
+from core.ingest import merge_columns
+
+
+def _columns(series):
+    return columns_from_series({keyword: (array('q', times), array('q', scores))
+                                for keyword, (times, scores) in series.items()})
+
+
+def test_merge_columns_keeps_last_source_and_reports_conflicts():
+    older = _columns({'美团外卖': ([20240101, 20240102, 20240103], [10, 20, 30]),
+                      '饿了么': ([20240101], [5])})
+    newer = _columns({'京东外卖': ([20240102], [7]),
+                      '美团外卖': ([20240103, 20240104, 20240102], [31, 40, 20])})
+
+    merged, conflicts = merge_columns([older, newer], ['older', 'newer'])
+
+    # 关键词保持首次出现的顺序，每个关键词的日期有序且不重复
+    assert merged['keywords'].tolist() == ['美团外卖', '饿了么', '京东外卖']
+    assert merged['offsets'].tolist() == [0, 4, 5, 6]
+    assert encode_ymd(merged['dates']).tolist() == [20240101, 20240102, 20240103, 20240104, 20240101, 20240102]
+    assert merged['scores'].tolist() == [10, 20, 31, 40, 5, 7]
+
+    # 数值相同的重复点（20240102）不算冲突
+    assert conflicts == [{
+        'keyword': '美团外卖',
+        'date': '2024-01-03',
+        'values': [30, 31],
+        'sources': ['older', 'newer'],
+        'kept': 31
+    }]
+
+
+def test_merge_columns_without_input_returns_empty_columns():
+    merged, conflicts = merge_columns([])
+
+    assert conflicts == []
+    assert merged['offsets'].tolist() == [0]
+    assert merged['dates'].dtype == np.dtype('datetime64[D]')
+    assert len(merged['scores']) == 0
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""分批合并的累计统计量应与对全部数据直接计算的结果一致"""
+
+import numpy as np
+import pytest
+
+from core.index_store import IndexStore
+from core.online_stats import batch_moments, merge_moments
+
+
+def _split_moments(dates, scores, bounds):
+    moments = None
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        moments = merge_moments(moments, batch_moments(dates[lo:hi], scores[lo:hi]))
+    return moments
+
+
+def test_merge_moments_matches_numpy():
+    rng = np.random.default_rng(7)
+    scores = rng.integers(10 ** 6, 10 ** 9, size=500)
+    dates = 20240101 + np.arange(500)
+
+    for bounds in ([0, 500], [0, 1, 2, 500], [0, 137, 138, 301, 500]):
+        count, total, mean, m2, minimum, maximum, first_date, last_date = _split_moments(dates, scores, bounds)
+        assert count == len(scores)
+        assert total == pytest.approx(scores.sum())
+        assert mean == pytest.approx(scores.mean())
+        assert m2 / count == pytest.approx(scores.var())
+        assert (minimum, maximum) == (scores.min(), scores.max())
+        assert (first_date, last_date) == (dates.min(), dates.max())
+
+
+def test_merge_moments_is_order_independent():
+    rng = np.random.default_rng(11)
+    scores = rng.integers(0, 1000, size=90)
+    dates = np.arange(90)
+    a, b = batch_moments(dates[:30], scores[:30]), batch_moments(dates[30:], scores[30:])
+
+    assert merge_moments(a, b) == pytest.approx(merge_moments(b, a))
+    assert merge_moments(None, b) == b
+
+
+def test_store_statistics_follow_appends(tmp_path):
+    dates = np.arange('2024-01-01', '2024-03-01', dtype='datetime64[D]')
+    scores = np.random.default_rng(3).integers(100, 10000, size=len(dates))
+
+    with IndexStore(str(tmp_path / 'stats.db')) as store:
+        store.append_points(['美团外卖'] * 40, dates[:40], scores[:40])
+        # 与已有数据重叠的点不会重复计入
+        store.append_points(['美团外卖'] * (len(dates) - 30), dates[30:], scores[30:])
+        stats = store.keyword_statistics(['美团外卖'])['美团外卖']
+
+    assert stats['count'] == len(scores)
+    assert stats['mean'] == pytest.approx(scores.mean())
+    assert stats['std'] == pytest.approx(scores.std())
+    assert (stats['min'], stats['max']) == (scores.min(), scores.max())
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""同比按日历对应：ISO周按周序号匹配上一年同期，不受53周年份影响"""
+
+import datetime
+
+import numpy as np
+
+from core.resample import period_growth, year_ago_starts
+
+
+def test_year_ago_starts_matches_iso_calendar():
+    mondays = np.arange('2019-12-30', '2027-01-04', 7, dtype='datetime64[D]')
+
+    for monday, previous in zip(mondays.tolist(), year_ago_starts(mondays, 'week').tolist()):
+        year, week, _ = monday.isocalendar()
+        try:
+            expected = datetime.date.fromisocalendar(year - 1, week, 1)
+        except ValueError:
+            expected = None  # 上一ISO年没有第53周
+        assert previous == expected
+
+
+def test_year_ago_starts_for_months_and_quarters():
+    starts = np.array(['2024-02-01', '2024-10-01'], dtype='datetime64[D]')
+
+    assert year_ago_starts(starts, 'month').tolist() == [datetime.date(2023, 2, 1), datetime.date(2023, 10, 1)]
+    assert year_ago_starts(starts, 'quarter').tolist() == [datetime.date(2023, 2, 1), datetime.date(2023, 10, 1)]
+
+
+def test_weekly_yoy_after_53_week_year():
+    # 2020年有53个ISO周，按52个周期错位会把2021-W09与2020-W10比较
+    axis_dates = np.arange('2019-12-30', '2021-12-27', dtype='datetime64[D]')
+    matrix = np.arange(len(axis_dates), dtype=np.float64)[None, :] + 1
+
+    growth = period_growth(axis_dates, matrix, 'week', 'sum')
+    periods, values, yoy = growth['periods'], growth['values'][0], growth['yoy'][0]
+    current = int(np.flatnonzero(periods == np.datetime64('2021-03-01'))[0])
+    previous = int(np.flatnonzero(periods == np.datetime64('2020-02-24'))[0])
+
+    assert yoy[current] == values[current] / values[previous] - 1
+    assert np.isnan(yoy[periods == np.datetime64('2020-12-28')]).all()
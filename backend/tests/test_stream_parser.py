@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""流式解析器与列式解析结果应与完整JSON解码(load_raw_data)一致"""
+
+import os
+
+import numpy as np
+import pytest
+
+from config.settings import PROJECT_ROOT
+from core.data_cache import parse_index_columns
+from core.data_parser import load_raw_data
+from core.date_codec import encode_ymd
+from core.stream_parser import iter_index_records
+
+DATA_FILES = [os.path.join(PROJECT_ROOT, 'data', name) for name in ('26_Full.txt', '3_Full.txt')]
+
+
+def _raw_series(file_path):
+    """按load_raw_data的结构取出各关键词第一个indexes中的(日期, 指数)"""
+    series = {}
+    for entry in load_raw_data(file_path)['content']['resp_list']:
+        points = entry['indexes'][0]['time_indexes']
+        series[entry['query']] = ([int(p['time']) for p in points], [int(p['score']) for p in points])
+    return series
+
+
+def _columns_series(columns):
+    offsets = columns['offsets']
+    return {keyword: (encode_ymd(columns['dates'][offsets[i]:offsets[i + 1]]).tolist(),
+                      columns['scores'][offsets[i]:offsets[i + 1]].tolist())
+            for i, keyword in enumerate(columns['keywords'].tolist())}
+
+
+@pytest.mark.parametrize('file_path', DATA_FILES)
+@pytest.mark.parametrize('chunk_size', [97, 1 << 16])
+def test_iter_index_records_matches_load_raw_data(file_path, chunk_size):
+    series = {}
+    for keyword, time, score in iter_index_records(file_path, chunk_size):
+        times, scores = series.setdefault(keyword, ([], []))
+        times.append(time)
+        scores.append(score)
+
+    expected = _raw_series(file_path)
+    assert list(series) == list(expected)
+    assert series == expected
+
+
+@pytest.mark.parametrize('file_path', DATA_FILES)
+@pytest.mark.parametrize('streaming', [False, True])
+def test_parse_index_columns_matches_load_raw_data(file_path, streaming):
+    columns = parse_index_columns(file_path, streaming=streaming)
+
+    assert columns['dates'].dtype == np.dtype('datetime64[D]')
+    assert columns['offsets'][-1] == len(columns['scores'])
+    assert _columns_series(columns) == _raw_series(file_path)
+
+
+def test_iter_index_records_rejects_missing_body(tmp_path):
+    path = tmp_path / 'empty.txt'
+    path.write_text('POST /cgi-bin/wxaweb/wxindex HTTP/1.1\r\n\r\n', encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        list(iter_index_records(str(path)))
@@ -9,6 +9,8 @@ import matplotlib.dates as mdates
 import matplotlib.font_manager as fm
 from datetime import datetime
 from typing import List, Dict, Any, Optional
+from numpy.typing import ArrayLike
+import numpy as np
 import os
 
 from config.settings import CHART_CONFIG, OUTPUT_CONFIG
@@ -50,13 +52,13 @@ def create_figure(title: str = "") -> tuple:
     return fig, ax
 
 
-def format_date_axis(ax, dates: List[datetime]):
+def format_date_axis(ax, dates: ArrayLike):
     """
     格式化日期轴显示
     
     Args:
         ax: matplotlib轴对象
-        dates: 日期列表
+        dates: 日期数组或列表
     """
     # 设置日期格式
     ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d'))
@@ -66,8 +68,8 @@ def format_date_axis(ax, dates: List[datetime]):
     plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
     
     # 设置x轴范围
-    if dates:
-        ax.set_xlim(min(dates), max(dates))
+    if len(dates):
+        ax.set_xlim(np.min(dates), np.max(dates))
 
 
 def apply_chart_styling(ax, show_grid: bool = True):
@@ -145,15 +147,15 @@ def save_chart(fig, filename: str, tight_layout: bool = True) -> str:
     return file_path
 
 
-def plot_platform_line(ax, dates: List[datetime], values: List[int], 
+def plot_platform_line(ax, dates: ArrayLike, values: ArrayLike, 
                       label: str, color: str, show_markers: bool = True):
     """
     绘制单个平台的数据线条
     
     Args:
         ax: matplotlib轴对象
-        dates: 日期列表
-        values: 数值列表
+        dates: 日期数组
+        values: 数值数组
         label: 线条标签
         color: 线条颜色
         show_markers: 是否显示数据点标记
@@ -177,6 +179,70 @@ def plot_platform_line(ax, dates: List[datetime], values: List[int],
     ax.plot(dates, values, **line_style)
 
 
+def plot_overlay_line(ax, dates: ArrayLike, values: ArrayLike, label: str, color: str):
+    """
+    绘制叠加在平台数据线上的平滑曲线（虚线，无数据点标记）
+    
+    Args:
+        ax: matplotlib轴对象
+        dates: 日期数组
+        values: 数值数组
+        label: 线条标签
+        color: 线条颜色，通常与对应平台一致
+    """
+    ax.plot(dates, values, color=color, label=label,
+            linewidth=CHART_CONFIG['line_width'] * 1.5, linestyle='--', alpha=0.9)
+
+
+def plot_anomaly_markers(ax, dates: ArrayLike, values: ArrayLike, color: str):
+    """
+    在平台数据线上标注异常日（空心圆圈，不加入图例）
+    
+    Args:
+        ax: matplotlib轴对象
+        dates: 异常日日期数组
+        values: 异常日数值数组
+        color: 标记颜色，通常与对应平台一致
+    """
+    ax.scatter(dates, values, s=CHART_CONFIG['marker_size'] ** 2 * 4, facecolors='none',
+               edgecolors=color, linewidths=2, zorder=5, label='_nolegend_')
+
+
+def plot_heatmap(ax, matrix: ArrayLike, labels: List[str], vmin: float = -1.0, vmax: float = 1.0,
+                 colorbar_label: str = "", value_format: str = ".2f"):
+    """
+    绘制带数值标注的方阵热力图，NaN显示为空白
+
+    Args:
+        ax: matplotlib轴对象
+        matrix: 方阵数据
+        labels: 行列标签
+        vmin: 颜色映射下限
+        vmax: 颜色映射上限
+        colorbar_label: 颜色条标签
+        value_format: 格子中数值的格式
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    image = ax.imshow(np.ma.masked_invalid(matrix), cmap='RdBu_r', vmin=vmin, vmax=vmax)
+    colorbar = ax.figure.colorbar(image, ax=ax)
+    if colorbar_label:
+        colorbar.set_label(colorbar_label, fontsize=CHART_CONFIG['axis_labelsize'])
+
+    ax.set_xticks(np.arange(len(labels)))
+    ax.set_yticks(np.arange(len(labels)))
+    ax.set_xticklabels(labels, rotation=45, ha='right')
+    ax.set_yticklabels(labels)
+    ax.tick_params(labelsize=CHART_CONFIG['tick_labelsize'])
+
+    # 关键词较少时在格子中标注数值
+    if len(labels) <= 20:
+        for (row, column), value in np.ndenumerate(matrix):
+            if not np.isnan(value):
+                ax.text(column, row, format(value, value_format), ha='center', va='center',
+                        color='white' if abs(value) > 0.6 * vmax else 'black',
+                        fontsize=CHART_CONFIG['tick_labelsize'])
+
+
 def close_figure(fig):
     """
     安全关闭图表对象释放内存
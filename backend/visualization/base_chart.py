@@ -5,15 +5,20 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import matplotlib.pyplot as plt
+import numpy as np
 from datetime import datetime
 
 from utils.chart_utils import (
     setup_matplotlib, create_figure, format_date_axis,
-    apply_chart_styling, add_legend, save_chart, close_figure
+    apply_chart_styling, add_legend, save_chart, close_figure, plot_anomaly_markers
 )
-from core.data_parser import parse_platforms_data, calculate_statistics
+from core.anomaly import detect_platform_anomalies
+from core.batch_stats import batch_statistics, series_matrix, statistics_by_name
+from core.correlation import correlation_matrix, lead_lag_pairs
+from core.dataset_registry import get_platforms_data, get_platforms_revision
+from core.platform_series import PlatformSeries
 
 
 class BaseChart(ABC):
@@ -31,21 +36,33 @@ class BaseChart(ABC):
         """
         self.platform_type = platform_type
         self.platforms_data = None
+        self._data_revision = None
+        self.date_range = None
         self.fig = None
         self.ax = None
+        self.anomaly_options = None
         
         # 初始化matplotlib设置
         setup_matplotlib()
     
-    def load_data(self) -> Dict[str, Dict]:
+    def _drop_stale_data(self):
+        """平台关键词在存储中的修订号变化（包括其他进程写入）时丢弃已加载的数据"""
+        revision = get_platforms_revision(self.platform_type)
+        if revision != self._data_revision:
+            self.platforms_data = None
+            self._data_revision = revision
+    
+    def load_data(self) -> Dict[str, PlatformSeries]:
         """
-        加载平台数据
+        加载平台数据，同一进程内的图表共享已解析的数据集；
+        数据来源为时序存储时只读取date_range区间，存储中的数据变化后重新加载
         
         Returns:
-            Dict[str, Dict]: 平台数据字典
+            Dict[str, PlatformSeries]: 平台名称到序列的映射
         """
+        self._drop_stale_data()
         if self.platforms_data is None:
-            self.platforms_data = parse_platforms_data(self.platform_type)
+            self.platforms_data = get_platforms_data(self.platform_type, date_range=self.date_range)
         return self.platforms_data
     
     def create_chart(self, title: str = "") -> tuple:
@@ -80,11 +97,10 @@ class BaseChart(ABC):
             raise RuntimeError("图表尚未创建，请先调用create_chart方法")
         
         # 获取所有日期用于格式化x轴
-        all_dates = []
-        for platform_data in self.platforms_data.values():
-            all_dates.extend(platform_data['dates'])
+        date_arrays = [platform_data.dates for platform_data in self.get_axis_series().values()]
+        all_dates = np.concatenate(date_arrays) if date_arrays else np.empty(0, dtype='datetime64[D]')
         
-        if all_dates:
+        if len(all_dates):
             format_date_axis(self.ax, all_dates)
         
         apply_chart_styling(self.ax, show_grid)
@@ -92,6 +108,15 @@ class BaseChart(ABC):
         if show_legend:
             add_legend(self.ax)
     
+    def get_axis_series(self) -> Dict[str, PlatformSeries]:
+        """
+        获取用于确定日期轴范围的序列，子类绘制变换后的数据时可覆盖
+        
+        Returns:
+            Dict[str, PlatformSeries]: 平台名称到序列的映射
+        """
+        return self.platforms_data
+    
     def save(self, filename: str) -> str:
         """
         保存图表
@@ -141,6 +166,10 @@ class BaseChart(ABC):
             # 绘制数据
             self.plot_data()
             
+            # 标注异常日
+            if self.anomaly_options is not None:
+                self.plot_anomalies()
+            
             # 格式化图表
             self.format_chart(show_grid, show_legend)
             
@@ -164,8 +193,91 @@ class BaseChart(ABC):
         if self.platforms_data is None:
             self.load_data()
         
-        stats = {}
+        # 对齐为(平台 × 天)矩阵后一次性计算，缺失日期不参与统计
+        names, _, matrix = series_matrix(self.platforms_data)
+        return statistics_by_name(names, batch_statistics(matrix))
+    
+    def get_correlation(self, max_lag: Optional[int] = None) -> Dict[str, Any]:
+        """
+        获取各平台之间的相关性分析结果
+        
+        Args:
+            max_lag: 滞后互相关的最大滞后天数，默认使用ANALYSIS_CONFIG['max_lag_days']
+        
+        Returns:
+            Dict[str, Any]: platforms（平台顺序）、pearson（相关系数矩阵，无法计算时为None）
+                和lead_lag（每对平台互相关最大的领先天数，见core.correlation.lead_lag_pairs）
+        """
+        if self.platforms_data is None:
+            self.load_data()
+        
+        names, _, matrix = series_matrix(self.platforms_data)
+        pearson = correlation_matrix(matrix)
+        return {
+            'platforms': names,
+            'pearson': [[None if np.isnan(value) else value for value in row] for row in pearson.tolist()],
+            'lead_lag': lead_lag_pairs(names, matrix, max_lag)
+        }
+    
+    def set_anomaly_annotation(self, method: Optional[str] = None, threshold: Optional[float] = None,
+                               window: Optional[int] = None):
+        """
+        开启异常日标注，generate绘制数据后在各平台曲线上标出异常日
+        
+        Args:
+            method: 'zscore'或'mad'，默认使用ANALYSIS_CONFIG['anomaly_method']
+            threshold: 分数绝对值阈值，默认使用ANALYSIS_CONFIG['anomaly_threshold']
+            window: 窗口天数，默认使用ANALYSIS_CONFIG['anomaly_window']
+        """
+        self.anomaly_options = {'method': method, 'threshold': threshold, 'window': window}
+    
+    def get_anomalies(self, method: Optional[str] = None, threshold: Optional[float] = None,
+                      window: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        检测各平台数据中的异常日
+        
+        Args:
+            method: 'zscore'或'mad'
+            threshold: 分数绝对值阈值
+            window: 窗口天数
+        
+        Returns:
+            List[Dict[str, Any]]: 异常事件表（见core.anomaly.detect_anomalies）
+        """
+        if self.platforms_data is None:
+            self.load_data()
+        
+        return detect_platform_anomalies(self.platforms_data, method, window, threshold)
+    
+    def plot_anomalies(self, platforms: Optional[List[str]] = None):
+        """
+        在当前图表上标注异常日
+        
+        Args:
+            platforms: 要标注的平台名称列表，默认标注全部平台
+        """
+        if self.ax is None:
+            raise RuntimeError("图表尚未创建，请先调用create_chart方法")
+        
+        events = self.get_anomalies(**(self.anomaly_options or {}))
         for platform_name, platform_data in self.platforms_data.items():
-            stats[platform_name] = calculate_statistics(platform_data['values'])
+            if platforms is not None and platform_name not in platforms:
+                continue
+            event_dates = np.array([event['date'] for event in events if event['keyword'] == platform_name],
+                                   dtype='datetime64[D]')
+            marker_dates, marker_values = self.locate_plot_points(platform_name, event_dates)
+            if len(marker_dates):
+                plot_anomaly_markers(self.ax, marker_dates, marker_values, platform_data.color)
+    
+    def locate_plot_points(self, platform_name: str, dates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        获取日期在已绘制曲线上对应的点，子类绘制变换后的数据时可覆盖
+        
+        Args:
+            platform_name: 平台名称
+            dates: 日期数组（datetime64[D]）
         
-        return stats
\ No newline at end of file
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 曲线上的日期和数值，曲线上不存在的日期被忽略
+        """
+        return self.platforms_data[platform_name].at(dates)
\ No newline at end of file
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+相关性热力图模块
+用于生成平台之间的皮尔逊相关系数热力图和领先滞后天数热力图
+"""
+
+from typing import Optional
+import numpy as np
+
+from utils.chart_utils import plot_heatmap
+from visualization.base_chart import BaseChart
+from core.batch_stats import series_matrix
+from core.correlation import correlation_matrix, cross_correlation
+from config.settings import ANALYSIS_CONFIG
+
+
+class CorrelationChart(BaseChart):
+    """
+    相关性热力图类
+    mode为'pearson'时显示同期相关系数，为'lag'时显示互相关最大处的滞后天数
+    """
+
+    def __init__(self, platform_type: str = 'five_platforms', mode: str = 'pearson',
+                 max_lag: Optional[int] = None):
+        """
+        初始化相关性热力图
+
+        Args:
+            platform_type: 平台类型
+            mode: 'pearson'或'lag'
+            max_lag: 滞后模式下的最大滞后天数，默认使用ANALYSIS_CONFIG['max_lag_days']
+
+        Raises:
+            ValueError: 当mode不受支持时抛出
+        """
+        if mode not in ('pearson', 'lag'):
+            raise ValueError(f"不支持的热力图模式: {mode}")
+        super().__init__(platform_type)
+        self.mode = mode
+        self.max_lag = ANALYSIS_CONFIG['max_lag_days'] if max_lag is None else max_lag
+
+    def plot_data(self):
+        """
+        绘制相关性热力图
+        """
+        if self.platforms_data is None:
+            raise RuntimeError("数据尚未加载，请先调用load_data方法")
+
+        if self.ax is None:
+            raise RuntimeError("图表尚未创建，请先调用create_chart方法")
+
+        names, _, matrix = series_matrix(self.platforms_data)
+        if self.mode == 'pearson':
+            plot_heatmap(self.ax, correlation_matrix(matrix), names, colorbar_label='皮尔逊相关系数')
+            return
+
+        # 第(i, j)格为i领先j的天数，负数表示j领先i
+        lags, ccf = cross_correlation(matrix, self.max_lag)
+        filled = np.where(np.isnan(ccf), -np.inf, ccf)
+        best = lags[filled.argmax(axis=2)].astype(np.float64)
+        best[~np.isfinite(filled.max(axis=2))] = np.nan
+        limit = max(int(np.abs(lags).max()) if len(lags) else 0, 1)
+        plot_heatmap(self.ax, best, names, vmin=-limit, vmax=limit, colorbar_label='领先天数',
+                     value_format='.0f')
+
+    def format_chart(self, show_grid: bool = False, show_legend: bool = False):
+        """
+        格式化热力图样式（热力图没有日期轴和图例）
+
+        Args:
+            show_grid: 未使用，保持与BaseChart接口一致
+            show_legend: 未使用，保持与BaseChart接口一致
+        """
+        if self.ax is None:
+            raise RuntimeError("图表尚未创建，请先调用create_chart方法")
+
+        self.ax.set_aspect('equal')
+
+
+def create_correlation_chart(platform_type: str = 'five_platforms', mode: str = 'pearson') -> CorrelationChart:
+    """
+    工厂函数：创建相关性热力图实例
+
+    Args:
+        platform_type: 平台类型
+        mode: 'pearson'或'lag'
+
+    Returns:
+        CorrelationChart: 图表实例
+    """
+    return CorrelationChart(platform_type, mode)
+
+
+# 便捷函数
+def generate_correlation_heatmap(platform_type: str = 'five_platforms', mode: str = 'pearson',
+                                 filename: str = "") -> Optional[str]:
+    """
+    快速生成相关性热力图的便捷函数
+
+    Args:
+        platform_type: 平台类型
+        mode: 'pearson'（相关系数）或'lag'（领先滞后天数）
+        filename: 保存文件名
+
+    Returns:
+        Optional[str]: 保存路径（如果指定了filename）
+    """
+    chart = create_correlation_chart(platform_type, mode)
+    title = "平台微信指数相关系数" if mode == 'pearson' else f"平台领先滞后天数（±{chart.max_lag}天）"
+    try:
+        return chart.generate(title=title, filename=filename or f"platforms_correlation_{mode}")
+    finally:
+        chart.close()
\ No newline at end of file
@@ -35,10 +35,10 @@ class DeliveryPlatformChart(BaseChart):
         for platform_name, platform_data in self.platforms_data.items():
             plot_platform_line(
                 self.ax,
-                platform_data['dates'],
-                platform_data['values'],
+                platform_data.dates,
+                platform_data.values,
                 platform_name,
-                platform_data['color'],
+                platform_data.color,
                 show_markers=True
             )
     
@@ -99,10 +99,10 @@ class StaticDeliveryChart(DeliveryPlatformChart):
         for platform_name, platform_data in self.platforms_data.items():
             plot_platform_line(
                 self.ax,
-                platform_data['dates'],
-                platform_data['values'],
+                platform_data.dates,
+                platform_data.values,
                 platform_name,
-                platform_data['color'],
+                platform_data.color,
                 show_markers=False  # 静态图表不显示标记点
             )
 
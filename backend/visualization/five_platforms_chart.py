@@ -39,10 +39,10 @@ class FivePlatformsChart(BaseChart):
                 platform_data = self.platforms_data[platform_name]
                 plot_platform_line(
                     self.ax,
-                    platform_data['dates'],
-                    platform_data['values'],
+                    platform_data.dates,
+                    platform_data.values,
                     platform_name,
-                    platform_data['color'],
+                    platform_data.color,
                     show_markers=True
                 )
     
@@ -84,10 +84,10 @@ class FivePlatformsChart(BaseChart):
                 platform_data = self.platforms_data[platform_name]
                 plot_platform_line(
                     self.ax,
-                    platform_data['dates'],
-                    platform_data['values'],
+                    platform_data.dates,
+                    platform_data.values,
                     platform_name,
-                    platform_data['color'],
+                    platform_data.color,
                     show_markers=False
                 )
                 
@@ -102,10 +102,10 @@ class FivePlatformsChart(BaseChart):
                 platform_data = self.platforms_data[platform_name]
                 plot_platform_line(
                     self.ax,
-                    platform_data['dates'],
-                    platform_data['values'],
+                    platform_data.dates,
+                    platform_data.values,
                     platform_name,
-                    platform_data['color'],
+                    platform_data.color,
                     show_markers=True
                 )
     
@@ -6,11 +6,20 @@
 
 from typing import Optional, Dict, List, Tuple
 import matplotlib.pyplot as plt
+import numpy as np
 from datetime import datetime
 
 from visualization.base_chart import BaseChart
-from utils.chart_utils import plot_platform_line
-from core.data_parser import get_date_range
+from utils.chart_utils import plot_platform_line, plot_overlay_line
+from core.data_parser import get_date_range, parse_platforms_data
+from core.date_codec import decode_ymd
+from core.index_store import IndexStore
+from core.platform_series import PlatformSeries, search_date_window
+from core.rolling import smooth_platforms
+from core.seasonality import deseasonalize_platforms
+from core.resample import RESAMPLE_FREQS, period_growth, period_starts, resample_platforms
+from core.batch_stats import DEFAULT_PERCENTILES, series_matrix
+from config.settings import CHART_CONFIG, PLATFORM_CONFIGS, STORE_CONFIG
 
 
 class InteractiveChart(BaseChart):
@@ -28,7 +37,16 @@ class InteractiveChart(BaseChart):
         """
         super().__init__(platform_type)
         self.selected_platforms = None
-        self.date_range = None
+        self.overlays = []
+        self._overlay_cache = {}
+        self._overlay_source = None
+        self.seasonal_model = None
+        self.deseasonalized = False
+        self.granularity = 'day'
+        self.resample_how = None
+        self.max_points = None
+        self.resolution_stat = 'mean'
+        self.resolution_level = None
     
     def set_platform_filter(self, platform_names: List[str]):
         """
@@ -48,31 +66,201 @@ class InteractiveChart(BaseChart):
             end_date: 结束日期
         """
         self.date_range = (start_date, end_date)
+        
+        # 从时序存储读取时按新区间重新加载
+        if STORE_CONFIG['source'] == 'store':
+            self.platforms_data = None
+    
+    def add_overlay(self, kind: str = 'ma', window: int = 7):
+        """
+        添加平滑曲线叠加层
+        
+        Args:
+            kind: 'ma'（移动平均）或'ewma'（指数加权平均，window作为span）
+            window: 窗口天数
+        """
+        self.overlays.append((kind, window))
+    
+    def set_deseasonalized(self, enabled: bool = True, model: Optional[str] = None):
+        """
+        设置是否绘制去除星期效应后的曲线
+        
+        Args:
+            enabled: 是否绘制去季节化曲线
+            model: 分解模型（见core.seasonality.decompose_weekly），默认使用配置
+        """
+        self.deseasonalized = enabled
+        self.seasonal_model = model
+    
+    def set_max_points(self, max_points: Optional[int] = None, stat: str = 'mean'):
+        """
+        设置每个平台最多绘制的点数，数据来源为时序存储时从聚合金字塔读取满足该分辨率的最细层级
+        
+        Args:
+            max_points: 最多点数，默认为图表的像素宽度；None以外的值才会启用金字塔读取
+            stat: 每个桶的取值（见core.aggregate_pyramid.bucket_values）
+        """
+        self.max_points = max_points or int(CHART_CONFIG['figsize'][0] * CHART_CONFIG['dpi'])
+        self.resolution_stat = stat
+        self.platforms_data = None
+    
+    def load_data(self) -> Dict[str, PlatformSeries]:
+        """
+        加载平台数据
+        
+        设置了max_points且数据来源为时序存储时只读取聚合金字塔中所需层级的桶，
+        长区间图表每个平台只读取几百个点；此时统计和叠加层均基于桶数值。
+        
+        Returns:
+            Dict[str, PlatformSeries]: 平台名称到序列的映射
+        """
+        if self.max_points is None or STORE_CONFIG['source'] != 'store':
+            return super().load_data()
+        
+        self._drop_stale_data()
+        if self.platforms_data is None:
+            with IndexStore() as store:
+                self.resolution_level, columns = store.load_resolution_columns(
+                    PLATFORM_CONFIGS[self.platform_type], self.date_range, self.max_points, self.resolution_stat
+                )
+            self.platforms_data = parse_platforms_data(self.platform_type, columns=columns)
+        return self.platforms_data
+    
+    def set_granularity(self, granularity: str = 'day', how: Optional[str] = None):
+        """
+        设置绘制的时间粒度
+        
+        Args:
+            granularity: 'day'（原始日数据）、'week'（ISO周）、'month'（自然月）或'quarter'（季度）
+            how: 周/月聚合方式（见core.resample.resample_matrix），默认使用配置
+        
+        Raises:
+            ValueError: 当granularity不受支持时抛出
+        """
+        if granularity != 'day' and granularity not in RESAMPLE_FREQS:
+            raise ValueError(f"不支持的时间粒度: {granularity}")
+        self.granularity = granularity
+        self.resample_how = how
+    
+    def get_plot_series(self) -> Dict[str, PlatformSeries]:
+        """
+        获取用于绘制主曲线的平台序列，依次应用去季节化（使用缓存的分解结果）和周/月重采样
+        
+        Returns:
+            Dict[str, PlatformSeries]: 平台名称到序列的映射
+        """
+        if self.platforms_data is None:
+            self.load_data()
+        
+        plot_series = self.platforms_data
+        if self.deseasonalized:
+            plot_series = deseasonalize_platforms(plot_series, self.seasonal_model)
+        if self.granularity != 'day':
+            plot_series = resample_platforms(plot_series, self.granularity, self.resample_how)
+        return plot_series
+    
+    def get_axis_series(self) -> Dict[str, PlatformSeries]:
+        """
+        日期轴范围与实际绘制的序列一致，按周/月绘制时包含首个周期的起始日
+        
+        Returns:
+            Dict[str, PlatformSeries]: 平台名称到序列的映射
+        """
+        return self.get_plot_series()
+    
+    def get_period_summary(self, freq: str = 'week') -> Dict[str, any]:
+        """
+        获取各平台按周或按月的聚合值和增长率
+        
+        Args:
+            freq: 'week'（周环比）或'month'（月环比）
+        
+        Returns:
+            Dict[str, any]: periods（周期起始日）、complete（周期是否完整）和platforms
+                （各平台的values、days（有效天数）、pop（环比）和yoy（同比）列表，无法计算的值为None）
+        """
+        if self.platforms_data is None:
+            self.load_data()
+        
+        names, axis_dates, matrix = series_matrix(self.platforms_data)
+        growth = period_growth(axis_dates, matrix, freq, self.resample_how)
+        
+        def to_list(row):
+            return [None if np.isnan(value) else value for value in row.tolist()]
+        
+        return {
+            'periods': np.datetime_as_string(growth['periods'], unit='D').tolist(),
+            'complete': growth['complete'].tolist(),
+            'platforms': {
+                name: {
+                    'values': to_list(growth['values'][i]),
+                    'days': growth['counts'][i].tolist(),
+                    'pop': to_list(growth['pop'][i]),
+                    'yoy': to_list(growth['yoy'][i])
+                }
+                for i, name in enumerate(names)
+            }
+        }
+    
+    def get_overlay_data(self, kind: str = 'ma', window: int = 7) -> Dict[str, PlatformSeries]:
+        """
+        获取各平台的平滑序列，对同一份数据只计算一次，重复绘制时直接复用
+        
+        Args:
+            kind: 平滑方式（见core.rolling.smooth_platforms）
+            window: 窗口天数
+            
+        Returns:
+            Dict[str, PlatformSeries]: 平台名称到平滑序列的映射
+        """
+        if self.platforms_data is None:
+            self.load_data()
+        
+        if self._overlay_source is not self.platforms_data:
+            self._overlay_cache = {}
+            self._overlay_source = self.platforms_data
+        
+        key = (kind, window)
+        if key not in self._overlay_cache:
+            self._overlay_cache[key] = smooth_platforms(self.platforms_data, kind, window)
+        return self._overlay_cache[key]
     
-    def filter_data_by_date(self, dates: List[datetime], values: List[int]) -> Tuple[List[datetime], List[int]]:
+    def filter_data_by_date(self, dates: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
         根据日期范围筛选数据
         
+        日期数组有序，使用二分查找定位区间边界，返回原数组的切片视图而不复制数据。
+        
         Args:
-            dates: 原始日期列表
-            values: 原始数值列表
+            dates: 原始日期数组（升序）
+            values: 原始数值数组
             
         Returns:
-            Tuple[List[datetime], List[int]]: 筛选后的日期和数值
+            Tuple[np.ndarray, np.ndarray]: 筛选后的日期和数值
         """
         if self.date_range is None:
             return dates, values
         
-        start_date, end_date = self.date_range
-        filtered_dates = []
-        filtered_values = []
+        lo, hi = search_date_window(dates, *self.date_range)
+        return dates[lo:hi], values[lo:hi]
+    
+    def filter_windows(self, windows: List[Tuple[datetime, datetime]]) -> Dict[str, List[PlatformSeries]]:
+        """
+        批量按多个日期窗口截取各平台数据
         
-        for date, value in zip(dates, values):
-            if start_date <= date <= end_date:
-                filtered_dates.append(date)
-                filtered_values.append(value)
+        Args:
+            windows: (开始日期, 结束日期)列表
+            
+        Returns:
+            Dict[str, List[PlatformSeries]]: 各平台与窗口一一对应的序列视图
+        """
+        if self.platforms_data is None:
+            self.load_data()
         
-        return filtered_dates, filtered_values
+        return {
+            platform_name: platform_data.windows(windows)
+            for platform_name, platform_data in self.platforms_data.items()
+        }
     
     def plot_data(self):
         """
@@ -86,27 +274,68 @@ class InteractiveChart(BaseChart):
         
         # 确定要绘制的平台
         platforms_to_plot = self.selected_platforms or list(self.platforms_data.keys())
+        plot_series = self.get_plot_series()
         
         # 绘制选定的平台数据
         for platform_name in platforms_to_plot:
-            if platform_name in self.platforms_data:
-                platform_data = self.platforms_data[platform_name]
+            if platform_name in plot_series:
+                platform_data = plot_series[platform_name]
                 
                 # 应用日期筛选
                 filtered_dates, filtered_values = self.filter_data_by_date(
-                    platform_data['dates'],
-                    platform_data['values']
+                    platform_data.dates,
+                    platform_data.values
                 )
                 
-                if filtered_dates:  # 确保有数据可绘制
+                if len(filtered_dates):  # 确保有数据可绘制
                     plot_platform_line(
                         self.ax,
                         filtered_dates,
                         filtered_values,
-                        platform_name,
-                        platform_data['color'],
+                        f"{platform_name}（去季节）" if self.deseasonalized else platform_name,
+                        platform_data.color,
                         show_markers=True
                     )
+        
+        # 绘制平滑曲线叠加层
+        for kind, window in self.overlays:
+            overlay_data = self.get_overlay_data(kind, window)
+            for platform_name in platforms_to_plot:
+                if platform_name not in overlay_data:
+                    continue
+                overlay = overlay_data[platform_name]
+                overlay_dates, overlay_values = self.filter_data_by_date(overlay.dates, overlay.values)
+                if len(overlay_dates):
+                    plot_overlay_line(self.ax, overlay_dates, overlay_values,
+                                      f"{platform_name} {kind.upper()}{window}", overlay.color)
+    
+    def plot_anomalies(self, platforms: Optional[List[str]] = None):
+        """
+        只在选定的平台上标注异常日
+        
+        Args:
+            platforms: 要标注的平台名称列表，默认使用平台筛选
+        """
+        super().plot_anomalies(platforms or self.selected_platforms)
+    
+    def locate_plot_points(self, platform_name: str, dates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        将日期映射到实际绘制的曲线：去季节化时取去季节化后的数值，
+        按周/月绘制时标注在所在周期的点上，并应用日期筛选
+        
+        Args:
+            platform_name: 平台名称
+            dates: 日期数组（datetime64[D]）
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 曲线上的日期和数值
+        """
+        plot_series = self.get_plot_series()
+        if platform_name not in plot_series:
+            return np.empty(0, dtype='datetime64[D]'), np.empty(0, dtype=np.int64)
+        if self.granularity != 'day':
+            dates = period_starts(dates, self.granularity)
+        return self.filter_data_by_date(*plot_series[platform_name].at(dates))
     
     def generate_comparison_chart(self, platforms: List[str], filename: str = "") -> Optional[str]:
         """
@@ -159,32 +388,74 @@ class InteractiveChart(BaseChart):
             show_legend=True
         )
     
-    def create_summary_report(self) -> Dict[str, any]:
+    def _persisted_statistics(self) -> Optional[Dict[str, Dict[str, float]]]:
+        """
+        读取时序存储中持久化的累计统计量
+
+        只在数据来源为时序存储且未设置日期范围时可用，任一平台缺少统计量时返回None。
+        返回的键与get_statistics一致（另含first_date和last_date），
+        中位数和分位数无法增量维护，记为None。
+        """
+        if STORE_CONFIG['source'] != 'store' or self.date_range is not None:
+            return None
+
+        keywords = PLATFORM_CONFIGS[self.platform_type]
+        with IndexStore() as store:
+            stats = store.keyword_statistics(keywords)
+        if len(stats) != len(keywords):
+            return None
+
+        keys = ('count', 'sum', 'mean', 'std', 'min', 'max', 'median', 'cv',
+                *(f'p{percentile:g}' for percentile in DEFAULT_PERCENTILES), 'first_date', 'last_date')
+        return {keyword: {key: stats[keyword].get(key) for key in keys} for keyword in keywords}
+
+    def create_summary_report(self, include_correlation: Optional[bool] = None,
+                              include_anomalies: Optional[bool] = None,
+                              include_periods: Optional[bool] = None) -> Dict[str, any]:
         """
         创建数据摘要报告
         
+        数据来源为时序存储且未设置日期范围时直接读取持久化的累计统计量，
+        不加载历史数据点，报告耗时与历史长度无关。相关性分析、异常检测和周期汇总
+        需要完整序列，因此这种情况下默认不包含，显式开启时仍会加载全部历史数据。
+        
+        Args:
+            include_correlation: 是否包含平台间相关系数和领先滞后分析，默认只在加载了完整序列时包含
+            include_anomalies: 是否包含异常日事件表，默认同上
+            include_periods: 是否包含按周和按月的聚合值及增长率，默认同上
+        
         Returns:
             Dict[str, any]: 包含统计信息的摘要报告
         """
-        if self.platforms_data is None:
-            self.load_data()
+        stats = self._persisted_statistics()
+        full_series = stats is None
+        include_correlation = full_series if include_correlation is None else include_correlation
+        include_anomalies = full_series if include_anomalies is None else include_anomalies
+        include_periods = full_series if include_periods is None else include_periods
         
-        stats = self.get_statistics()
-        date_range = get_date_range(self.platforms_data)
-        
-        # 计算总体统计
-        all_values = []
-        for platform_data in self.platforms_data.values():
-            all_values.extend(platform_data['values'])
+        if stats is not None:
+            first_dates = decode_ymd([item.pop('first_date') for item in stats.values()])
+            last_dates = decode_ymd([item.pop('last_date') for item in stats.values()])
+            date_range = (first_dates.min().astype(datetime), last_dates.max().astype(datetime))
+            total_data_points = sum(item['count'] for item in stats.values())
+        else:
+            if self.platforms_data is None:
+                self.load_data()
+            
+            stats = self.get_statistics()
+            date_range = get_date_range(self.platforms_data)
+            
+            # 计算总体统计
+            total_data_points = sum(len(platform_data.values) for platform_data in self.platforms_data.values())
         
         report = {
             'overview': {
-                'total_platforms': len(self.platforms_data),
+                'total_platforms': len(stats),
                 'date_range': {
                     'start': date_range[0].strftime('%Y-%m-%d') if date_range[0] else None,
                     'end': date_range[1].strftime('%Y-%m-%d') if date_range[1] else None
                 },
-                'total_data_points': len(all_values)
+                'total_data_points': total_data_points
             },
             'platform_statistics': stats,
             'rankings': {
@@ -194,6 +465,15 @@ class InteractiveChart(BaseChart):
             }
         }
         
+        if include_correlation:
+            report['correlation'] = self.get_correlation()
+        
+        if include_anomalies:
+            report['anomalies'] = self.get_anomalies()
+        
+        if include_periods:
+            report['periods'] = {freq: self.get_period_summary(freq) for freq in ('week', 'month')}
+        
         return report
 
 